@@ -1,32 +1,261 @@
 from typing import Any, Text, Dict, List
 from rasa_sdk import Action, Tracker, FormValidationAction
+from rasa_sdk.events import ReminderCancelled, ReminderScheduled
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.types import DomainDict
 import logging
-import requests
+import asyncio
+import atexit
 import json
 import os
 from datetime import datetime, timedelta
 import random
 from dotenv import load_dotenv
 
+from actions import messages
+from actions.cache import TTLCache, refresh_in_background
+from actions.cities import CITIES_FILE, CityRegistry
+from actions.circuit_breaker import CircuitBreaker, CircuitOpenError
+from actions.climate import CLIMATE_FILE, Climatology
+from actions.coalescing import SingleFlight
+from actions.dates import DateSpan, fold, parse_dates
+from actions.health import HealthMonitor
+from actions.hedging import Hedger
+from actions.http_client import get_http_client
+from actions.inventory import FallbackFlight, FallbackInventory, stable_rating
+from actions.prefetch import Prefetcher
+from actions.quota import (
+    MonthlyBudget, QuotaExceededError, SenderAllowance, TokenBucket, UpstreamQuota
+)
+from actions.ranking import DEFAULT_FLIGHT_WEIGHTS, FlightRanker, HotelRanker, parse_weights
+from actions.responses import ResponseTable
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# المدن المغربية المدعومة
-MOROCCAN_CITIES = [
-    'الرباط', 'الدار البيضاء', 'الدارالبيضاء', 'مراكش', 'فاس', 
-    'أكادير', 'طنجة', 'وجدة', 'تطوان', 'الحسيمة', 'القنيطرة', 'سلا'
+# Upstream base URLs, point them at tools/standin.py for local load tests
+SERPAPI_BASE_URL = os.getenv('SERPAPI_BASE_URL', 'https://serpapi.com').rstrip('/')
+AVIATIONSTACK_BASE_URL = os.getenv('AVIATIONSTACK_BASE_URL', 'http://api.aviationstack.com/v1').rstrip('/')
+
+# Overall deadline (seconds) for the parallel upstream lookups of a flight search
+FLIGHT_SEARCH_DEADLINE = float(os.getenv('FLIGHT_SEARCH_DEADLINE', '15'))
+
+# Time (seconds) a flight search may run before a first reply is sent
+FLIGHT_ACK_BUDGET = float(os.getenv('FLIGHT_ACK_BUDGET', '0.8'))
+# Input channels whose clients all get late results; the reminder fallback cannot reach
+# a plain REST client, so other clients opt in per message with FLIGHT_PROGRESSIVE_METADATA
+# (the web client does) and everyone else gets the whole answer in one reply
+FLIGHT_PROGRESSIVE_CHANNELS = [
+    channel.strip() for channel in os.getenv('FLIGHT_PROGRESSIVE_CHANNELS', 'socketio').split(',')
+    if channel.strip()
+]
+FLIGHT_PROGRESSIVE_METADATA = 'progressive_results'
+FLIGHT_RESULTS_INTENT = 'EXTERNAL_flight_results'
+FLIGHT_RESULTS_REMINDER = 'flight_results'
+
+# Raw SerpApi flight responses keyed on (origin, destination, date, class),
+# served stale while revalidating between the soft and the hard TTL
+FLIGHT_SEARCH_CACHE = TTLCache(
+    max_size=int(os.getenv('FLIGHT_CACHE_SIZE', '256')),
+    ttl=float(os.getenv('FLIGHT_CACHE_TTL', '900')),
+    stale_ttl=float(os.getenv('FLIGHT_CACHE_STALE_TTL', '3600'))
+)
+
+# Flight ranking weights over the defaults in actions/ranking.py, e.g.
+# FLIGHT_RANKING_WEIGHTS="price=1,duration=1,stops=0.5"
+FLIGHT_RANKER = FlightRanker(parse_weights(os.getenv('FLIGHT_RANKING_WEIGHTS', ''), DEFAULT_FLIGHT_WEIGHTS))
+
+# Raw AviationStack real-time responses keyed on (origin, destination)
+FLIGHT_INFO_CACHE = TTLCache(
+    max_size=int(os.getenv('FLIGHT_INFO_CACHE_SIZE', '256')),
+    ttl=float(os.getenv('FLIGHT_INFO_CACHE_TTL', '60')),
+    stale_ttl=float(os.getenv('FLIGHT_INFO_CACHE_STALE_TTL', '600'))
+)
+
+# Raw Google Hotels property lists keyed on (city, quarter, adults, check-in, check-out)
+HOTEL_SEARCH_CACHE = TTLCache(
+    max_size=int(os.getenv('HOTEL_CACHE_SIZE', '256')),
+    ttl=float(os.getenv('HOTEL_CACHE_TTL', '1800'))
+)
+
+# Hotel ranking weights as "name=value" pairs over the defaults in actions/ranking.py,
+# e.g. HOTEL_RANKING_WEIGHTS="price=0.5,distance=0"
+HOTEL_RANKER = HotelRanker(parse_weights(os.getenv('HOTEL_RANKING_WEIGHTS', '')))
+
+# Identical concurrent upstream searches share a single in-flight request
+FLIGHT_SEARCH_REQUESTS = SingleFlight('serpapi_flights')
+HOTEL_SEARCH_REQUESTS = SingleFlight('serpapi_hotels')
+FLIGHT_INFO_REQUESTS = SingleFlight('aviationstack_flights')
+
+# Per-upstream circuit breakers, open after consecutive failures and serve the fallback
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RECOVERY_TIMEOUT = float(os.getenv('BREAKER_RECOVERY_TIMEOUT', '30'))
+FLIGHT_SEARCH_BREAKER = CircuitBreaker(
+    'serpapi_flights', BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT
+)
+HOTEL_SEARCH_BREAKER = CircuitBreaker(
+    'serpapi_hotels', BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT
+)
+AVIATIONSTACK_BREAKER = CircuitBreaker(
+    'aviationstack', BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT
+)
+
+# Flight searches still running after the first reply, keyed on sender
+PENDING_FLIGHT_SEARCHES = TTLCache(max_size=1000, ttl=FLIGHT_SEARCH_DEADLINE + 60)
+
+# Flight and hotel options listed to each sender per search, with the source that answered
+# (Google or the fallback inventory), so a confirmation quotes what was seen
+SHOWN_OFFERS = TTLCache(
+    max_size=int(os.getenv('SHOWN_OFFERS_SIZE', '10000')),
+    ttl=float(os.getenv('SHOWN_OFFERS_TTL', '86400'))
+)
+
+# Opt-in warm-up of the flight cache while flight_form is still collecting slots
+FLIGHT_PREFETCHER = Prefetcher(
+    'serpapi_flights',
+    enabled=os.getenv('FLIGHT_PREFETCH_ENABLED', 'false').lower() in ('1', 'true', 'yes'),
+    budget=int(os.getenv('FLIGHT_PREFETCH_BUDGET', '100')),
+    window=float(os.getenv('FLIGHT_PREFETCH_WINDOW', '3600'))
+)
+# Day offsets prefetched before the departure date is known
+FLIGHT_PREFETCH_DAYS = [
+    int(day) for day in os.getenv('FLIGHT_PREFETCH_DAYS', '1,7').split(',') if day.strip()
+]
+# Searches left above the SerpApi reserve below which prefetching stops, keeping them for real searches
+FLIGHT_PREFETCH_RESERVE = int(os.getenv('FLIGHT_PREFETCH_RESERVE', '500'))
+
+# Stand-in offers served when SerpApi cannot answer, generated once per search
+FALLBACK_FLIGHTS = FallbackInventory('fallback_flights', int(os.getenv('FALLBACK_INVENTORY_SIZE', '8192')))
+FALLBACK_HOTELS = FallbackInventory(
+    'fallback_hotels', int(os.getenv('FALLBACK_INVENTORY_SIZE', '8192')), seeded=False
+)
+# Day offsets whose fallback flights are generated for every known route at startup,
+# the same offsets the flight prefetch warms (7 is the date assumed when none was given)
+FALLBACK_PRECOMPUTE_DAYS = [
+    int(day) for day in os.getenv('FALLBACK_PRECOMPUTE_DAYS', '1,7').split(',') if day.strip()
 ]
 
+# SerpApi usage limits shared by flight and hotel searches
+SERPAPI_QUOTA = UpstreamQuota(
+    'serpapi',
+    bucket=TokenBucket(
+        rate=float(os.getenv('SERPAPI_RATE_PER_SECOND', '1')),
+        capacity=int(os.getenv('SERPAPI_BURST', '5'))
+    ),
+    budget=MonthlyBudget(
+        limit=int(os.getenv('SERPAPI_MONTHLY_BUDGET', '5000')),
+        path=os.getenv('SERPAPI_BUDGET_FILE', 'serpapi_usage.json'),
+        reserve=int(os.getenv('SERPAPI_BUDGET_RESERVE', '50')),
+        save_every=int(os.getenv('SERPAPI_BUDGET_SAVE_EVERY', '10')),
+        save_interval=float(os.getenv('SERPAPI_BUDGET_SAVE_INTERVAL', '60'))
+    ),
+    allowance=SenderAllowance(
+        limit=int(os.getenv('SERPAPI_SENDER_LIMIT', '10')),
+        window=float(os.getenv('SERPAPI_SENDER_WINDOW', '3600'))
+    )
+)
+# Usage counted since the last write is persisted when the action server exits
+atexit.register(SERPAPI_QUOTA.budget.flush)
+
+# Background health checks, the SerpApi account endpoint does not use search quota
+HEALTH_MONITOR = HealthMonitor()
+HEALTH_MONITOR.register(
+    'serpapi', SERPAPI_BASE_URL, f"{SERPAPI_BASE_URL}/account",
+    {'api_key': os.getenv('SERPAPI_KEY', 'demo_key')},
+    enabled=os.getenv('SERPAPI_KEY', 'demo_key') != 'demo_key'
+)
+# Every AviationStack call is metered, so it is judged by real traffic unless a
+# probe interval (seconds, e.g. 21600) is configured
+AVIATIONSTACK_PROBE_INTERVAL = float(os.getenv('AVIATIONSTACK_PROBE_INTERVAL', '0'))
+HEALTH_MONITOR.register(
+    'aviationstack', AVIATIONSTACK_BASE_URL,
+    f"{AVIATIONSTACK_BASE_URL}/flights" if AVIATIONSTACK_PROBE_INTERVAL > 0 else None,
+    {'access_key': os.getenv('AVIATIONSTACK_API_KEY', 'demo_key'), 'limit': 1},
+    enabled=os.getenv('AVIATIONSTACK_API_KEY', 'demo_key') != 'demo_key',
+    interval=AVIATIONSTACK_PROBE_INTERVAL
+)
+
+# Optional hedging of slow SerpApi searches, delayed to a percentile of each engine's successful search latency
+SERPAPI_HEDGE_ENABLED = os.getenv('SERPAPI_HEDGE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+SERPAPI_HEDGE_PERCENTILE = float(os.getenv('SERPAPI_HEDGE_PERCENTILE', '95'))
+SERPAPI_HEDGE_MIN_DELAY = float(os.getenv('SERPAPI_HEDGE_MIN_DELAY', '1'))
+SERPAPI_HEDGE_MIN_SAMPLES = int(os.getenv('SERPAPI_HEDGE_MIN_SAMPLES', '20'))
+FLIGHT_SEARCH_HEDGER = Hedger(
+    'serpapi_flights', SERPAPI_QUOTA,
+    SERPAPI_HEDGE_ENABLED, SERPAPI_HEDGE_PERCENTILE, SERPAPI_HEDGE_MIN_DELAY, SERPAPI_HEDGE_MIN_SAMPLES
+)
+HOTEL_SEARCH_HEDGER = Hedger(
+    'serpapi_hotels', SERPAPI_QUOTA,
+    SERPAPI_HEDGE_ENABLED, SERPAPI_HEDGE_PERCENTILE, SERPAPI_HEDGE_MIN_DELAY, SERPAPI_HEDGE_MIN_SAMPLES
+)
+
+# المدن والمطارات المدعومة (actions/cities.json)
+CITY_REGISTRY = CityRegistry.load(os.getenv('CITIES_FILE', CITIES_FILE))
+
+# المدن المغربية المدعومة
+MOROCCAN_CITIES = CITY_REGISTRY.names('moroccan')
+
 # الوجهات الدولية المدعومة
-INTERNATIONAL_DESTINATIONS = [
-    "باريس", "لندن", "مدريد", "دبي", "القاهرة", "تونس",
-    "إسطنبول", "روما", "برلين", "أمستردام", "بروكسل", "نيويورك",
-    "تورنتو", "مونتريال", "جنيف", "زيوريخ"
-]
+INTERNATIONAL_DESTINATIONS = CITY_REGISTRY.names('international')
+
+# Single-pass matcher over every city and alias, tolerant to spelling variants
+CITY_GAZETTEER = CITY_REGISTRY.gazetteer()
+
+# Monthly climate normals per city (actions/climate.json)
+CLIMATE = Climatology.load(os.getenv('CLIMATE_FILE', CLIMATE_FILE))
+
+# Fixed replies rendered for every value of their inputs when the action server loads
+STATIC_RESPONSES = (
+    ResponseTable('static_responses')
+    .register('help', lambda: messages.HELP)
+    .register('travel_tips', lambda: messages.TRAVEL_TIPS)
+    .register('greet', messages.greeting, [(hour,) for hour in range(24)])
+    .register('goodbye', messages.farewell, [(False,), (True,)])
+    .register('fallback', messages.fallback, messages.FALLBACK_INPUTS)
+    .register(
+        'weather', lambda city, month: messages.weather(city, month, CLIMATE.normals(city, month)),
+        [(city, month) for city in CLIMATE.cities() for month in range(1, 13)]
+    )
+    .build()
+)
+
+def canonical_city(name):
+    """Key of a city: its canonical name when known, the folded text otherwise"""
+    city = CITY_REGISTRY.lookup(name) if name else None
+    return city.name if city is not None else ' '.join(fold(name or '').split())
+
+def travel_class_code(travel_class):
+    """ECONOMY, BUSINESS or FIRST for a travel class slot in Arabic or English"""
+    text = str(travel_class or '')
+    if 'أعمال' in text or 'business' in text.lower():
+        return 'BUSINESS'
+    if 'أولى' in text or 'first' in text.lower():
+        return 'FIRST'
+    return 'ECONOMY'
+
+def accepts_late_results(tracker):
+    """Whether the client of the latest message gets flight results sent after the first reply"""
+    metadata = tracker.latest_message.get('metadata') or {}
+    if metadata.get(FLIGHT_PROGRESSIVE_METADATA):
+        return True
+    return tracker.get_latest_input_channel() in FLIGHT_PROGRESSIVE_CHANNELS
+
+def hotel_stay(tracker):
+    """Dates of the hotel stay, a hotel in the city the user flies to is booked from the flight dates"""
+    if tracker.get_slot("ville_hotel") == tracker.get_slot("ville_destination"):
+        return tracker.get_slot("date_depart")
+    return None
+
+def describe_age(age):
+    """Describe in Arabic how old served data is"""
+    minutes = int(age // 60)
+    if minutes < 1:
+        return "قبل أقل من دقيقة"
+    if minutes < 60:
+        return f"قبل {minutes} دقيقة"
+    return f"قبل {minutes // 60} ساعة"
 
 # =============================================================================
 # FORM VALIDATION ACTIONS
@@ -60,17 +289,20 @@ class ValidateFlightForm(FormValidationAction):
             entity_type = entity.get('entity', '')
             logger.info(f"Checking entity: {entity_value} (type: {entity_type})")
             
-            if any(moroccan_city in entity_value for moroccan_city in MOROCCAN_CITIES):
-                city = entity_value
+            match = CITY_GAZETTEER.find(entity_value, 'moroccan')
+            if match:
+                city = match.city
                 logger.info(f"Found Moroccan city in entity: {city}")
                 break
         
         # إذا لم نجد في entities، نستخدم slot_value
         if not city and slot_value:
-            city = slot_value
-            logger.info(f"Using slot_value as city: {city}")
+            match = CITY_GAZETTEER.find(slot_value, 'moroccan')
+            if match:
+                city = match.city
+                logger.info(f"Using slot_value as city: {city}")
             
-        if city and any(moroccan_city in city for moroccan_city in MOROCCAN_CITIES):
+        if city:
             logger.info(f"Valid departure city detected: {city}")
             return {"ville_depart": city}
         else:
@@ -95,19 +327,20 @@ class ValidateFlightForm(FormValidationAction):
         entities = tracker.latest_message.get('entities', [])
         
         for entity in entities:
-            entity_value = entity.get('value', '')
             # البحث في الوجهات الدولية أو المدن المغربية (للرحلات الداخلية)
-            if (any(dest in entity_value for dest in INTERNATIONAL_DESTINATIONS) or
-                any(moroccan_city in entity_value for moroccan_city in MOROCCAN_CITIES)):
-                city = entity_value
+            match = CITY_GAZETTEER.find(entity.get('value', ''))
+            if match:
+                city = match.city
                 logger.info(f"Found destination city in entity: {city}")
                 break
                 
         if not city and slot_value:
-            city = slot_value
+            match = CITY_GAZETTEER.find(slot_value)
+            city = match.city if match else slot_value
             
         if city:
             logger.info(f"Valid destination city detected: {city}")
+            self.prefetch_route(tracker, tracker.get_slot("ville_depart"), city, tracker.get_slot("date_depart"))
             return {"ville_destination": city}
         else:
             dispatcher.utter_message(
@@ -125,11 +358,30 @@ class ValidateFlightForm(FormValidationAction):
     ) -> Dict[Text, Any]:
         if slot_value:
             logger.info(f"Valid departure date: {slot_value}")
+            self.prefetch_route(tracker, tracker.get_slot("ville_depart"), tracker.get_slot("ville_destination"), slot_value)
             return {"date_depart": slot_value}
         else:
             dispatcher.utter_message(text="متى تريد السفر؟ مثال: 15 مايو، غداً، الأسبوع القادم")
             return {"date_depart": None}
 
+    def prefetch_route(self, tracker, origin, destination, departure_date, classe=None):
+        """Warm the flight cache as soon as the route is known (opt-in), in the sender's class"""
+        if not FLIGHT_PREFETCHER.enabled or not origin or not destination:
+            return
+        
+        travel_class = travel_class_code(classe or tracker.get_slot("classe"))
+        try:
+            service = SerpApiFlightService()
+            if departure_date:
+                service.prefetch_flights(origin, destination, departure_date, travel_class, tracker.sender_id)
+            else:
+                # The date is not asked yet, warm the most likely ones
+                for days in FLIGHT_PREFETCH_DAYS:
+                    likely_date = (datetime.now() + timedelta(days=days)).strftime('%d %m')
+                    service.prefetch_flights(origin, destination, likely_date, travel_class, tracker.sender_id)
+        except Exception as e:
+            logger.error(f"Flight prefetch error: {e}")
+    
     def validate_classe(
         self,
         slot_value: Any,
@@ -147,9 +399,11 @@ class ValidateFlightForm(FormValidationAction):
                 return {"classe": "اقتصادية"}
             elif any(classe in slot_value_clean for classe in ["أعمال", "بزنس", "business"]):
                 logger.info("Selected business class")
+                self.prefetch_class(tracker, "أعمال")
                 return {"classe": "أعمال"}
             elif any(classe in slot_value_clean for classe in ["أولى", "فاخرة", "first", "فيرست"]):
                 logger.info("Selected first class")
+                self.prefetch_class(tracker, "أولى")
                 return {"classe": "أولى"}
             else:
                 dispatcher.utter_message(text="الدرجات المتاحة: اقتصادية، أعمال، أولى")
@@ -158,6 +412,14 @@ class ValidateFlightForm(FormValidationAction):
             dispatcher.utter_message(text="أي درجة تفضل؟ (اقتصادية، أعمال، أولى)")
             return {"classe": None}
 
+    def prefetch_class(self, tracker, classe):
+        """Warm the search in a premium class, the earlier prefetches assumed economy"""
+        if FLIGHT_PREFETCHER.enabled and tracker.get_slot("classe") != classe:
+            self.prefetch_route(
+                tracker, tracker.get_slot("ville_depart"), tracker.get_slot("ville_destination"),
+                tracker.get_slot("date_depart"), classe
+            )
+
 
 class ValidateHotelForm(FormValidationAction):
     """Validate hotel booking form inputs"""
@@ -180,16 +442,17 @@ class ValidateHotelForm(FormValidationAction):
         entities = tracker.latest_message.get('entities', [])
         
         for entity in entities:
-            entity_value = entity.get('value', '')
-            if any(moroccan_city in entity_value for moroccan_city in MOROCCAN_CITIES):
-                city = entity_value
+            match = CITY_GAZETTEER.find(entity.get('value', ''), 'moroccan')
+            if match:
+                city = match.city
                 logger.info(f"Found hotel city in entity: {city}")
                 break
                 
         if not city and slot_value:
-            city = slot_value
+            match = CITY_GAZETTEER.find(slot_value, 'moroccan')
+            city = match.city if match else None
             
-        if city and any(moroccan_city in city for moroccan_city in MOROCCAN_CITIES):
+        if city:
             logger.info(f"Valid hotel city detected: {city}")
             return {"ville_hotel": city}
         else:
@@ -255,76 +518,161 @@ class SerpApiFlightService:
     
     def __init__(self):
         self.serpapi_key = os.getenv('SERPAPI_KEY', 'demo_key')
-        self.serpapi_url = 'https://serpapi.com/search'
+        self.serpapi_url = f"{SERPAPI_BASE_URL}/search"
+        self.http = get_http_client()
         
-    def search_flights(self, origin, destination, departure_date, travel_class='ECONOMY'):
+    async def search_flights(self, origin, destination, departure_date, travel_class='ECONOMY',
+                             use_cache=True, sender_id=None):
         """Search flights using SerpApi Google Flights"""
         try:
-            origin_code = self.get_airport_code(origin)
-            dest_code = self.get_airport_code(destination)
-            formatted_date = self.parse_arabic_date(departure_date)
+            request = self.build_search_request(origin, destination, departure_date, travel_class)
+            if request is None:
+                logger.warning(f"No airport known for {origin} -> {destination}, using fallback")
+                return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
+            cache_key, params = request
             
-            logger.info(f"SerpApi: Searching flights {origin_code} -> {dest_code} on {formatted_date}")
+            logger.info(f"SerpApi: Searching flights {params['departure_id']} -> {params['arrival_id']} on {params['outbound_date']}")
             
             # Check if we have a valid API key
             if self.serpapi_key == 'demo_key':
                 logger.warning("SerpApi key not configured, using fallback")
-                return self.get_fallback_flights(origin, destination, departure_date, travel_class)
-            
-            params = {
-                'engine': 'google_flights',
-                'departure_id': origin_code,
-                'arrival_id': dest_code,
-                'outbound_date': formatted_date,
-                'currency': 'MAD',
-                'hl': 'en',
-                'api_key': self.serpapi_key
-            }
-            
-            # Add travel class if not economy
-            if travel_class != 'ECONOMY':
-                params['travel_class'] = travel_class.lower()
-            
-            response = requests.get(self.serpapi_url, params=params, timeout=15)
+                return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
+            
+            # Serve identical route queries from the cache, revalidating stale entries
+            if use_cache:
+                cached = FLIGHT_SEARCH_CACHE.lookup(cache_key)
+                if cached:
+                    logger.info(f"SerpApi flight cache hit for {cache_key} (age {cached.age:.0f}s)")
+                    FLIGHT_PREFETCHER.mark_used(cache_key)
+                    if cached.stale:
+                        refresh_in_background(
+                            FLIGHT_SEARCH_REQUESTS.do(cache_key, lambda: self.fetch_search(params, cache_key=cache_key)),
+                            f"flights {cache_key}"
+                        )
+                    return self.format_serpapi_results(
+                        cached.value, origin, destination, departure_date, travel_class,
+                        age=cached.age, sender_id=sender_id
+                    )
+            
+            # A search still being prefetched is joined rather than repeated
+            if FLIGHT_SEARCH_REQUESTS.in_flight(cache_key):
+                FLIGHT_PREFETCHER.mark_used(cache_key)
+            status, data = await FLIGHT_SEARCH_REQUESTS.do(
+                cache_key, lambda: self.fetch_search(params, sender_id, cache_key)
+            )
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 logger.info("SerpApi flight search successful")
-                return self.format_serpapi_results(data, origin, destination, departure_date, travel_class)
-            elif response.status_code == 401:
+                return self.format_serpapi_results(
+                    data, origin, destination, departure_date, travel_class, sender_id=sender_id
+                )
+            elif status == 401:
                 logger.error("SerpApi authentication failed - check API key")
-                return self.get_fallback_flights(origin, destination, departure_date, travel_class)
+                return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
             else:
-                logger.warning(f"SerpApi returned status {response.status_code}")
-                return self.get_fallback_flights(origin, destination, departure_date, travel_class)
+                logger.warning(f"SerpApi returned status {status}")
+                return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
                 
-        except requests.exceptions.Timeout:
+        except CircuitOpenError:
+            logger.warning("SerpApi flights circuit open, using fallback")
+            return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
+        except QuotaExceededError:
+            logger.warning("SerpApi quota reached, using fallback flights")
+            return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
+        except asyncio.TimeoutError:
             logger.error("SerpApi request timeout")
-            return self.get_fallback_flights(origin, destination, departure_date, travel_class)
+            return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
         except Exception as e:
             logger.error(f"SerpApi flight search error: {e}")
-            return self.get_fallback_flights(origin, destination, departure_date, travel_class)
+            return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
     
-    def format_serpapi_results(self, data, origin, destination, departure_date, travel_class):
+    def build_search_request(self, origin, destination, departure_date, travel_class='ECONOMY'):
+        """Build the cache key and Google Flights parameters for a search, None for an unknown city"""
+        origin_code = CITY_REGISTRY.airport_code(origin)
+        dest_code = CITY_REGISTRY.airport_code(destination)
+        if origin_code is None or dest_code is None:
+            return None
+        dates = self.travel_dates(departure_date)
+        formatted_date = dates.start.isoformat()
+        return_date = dates.end.isoformat() if dates.end else None
+        
+        params = {
+            'engine': 'google_flights',
+            'departure_id': origin_code,
+            'arrival_id': dest_code,
+            'outbound_date': formatted_date,
+            'currency': 'MAD',
+            'hl': 'en',
+            'api_key': self.serpapi_key
+        }
+        
+        # A date range is searched as a round trip
+        if return_date:
+            params['return_date'] = return_date
+        
+        # Add travel class if not economy
+        if travel_class != 'ECONOMY':
+            params['travel_class'] = travel_class.lower()
+        
+        cache_key = (origin_code, dest_code, formatted_date, str(travel_class).upper())
+        if return_date:
+            cache_key += (return_date,)
+        return cache_key, params
+    
+    def prefetch_flights(self, origin, destination, departure_date, travel_class='ECONOMY', sender_id=None):
+        """Speculatively warm the cache for a search the user is likely to make, charged to that user"""
+        if self.serpapi_key == 'demo_key':
+            return False
+        request = self.build_search_request(origin, destination, departure_date, travel_class)
+        if request is None:
+            return False
+        cache_key, params = request
+        if cache_key in FLIGHT_SEARCH_CACHE or FLIGHT_SEARCH_REQUESTS.in_flight(cache_key):
+            return False
+        if not SERPAPI_QUOTA.admits_prefetch(sender_id, FLIGHT_PREFETCH_RESERVE):
+            FLIGHT_PREFETCHER.skipped += 1
+            logger.info(f"Skipping flight prefetch {cache_key}: SerpApi budget low or sender allowance nearly used")
+            return False
+        return FLIGHT_PREFETCHER.prefetch(
+            cache_key,
+            lambda: FLIGHT_SEARCH_REQUESTS.do(cache_key, lambda: self.fetch_search(params, sender_id, cache_key))
+        )
+    
+    async def fetch_search(self, params, sender_id=None, cache_key=None):
+        """Quota-checked, breaker-protected Google Flights request that refreshes the cache"""
+        SERPAPI_QUOTA.acquire(sender_id)
+        status, data = await FLIGHT_SEARCH_BREAKER.call(
+            lambda: FLIGHT_SEARCH_HEDGER.call(lambda: self.http.get_json(self.serpapi_url, params, timeout=15))
+        )
+        if status == 200:
+            SERPAPI_QUOTA.record_usage()
+            if cache_key:
+                FLIGHT_SEARCH_CACHE.set(cache_key, data)
+        return status, data
+    
+    def format_serpapi_results(self, data, origin, destination, departure_date, travel_class, age=None,
+                               sender_id=None):
         """Format SerpApi Google Flights results"""
         try:
-            # Try different result keys that SerpApi might return
-            flights = (data.get('best_flights', []) or 
-                      data.get('other_flights', []) or 
-                      data.get('flights', []))
+            # Every result bucket SerpApi returns, merged and deduplicated
+            options = FLIGHT_RANKER.options(data)
             
-            if not flights:
+            if not options:
                 logger.info("No flights found in SerpApi response, using fallback")
-                return self.get_fallback_flights(origin, destination, departure_date, travel_class)
+                return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
             
-            message = f"🛫 **رحلات Google Flights من {origin} إلى {destination}**\n"
-            message += f"📅 تاريخ السفر: {departure_date}\n"
+            parts = [messages.GOOGLE_FLIGHTS_HEADER.render(origin=origin, destination=destination)]
+            parts.append(messages.TRAVEL_DATE_LINE.render(departure_date=departure_date))
+            if age is not None:
+                parts.append(messages.PRICES_AGE_LINE.render(age=describe_age(age)))
             if travel_class and travel_class != 'ECONOMY':
-                message += f"💺 الدرجة: {self.translate_class(travel_class)}\n"
-            message += "\n" + "="*45 + "\n\n"
-            
-            # Display up to 2 best flights
-            for i, flight in enumerate(flights[:2]):
+                parts.append(messages.TRAVEL_CLASS_LINE.render(travel_class=self.translate_class(travel_class)))
+            parts.append(messages.FLIGHT_COUNT_LINE.render(count=len(options)))
+            parts.append(messages.RULE_45)
+
+            # Display the 2 best flights by price, duration and stops
+            shown = []
+            for i, flight in enumerate(FLIGHT_RANKER.top(data, 2)):
                 # Extract airline information
                 flight_legs = flight.get('flights', [])
                 if flight_legs:
@@ -337,6 +685,7 @@ class SerpApiFlightService:
                 # Extract pricing
                 price_usd = flight.get('price', 350)
                 price_mad = int(price_usd * 10.2)  # Convert USD to MAD
+                shown.append((f"{airline} {flight_number}", price_mad))
                 
                 # Extract timing
                 total_duration = flight.get('total_duration', '4h 30m')
@@ -352,111 +701,43 @@ class SerpApiFlightService:
                 # Count stops
                 stops = len(flight_legs) - 1 if flight_legs else 0
                 
-                message += f"✈️ **الخيار {i+1}: {airline} {flight_number}**\n"
-                message += f"   🕐 المغادرة: {dep_time} - الوصول: {arr_time}\n"
-                message += f"   💰 السعر: {price_mad:,} درهم (≈${price_usd})\n"
-                message += f"   ⏱️ مدة الرحلة: {total_duration}\n"
-                message += f"   🔄 التوقفات: {stops} {'توقف' if stops == 1 else 'توقفات' if stops > 1 else 'مباشرة'}\n"
-                message += f"   ⭐ التقييم: {random.uniform(4.0, 4.8):.1f}/5\n"
-                
+                parts.append(messages.GOOGLE_FLIGHT_OPTION.render(
+                    number=i + 1, airline=airline, flight_number=flight_number,
+                    dep_time=dep_time, arr_time=arr_time, price_mad=price_mad, price_usd=price_usd,
+                    duration=total_duration, stops=stops,
+                    stops_label='توقف' if stops == 1 else 'توقفات' if stops > 1 else 'مباشرة',
+                    rating=stable_rating(airline, flight_number, dep_time)
+                ))
+
                 # Add layover info if applicable
                 if stops > 0 and flight_legs:
                     layover_airports = [leg.get('arrival_airport', {}).get('id', '') for leg in flight_legs[:-1]]
-                    message += f"   🔄 التوقف في: {', '.join(filter(None, layover_airports))}\n"
-                
-                message += "\n"
-            
-            message += "🔹 أي خيار تفضل؟ قل **'الخيار الأول'** أو **'الخيار الثاني'**"
-            return message
+                    parts.append(messages.LAYOVER_LINE.render(airports=', '.join(filter(None, layover_airports))))
+
+                parts.append("\n")
+
+            parts.append(messages.CHOOSE_OPTION)
+            self.remember_shown_offers(
+                sender_id, self.fallback_search_key(origin, destination, departure_date, travel_class),
+                'google_flights', shown
+            )
+            return ''.join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting SerpApi results: {e}")
-            return self.get_fallback_flights(origin, destination, departure_date, travel_class)
-    
-    def get_airport_code(self, city_name):
-        """Map city names to IATA airport codes"""
-        city_to_airport = {
-            # Moroccan cities
-            'الرباط': 'RBA',
-            'الدار البيضاء': 'CMN',
-            'الدارالبيضاء': 'CMN',
-            'مراكش': 'RAK',
-            'فاس': 'FEZ',
-            'أكادير': 'AGA',
-            'طنجة': 'TNG',
-            'وجدة': 'OUD',
-            'تطوان': 'TTU',
-            'الحسيمة': 'AHU',
-            'القنيطرة': 'NNA',
-            'سلا': 'RBA',  # Same as Rabat
-            
-            # International destinations
-            'باريس': 'CDG',
-            'لندن': 'LHR',
-            'مدريد': 'MAD',
-            'دبي': 'DXB',
-            'القاهرة': 'CAI',
-            'تونس': 'TUN',
-            'إسطنبول': 'IST',
-            'روما': 'FCO',
-            'برلين': 'BER',
-            'أمستردام': 'AMS',
-            'بروكسل': 'BRU',
-            'نيويورك': 'JFK',
-            'تورنتو': 'YYZ',
-            'مونتريال': 'YUL',
-            'جنيف': 'GVA',
-            'زيوريخ': 'ZUR'
-        }
-        return city_to_airport.get(city_name, 'CMN')
+            return self.get_fallback_flights(origin, destination, departure_date, travel_class, sender_id=sender_id)
+    
+    
+    def travel_dates(self, departure_date):
+        """Structured departure date (and return date for a range), a week from today by default"""
+        dates = parse_dates(departure_date)
+        if dates is None:
+            return DateSpan(datetime.now().date() + timedelta(days=7), None)
+        return dates
     
     def parse_arabic_date(self, departure_date):
         """Parse Arabic date to ISO format"""
-        if not departure_date:
-            return (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            
-        try:
-            months_ar = {
-                'يناير': '01', 'فبراير': '02', 'مارس': '03', 'أبريل': '04',
-                'مايو': '05', 'يونيو': '06', 'يوليو': '07', 'أغسطس': '08',
-                'سبتمبر': '09', 'أكتوبر': '10', 'نوفمبر': '11', 'ديسمبر': '12'
-            }
-            
-            # Handle special cases
-            if 'غداً' in departure_date or 'غدا' in departure_date:
-                return (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
-            elif 'بعد غد' in departure_date:
-                return (datetime.now() + timedelta(days=2)).strftime('%Y-%m-%d')
-            elif 'الأسبوع القادم' in departure_date:
-                return (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            elif 'الشهر القادم' in departure_date:
-                return (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')
-            
-            # Parse date with month name
-            for ar_month, num_month in months_ar.items():
-                if ar_month in departure_date:
-                    parts = departure_date.split()
-                    day = '15'  # Default day
-                    for part in parts:
-                        if part.isdigit() and 1 <= int(part) <= 31:
-                            day = part.zfill(2)
-                            break
-                    current_year = datetime.now().year
-                    return f"{current_year}-{num_month}-{day}"
-            
-            # Try to extract numbers for day/month
-            numbers = [int(s) for s in departure_date.split() if s.isdigit()]
-            if len(numbers) >= 2:
-                day, month = numbers[0], numbers[1]
-                if 1 <= day <= 31 and 1 <= month <= 12:
-                    current_year = datetime.now().year
-                    return f"{current_year}-{month:02d}-{day:02d}"
-            
-            # Default to one week from now
-            return (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-        except Exception as e:
-            logger.error(f"Date parsing error: {e}")
-            return (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
+        return self.travel_dates(departure_date).start.isoformat()
     
     def translate_class(self, travel_class):
         """Translate travel class to Arabic"""
@@ -484,19 +765,57 @@ class SerpApiFlightService:
             base_price = 3800
         
         # Domestic routes (Moroccan cities)
-        elif any(dest in destination for dest in MOROCCAN_CITIES):
+        elif CITY_GAZETTEER.find(destination, 'moroccan'):
             base_price = 1200
             
         return base_price
     
-    def get_fallback_flights(self, origin, destination, departure_date, travel_class):
-        """Enhanced fallback with realistic data when SerpApi fails"""
+    def shown_offer(self, origin, destination, departure_date, travel_class, option, sender_id=None):
+        """Airline and MAD price listed to the sender as option '1' or '2', None when no longer known"""
+        index = {'1': 0, '2': 1}.get(option)
+        if index is None or not origin or not destination:
+            return None
+        # Resolved against the source that actually answered: Google Flights or the fallback inventory
+        shown = SHOWN_OFFERS.lookup(
+            (sender_id,) + self.fallback_search_key(origin, destination, departure_date, travel_class)
+        )
+        if shown is not None:
+            source, offers = shown.value
+            logger.info(f"Option {option} resolved against the {source} offers shown to {sender_id}")
+            return offers[index] if index < len(offers) else None
+        if self.serpapi_key == 'demo_key':
+            # Without a key every search is answered by the fallback inventory, which gives the same offers again
+            offers = self.fallback_offers(origin, destination, departure_date, travel_class)
+            return (offers[index].airline, offers[index].price) if index < len(offers) else None
+        return None
+    
+    def remember_shown_offers(self, sender_id, search_key, source, offers):
+        """Keep the (airline, MAD price) options listed to a sender for a search and the source they came from"""
+        SHOWN_OFFERS.set((sender_id,) + search_key, (source, tuple(offers)))
+    
+    def fallback_search_key(self, origin, destination, departure_date, travel_class):
+        """Inventory key of a fallback flight search: canonical route, travel dates and class"""
+        dates = self.travel_dates(departure_date)
+        return (
+            'flights', canonical_city(origin), canonical_city(destination),
+            dates.start.isoformat(), dates.end.isoformat() if dates.end else None,
+            travel_class_code(travel_class)
+        )
+    
+    def fallback_offers(self, origin, destination, departure_date, travel_class, key=None):
+        """Stand-in flights of a search, the same ones every time the search is made"""
+        key = key or self.fallback_search_key(origin, destination, departure_date, travel_class)
+        return FALLBACK_FLIGHTS.offers(key, lambda rng: self.generate_fallback_flights(rng, key))
+    
+    def generate_fallback_flights(self, rng, key):
+        """Realistic stand-in flights drawn from rng, which is seeded by the search key"""
+        _, origin, destination, _, _, class_code = key
         base_price = self.calculate_route_price(origin, destination)
         
         # Adjust for class
-        if 'أعمال' in str(travel_class) or 'BUSINESS' in str(travel_class):
+        if class_code == 'BUSINESS':
             base_price *= 2.5
-        elif 'أولى' in str(travel_class) or 'FIRST' in str(travel_class):
+        elif class_code == 'FIRST':
             base_price *= 4
         
         airlines = [
@@ -508,40 +827,50 @@ class SerpApiFlightService:
             ('التركية', 'TURKISH AIRLINES')
         ]
         
-        message = f"🛫 **رحلات متاحة من {origin} إلى {destination}**\n"
-        if departure_date:
-            message += f"📅 تاريخ السفر: {departure_date}\n"
-        if travel_class and travel_class != 'ECONOMY':
-            message += f"💺 الدرجة: {self.translate_class(travel_class)}\n"
-        message += "\n" + "="*45 + "\n\n"
-        
+        flights = []
         for i in range(2):
             airline_ar, airline_en = airlines[i % len(airlines)]
-            price = base_price + random.randint(-300, 500)
-            dep_hour = random.randint(6, 22)
-            dep_min = random.choice(['00', '15', '30', '45'])
+            price = int(base_price + rng.randint(-300, 500))
+            dep_hour = rng.randint(6, 22)
+            dep_min = rng.choice(['00', '15', '30', '45'])
             
             # Calculate realistic flight duration
-            if any(dest in destination for dest in MOROCCAN_CITIES):
-                duration_hours = random.randint(1, 3)
+            if CITY_GAZETTEER.find(destination, 'moroccan'):
+                duration_hours = rng.randint(1, 3)
             elif any(dest in destination for dest in ['باريس', 'لندن', 'مدريد']):
-                duration_hours = random.randint(3, 4)
+                duration_hours = rng.randint(3, 4)
             else:
-                duration_hours = random.randint(4, 12)
+                duration_hours = rng.randint(4, 12)
                 
             arr_hour = (dep_hour + duration_hours) % 24
-            arr_min = random.choice(['00', '15', '30', '45'])
-            
-            message += f"✈️ **الخيار {i+1}: {airline_ar}**\n"
-            message += f"   🕐 المغادرة: {dep_hour:02d}:{dep_min} - الوصول: {arr_hour:02d}:{arr_min}\n"
-            message += f"   💰 السعر: {price:,} درهم\n"
-            message += f"   ⏱️ مدة الرحلة: {duration_hours}h {random.randint(0, 5)}0m\n"
-            message += f"   🔄 التوقفات: {'مباشرة' if i == 0 else '1 توقف'}\n"
-            message += f"   ⭐ التقييم: {random.uniform(4.0, 4.8):.1f}/5\n"
-            message += f"   🎯 المميزات: {'وجبة مجانية، أمتعة 23 كغ' if i == 0 else 'سعر اقتصادي، خدمة موثوقة'}\n\n"
-        
-        message += "🔹 أي خيار تفضل؟ قل **'الخيار الأول'** أو **'الخيار الثاني'**"
-        return message
+            arr_min = rng.choice(['00', '15', '30', '45'])
+            
+            flights.append(FallbackFlight(
+                airline=airline_ar, dep_hour=dep_hour, dep_min=dep_min, arr_hour=arr_hour, arr_min=arr_min,
+                price=price, duration_hours=duration_hours, duration_tens=rng.randint(0, 5),
+                stops='مباشرة' if i == 0 else '1 توقف',
+                rating=rng.uniform(4.0, 4.8),
+                features='وجبة مجانية، أمتعة 23 كغ' if i == 0 else 'سعر اقتصادي، خدمة موثوقة'
+            ))
+        return flights
+    
+    def get_fallback_flights(self, origin, destination, departure_date, travel_class, sender_id=None):
+        """Enhanced fallback with realistic data when SerpApi fails"""
+        parts = [messages.FALLBACK_FLIGHTS_HEADER.render(origin=origin, destination=destination)]
+        if departure_date:
+            parts.append(messages.TRAVEL_DATE_LINE.render(departure_date=departure_date))
+        if travel_class and travel_class != 'ECONOMY':
+            parts.append(messages.TRAVEL_CLASS_LINE.render(travel_class=self.translate_class(travel_class)))
+        parts.append(messages.RULE_45)
+        
+        key = self.fallback_search_key(origin, destination, departure_date, travel_class)
+        offers = self.fallback_offers(origin, destination, departure_date, travel_class, key)
+        for i, flight in enumerate(offers):
+            parts.append(messages.FALLBACK_FLIGHT_OPTION.render(number=i + 1, **flight._asdict()))
+        
+        parts.append(messages.CHOOSE_OPTION)
+        self.remember_shown_offers(sender_id, key, 'fallback', [(flight.airline, flight.price) for flight in offers])
+        return ''.join(parts)
 
 
 class SerpApiHotelService:
@@ -549,13 +878,16 @@ class SerpApiHotelService:
     
     def __init__(self):
         self.serpapi_key = os.getenv('SERPAPI_KEY', 'demo_key')
-        self.serpapi_url = 'https://serpapi.com/search'
+        self.serpapi_url = f"{SERPAPI_BASE_URL}/search"
+        self.http = get_http_client()
         
-    def search_hotels(self, city, category, num_guests, quarter=None):
+    async def search_hotels(self, city, category, num_guests, quarter=None, use_cache=True, sender_id=None,
+                            stay=None):
         """Search hotels using SerpApi Google Hotels"""
         try:
-            checkin_date = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            checkout_date = (datetime.now() + timedelta(days=8)).strftime('%Y-%m-%d')
+            dates = self.stay_dates(stay)
+            checkin_date = dates.start.isoformat()
+            checkout_date = dates.check_out.isoformat()
             adults = self.parse_guests(num_guests)
             
             logger.info(f"SerpApi: Searching hotels in {city} for {adults} guests")
@@ -563,7 +895,17 @@ class SerpApiHotelService:
             # Check if we have a valid API key
             if self.serpapi_key == 'demo_key':
                 logger.warning("SerpApi key not configured, using fallback")
-                return self.get_fallback_hotels(city, category, num_guests, quarter)
+                return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
+            
+            # The category is applied locally, so it is not part of the cache key
+            cache_key = self.hotel_cache_key(city, quarter, adults, checkin_date, checkout_date)
+            if use_cache:
+                hotels = HOTEL_SEARCH_CACHE.get(cache_key)
+                if hotels is not None:
+                    logger.info(f"SerpApi hotel cache hit for {cache_key}")
+                    return self.format_serpapi_hotels_results(
+                        {'properties': hotels}, city, category, num_guests, quarter, sender_id, stay
+                    )
             
             # Build search query
             search_query = f"hotels in {city}"
@@ -581,45 +923,104 @@ class SerpApiHotelService:
                 'api_key': self.serpapi_key
             }
             
-            response = requests.get(self.serpapi_url, params=params, timeout=15)
+            status, data = await HOTEL_SEARCH_REQUESTS.do(
+                cache_key, lambda: self.fetch_search(params, sender_id, cache_key)
+            )
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 logger.info("SerpApi hotel search successful")
-                return self.format_serpapi_hotels_results(data, city, category, num_guests, quarter)
-            elif response.status_code == 401:
+                return self.format_serpapi_hotels_results(
+                    data, city, category, num_guests, quarter, sender_id, stay
+                )
+            elif status == 401:
                 logger.error("SerpApi authentication failed - check API key")
-                return self.get_fallback_hotels(city, category, num_guests, quarter)
+                return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
             else:
-                logger.warning(f"SerpApi hotels returned status {response.status_code}")
-                return self.get_fallback_hotels(city, category, num_guests, quarter)
+                logger.warning(f"SerpApi hotels returned status {status}")
+                return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
                 
-        except requests.exceptions.Timeout:
+        except CircuitOpenError:
+            logger.warning("SerpApi hotels circuit open, using fallback")
+            return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
+        except QuotaExceededError:
+            logger.warning("SerpApi quota reached, using fallback hotels")
+            return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
+        except asyncio.TimeoutError:
             logger.error("SerpApi hotels request timeout")
-            return self.get_fallback_hotels(city, category, num_guests, quarter)
+            return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
         except Exception as e:
             logger.error(f"SerpApi hotel search error: {e}")
-            return self.get_fallback_hotels(city, category, num_guests, quarter)
+            return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
+    
+    async def fetch_search(self, params, sender_id=None, cache_key=None):
+        """Quota-checked, breaker-protected Google Hotels request that refreshes the cache"""
+        SERPAPI_QUOTA.acquire(sender_id)
+        status, data = await HOTEL_SEARCH_BREAKER.call(
+            lambda: HOTEL_SEARCH_HEDGER.call(lambda: self.http.get_json(self.serpapi_url, params, timeout=15))
+        )
+        if status == 200:
+            SERPAPI_QUOTA.record_usage()
+            if cache_key:
+                HOTEL_SEARCH_CACHE.set(cache_key, data.get('properties', []))
+        return status, data
+    
+    def hotel_cache_key(self, city, quarter, adults, checkin_date, checkout_date):
+        """Normalized cache key for a hotel search, spelling variants of a city share it"""
+        city_key = canonical_city(city)
+        quarter_key = ' '.join(str(quarter).split()).lower() if quarter else ''
+        return (city_key, quarter_key, adults, checkin_date, checkout_date)
+    
+    def stay_dates(self, stay):
+        """Check-in a week from today for one night unless the stay names its dates"""
+        return parse_dates(stay) or DateSpan(datetime.now().date() + timedelta(days=7), None)
     
-    def format_serpapi_hotels_results(self, data, city, category, num_guests, quarter):
+    def shown_hotels_key(self, city, category, num_guests, quarter, stay):
+        """Key of the hotels listed for a search: the search cache key and the category that ranked them"""
+        dates = self.stay_dates(stay)
+        search_key = self.hotel_cache_key(
+            city, quarter, self.parse_guests(num_guests), dates.start.isoformat(), dates.check_out.isoformat()
+        )
+        return ('hotels',) + search_key + (' '.join(str(category or '').split()),)
+    
+    def remember_shown_offers(self, sender_id, search_key, source, offers):
+        """Keep the (name, MAD price per night) options listed to a sender for a search and their source"""
+        SHOWN_OFFERS.set((sender_id,) + search_key, (source, tuple(offers)))
+    
+    def shown_hotel(self, city, category, num_guests, quarter, stay, option, sender_id=None):
+        """Hotel name and MAD price per night listed to the sender as option '1' or '2', None when no longer known"""
+        index = {'1': 0, '2': 1}.get(option)
+        if index is None or not city:
+            return None
+        # Resolved against the source that actually answered: Google Hotels or the fallback inventory
+        shown = SHOWN_OFFERS.lookup((sender_id,) + self.shown_hotels_key(city, category, num_guests, quarter, stay))
+        if shown is not None:
+            source, offers = shown.value
+            logger.info(f"Hotel option {option} resolved against the {source} offers shown to {sender_id}")
+            return offers[index] if index < len(offers) else None
+        if self.serpapi_key == 'demo_key':
+            # Without a key every search is answered by the fallback inventory, which gives the same hotels again
+            offers = self.fallback_hotel_offers(city, category)
+            return (offers[index]['name'], offers[index]['price']) if index < len(offers) else None
+        return None
+    
+    def format_serpapi_hotels_results(self, data, city, category, num_guests, quarter, sender_id=None, stay=None):
         """Format SerpApi Google Hotels results"""
         try:
             hotels = data.get('properties', [])
             if not hotels:
                 logger.info("No hotels found in SerpApi response, using fallback")
-                return self.get_fallback_hotels(city, category, num_guests, quarter)
+                return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
             
-            message = f"🏨 **فنادق Google Hotels في {city}**\n"
-            message += f"⭐ الفئة: {category}\n"
-            message += f"👥 عدد الأشخاص: {num_guests}\n"
+            parts = [messages.GOOGLE_HOTELS_HEADER.render(city=city, category=category, num_guests=num_guests)]
             if quarter:
-                message += f"📍 المنطقة المفضلة: {quarter}\n"
-            message += "\n" + "="*45 + "\n\n"
+                parts.append(messages.PREFERRED_QUARTER_LINE.render(quarter=quarter))
+            parts.append(messages.RULE_45)
             
             # Filter and sort hotels based on category preference
-            filtered_hotels = self.filter_hotels_by_category(hotels, category)
+            filtered_hotels = self.filter_hotels_by_category(hotels, category, limit=2, city=city)
             
-            for i, hotel in enumerate(filtered_hotels[:2]):
+            shown = []
+            for i, hotel in enumerate(filtered_hotels):
                 hotel_name = hotel.get('name', f'فندق Google {i+1}')
                 
                 # Extract pricing
@@ -629,6 +1030,7 @@ class SerpApiHotelService:
                 else:
                     price_usd = 80
                 price_mad = int(price_usd * 10.2)  # Convert USD to MAD
+                shown.append((hotel_name, price_mad))
                 
                 # Extract rating
                 rating = hotel.get('overall_rating', 4.2)
@@ -636,75 +1038,46 @@ class SerpApiHotelService:
                 # Extract location/type
                 hotel_type = hotel.get('type', 'فندق')
                 
-                message += f"🏨 **الخيار {i+1}: {hotel_name}**\n"
-                message += f"   💰 السعر: {price_mad:,} درهم/ليلة (≈${price_usd})\n"
-                message += f"   ⭐ التقييم Google: {rating}/5\n"
-                message += f"   🏢 النوع: {self.translate_hotel_type(hotel_type)}\n"
-                
+                parts.append(messages.GOOGLE_HOTEL_OPTION.render(
+                    number=i + 1, name=hotel_name, price_mad=price_mad, price_usd=price_usd,
+                    rating=rating, hotel_type=self.translate_hotel_type(hotel_type)
+                ))
+
                 # Add amenities from Google
                 amenities = hotel.get('amenities', [])
                 if amenities:
                     amenities_ar = [self.translate_amenity(a) for a in amenities[:3]]
-                    message += f"   🎯 المميزات: {', '.join(amenities_ar)}\n"
+                    parts.append(messages.HOTEL_AMENITIES_LINE.render(amenities=', '.join(amenities_ar)))
                 else:
-                    message += f"   🎯 المميزات: مرافق ممتازة، خدمة متميزة\n"
-                
+                    parts.append(messages.HOTEL_DEFAULT_AMENITIES)
+
                 # Add location if available
                 if hotel.get('gps_coordinates'):
-                    message += f"   📍 الموقع: موقع مركزي ممتاز\n"
+                    parts.append(messages.HOTEL_CENTRAL_LOCATION)
                 elif hotel.get('district'):
-                    message += f"   📍 المنطقة: {hotel['district']}\n"
-                
-                message += "\n"
-            
-            message += "🔹 أي فندق تفضل؟ قل **'الخيار الأول'** أو **'الخيار الثاني'**"
-            return message
+                    parts.append(messages.HOTEL_DISTRICT_LINE.render(district=hotel['district']))
+
+                parts.append("\n")
+
+            parts.append(messages.CHOOSE_HOTEL)
+            self.remember_shown_offers(
+                sender_id, self.shown_hotels_key(city, category, num_guests, quarter, stay), 'google_hotels', shown
+            )
+            return ''.join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting SerpApi hotels results: {e}")
-            return self.get_fallback_hotels(city, category, num_guests, quarter)
+            return self.get_fallback_hotels(city, category, num_guests, quarter, sender_id, stay)
     
-    def filter_hotels_by_category(self, hotels, category):
-        """Filter hotels based on category preference"""
+    def filter_hotels_by_category(self, hotels, category, limit=None, city=None):
+        """Rank hotels by category preference, keeping only the best limit of them"""
         if not category:
-            return hotels
+            return hotels[:limit]
         
-        # Priority scoring based on category
-        scored_hotels = []
-        for hotel in hotels:
-            score = 0
-            rating = hotel.get('overall_rating', 0)
-            
-            # Score based on category preference
-            if '5' in str(category) or 'فاخر' in str(category):
-                if rating >= 4.5:
-                    score += 3
-                elif rating >= 4.0:
-                    score += 2
-            elif '4' in str(category):
-                if 4.0 <= rating < 4.5:
-                    score += 3
-                elif rating >= 4.5:
-                    score += 2
-                elif rating >= 3.5:
-                    score += 1
-            elif '3' in str(category):
-                if 3.5 <= rating < 4.0:
-                    score += 3
-                elif rating >= 4.0:
-                    score += 1
-            
-            # Additional scoring factors
-            if hotel.get('rate_per_night'):
-                score += 1
-            if hotel.get('amenities'):
-                score += 1
-            
-            scored_hotels.append((hotel, score))
-        
-        # Sort by score and return
-        scored_hotels.sort(key=lambda x: x[1], reverse=True)
-        return [hotel for hotel, score in scored_hotels]
+        # Distances are measured from the city centre when the city is known
+        known_city = CITY_REGISTRY.lookup(city) if city else None
+        centre = (known_city.latitude, known_city.longitude) if known_city else None
+        return HOTEL_RANKER.rank(hotels, category, limit, centre)
     
     def parse_guests(self, num_guests):
         """Parse Arabic guest count to number"""
@@ -777,8 +1150,23 @@ class SerpApiHotelService:
         }
         return translations.get(hotel_type, 'فندق')
     
-    def get_fallback_hotels(self, city, category, num_guests, quarter):
-        """Fallback with realistic hotel data when SerpApi fails"""
+    def fallback_hotel_key(self, city, category):
+        """Inventory key of a fallback hotel search: canonical city and category price factor"""
+        factor = 1.0
+        if '4' in str(category):
+            factor = 1.3
+        elif '5' in str(category) or 'فاخر' in str(category):
+            factor = 1.8
+        return ('hotels', canonical_city(city), factor)
+    
+    def fallback_hotel_offers(self, city, category):
+        """Stand-in hotels of a search, the same ones every time the search is made"""
+        key = self.fallback_hotel_key(city, category)
+        return FALLBACK_HOTELS.offers(key, lambda: self.generate_fallback_hotels(key))
+    
+    def generate_fallback_hotels(self, key):
+        """City-specific stand-in hotels priced for the category factor of the key"""
+        _, city, factor = key
         # Base price calculation
         base_price = 600
         if 'مراكش' in city:
@@ -794,14 +1182,12 @@ class SerpApiHotelService:
         elif 'فاس' in city:
             base_price = 620
         
-        # Adjust for category
-        if '4' in str(category):
-            base_price *= 1.3
-        elif '5' in str(category) or 'فاخر' in str(category):
-            base_price *= 1.8
-        
         # City-specific hotels with realistic data
-        hotels_data = self.get_city_hotels(city, base_price)
+        return self.get_city_hotels(city, base_price * factor)
+    
+    def get_fallback_hotels(self, city, category, num_guests, quarter, sender_id=None, stay=None):
+        """Fallback with realistic hotel data when SerpApi fails"""
+        hotels_data = self.fallback_hotel_offers(city, category)
         
         message = f"🏨 **فنادق متاحة في {city}**\n"
         message += f"⭐ الفئة: {category}\n"
@@ -818,6 +1204,10 @@ class SerpApiHotelService:
             message += f"   📍 الموقع: {hotel['location']}\n\n"
         
         message += "🔹 أي فندق تفضل؟ قل **'الخيار الأول'** أو **'الخيار الثاني'**"
+        self.remember_shown_offers(
+            sender_id, self.shown_hotels_key(city, category, num_guests, quarter, stay), 'fallback',
+            [(hotel['name'], hotel['price']) for hotel in hotels_data]
+        )
         return message
     
     def get_city_hotels(self, city, base_price):
@@ -915,9 +1305,10 @@ class AviationStackService:
     
     def __init__(self):
         self.aviationstack_key = os.getenv('AVIATIONSTACK_API_KEY', 'demo_key')
-        self.base_url = 'http://api.aviationstack.com/v1'
+        self.base_url = AVIATIONSTACK_BASE_URL
+        self.http = get_http_client()
         
-    def get_flight_info(self, origin, destination):
+    async def get_flight_info(self, origin, destination):
         """Get real-time flight information using AviationStack API"""
         try:
             # Check if we have a valid API key
@@ -925,8 +1316,11 @@ class AviationStackService:
                 logger.warning("AviationStack key not configured, skipping real-time data")
                 return None
                 
-            origin_code = self.get_airport_code(origin)
-            dest_code = self.get_airport_code(destination)
+            origin_code = CITY_REGISTRY.airport_code(origin)
+            dest_code = CITY_REGISTRY.airport_code(destination)
+            if origin_code is None or dest_code is None:
+                logger.info(f"No airport known for {origin} -> {destination}, skipping real-time data")
+                return None
             
             logger.info(f"AviationStack: Getting real-time flight info {origin_code} -> {dest_code}")
             
@@ -939,37 +1333,65 @@ class AviationStackService:
                 'limit': 5
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            # Serve recent data from the cache, revalidating stale entries
+            cache_key = (origin_code, dest_code)
+            cached = FLIGHT_INFO_CACHE.lookup(cache_key)
+            if cached:
+                if cached.stale:
+                    refresh_in_background(
+                        FLIGHT_INFO_REQUESTS.do(cache_key, lambda: self.fetch_flights(url, params, cache_key)),
+                        f"real-time flights {cache_key}"
+                    )
+                if cached.value.get('data'):
+                    return self.format_realtime_info(cached.value, origin, destination, age=cached.age)
+                return None
+            
+            status, data = await FLIGHT_INFO_REQUESTS.do(
+                cache_key, lambda: self.fetch_flights(url, params, cache_key)
+            )
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 if data.get('data'):
                     logger.info("AviationStack real-time data retrieved successfully")
                     return self.format_realtime_info(data, origin, destination)
                 else:
                     logger.info("No real-time flights found")
                     return None
-            elif response.status_code == 401:
+            elif status == 401:
                 logger.error("AviationStack authentication failed - check API key")
                 return None
             else:
-                logger.warning(f"AviationStack returned status {response.status_code}")
+                logger.warning(f"AviationStack returned status {status}")
                 return None
                 
-        except requests.exceptions.Timeout:
+        except CircuitOpenError:
+            logger.warning("AviationStack circuit open, skipping real-time data")
+            return None
+        except asyncio.TimeoutError:
             logger.error("AviationStack request timeout")
             return None
         except Exception as e:
             logger.error(f"AviationStack API error: {e}")
             return None
     
-    def get_airport_info(self, city):
+    async def fetch_flights(self, url, params, cache_key):
+        """Breaker-protected AviationStack flights request that refreshes the cache"""
+        status, data = await AVIATIONSTACK_BREAKER.call(
+            lambda: self.http.get_json(url, params, timeout=10)
+        )
+        if status == 200:
+            FLIGHT_INFO_CACHE.set(cache_key, data)
+        return status, data
+    
+    async def get_airport_info(self, city):
         """Get airport information for a city"""
         try:
             if self.aviationstack_key == 'demo_key':
                 return []
                 
-            airport_code = self.get_airport_code(city)
+            airport_code = CITY_REGISTRY.airport_code(city)
+            if airport_code is None:
+                return []
             
             url = f"{self.base_url}/airports"
             params = {
@@ -977,66 +1399,72 @@ class AviationStackService:
                 'iata_code': airport_code
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            status, data = await AVIATIONSTACK_BREAKER.call(
+                lambda: self.http.get_json(url, params, timeout=10)
+            )
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 return data.get('data', [])
             
             return []
             
+        except CircuitOpenError:
+            logger.warning("AviationStack circuit open, skipping airport info")
+            return []
         except Exception as e:
             logger.error(f"AviationStack airport info error: {e}")
             return []
     
-    def format_realtime_info(self, data, origin, destination):
+    def format_realtime_info(self, data, origin, destination, age=None):
         """Format real-time flight information"""
         try:
             flights = data.get('data', [])
             
-            message = f"📡 **معلومات الرحلات المباشرة** (AviationStack)\n"
-            message += f"✈️ من {origin} إلى {destination}\n\n"
-            
+            parts = [messages.REALTIME_HEADER.render(origin=origin, destination=destination)]
+            if age is not None:
+                parts.append(messages.REALTIME_AGE_LINE.render(age=describe_age(age)))
+            parts.append("\n")
+
             active_flights = [f for f in flights if f.get('flight_status') in ['active', 'scheduled', 'en-route']]
-            
+
             if active_flights:
-                message += f"🟢 **الرحلات النشطة الآن:** {len(active_flights)}\n\n"
-                
+                parts.append(messages.REALTIME_ACTIVE_COUNT.render(count=len(active_flights)))
+
                 for i, flight in enumerate(active_flights[:3]):
                     airline = flight.get('airline', {}).get('name', 'شركة طيران')
                     flight_number = flight.get('flight', {}).get('iata', 'XX123')
                     status = self.translate_status(flight.get('flight_status', 'scheduled'))
-                    
-                    message += f"✈️ **{airline} {flight_number}**\n"
-                    message += f"   📊 الحالة: {status}\n"
-                    
+
+                    parts.append(messages.REALTIME_FLIGHT.render(
+                        airline=airline, flight_number=flight_number, status=status
+                    ))
+
                     # Add departure info if available
                     departure = flight.get('departure', {})
                     if departure.get('scheduled'):
                         dep_time = departure['scheduled'][:16].replace('T', ' ')
-                        message += f"   🕐 المغادرة المجدولة: {dep_time}\n"
+                        parts.append(messages.REALTIME_SCHEDULED_DEPARTURE.render(time=dep_time))
                     if departure.get('actual') and departure.get('actual') != departure.get('scheduled'):
                         act_time = departure['actual'][:16].replace('T', ' ')
-                        message += f"   🕐 المغادرة الفعلية: {act_time}\n"
-                    
+                        parts.append(messages.REALTIME_ACTUAL_DEPARTURE.render(time=act_time))
+
                     # Add arrival info if available
                     arrival = flight.get('arrival', {})
                     if arrival.get('scheduled'):
                         arr_time = arrival['scheduled'][:16].replace('T', ' ')
-                        message += f"   🛬 الوصول المتوقع: {arr_time}\n"
-                    
+                        parts.append(messages.REALTIME_ARRIVAL.render(time=arr_time))
+
                     # Add gate and terminal info if available
                     if departure.get('gate'):
-                        message += f"   🚪 البوابة: {departure['gate']}\n"
+                        parts.append(messages.REALTIME_GATE.render(gate=departure['gate']))
                     if departure.get('terminal'):
-                        message += f"   🏢 المحطة: {departure['terminal']}\n"
-                    
-                    message += "\n"
+                        parts.append(messages.REALTIME_TERMINAL.render(terminal=departure['terminal']))
+
+                    parts.append("\n")
             else:
-                message += "ℹ️ لا توجد رحلات مباشرة نشطة حالياً\n"
-                message += "يمكنك البحث عن رحلات مجدولة أو رحلات بتوقفات\n\n"
-            
-            return message
+                parts.append(messages.REALTIME_NO_ACTIVE)
+
+            return ''.join(parts)
             
         except Exception as e:
             logger.error(f"Error formatting AviationStack real-time info: {e}")
@@ -1056,40 +1484,57 @@ class AviationStackService:
         }
         return translations.get(status.lower(), status)
     
-    def get_airport_code(self, city_name):
-        """Map city names to IATA airport codes"""
-        city_to_airport = {
-            'الرباط': 'RBA',
-            'الدار البيضاء': 'CMN',
-            'الدارالبيضاء': 'CMN',
-            'مراكش': 'RAK',
-            'فاس': 'FEZ',
-            'أكادير': 'AGA',
-            'طنجة': 'TNG',
-            'وجدة': 'OUD',
-            'تطوان': 'TTU',
-            'الحسيمة': 'AHU',
-            'القنيطرة': 'NNA',
-            'سلا': 'RBA',
-            
-            'باريس': 'CDG',
-            'لندن': 'LHR',
-            'مدريد': 'MAD',
-            'دبي': 'DXB',
-            'القاهرة': 'CAI',
-            'تونس': 'TUN',
-            'إسطنبول': 'IST',
-            'روما': 'FCO',
-            'برلين': 'BER',
-            'أمستردام': 'AMS',
-            'بروكسل': 'BRU',
-            'نيويورك': 'JFK',
-            'تورنتو': 'YYZ',
-            'مونتريال': 'YUL',
-            'جنيف': 'GVA',
-            'زيوريخ': 'ZUR'
-        }
-        return city_to_airport.get(city_name, 'CMN')
+
+
+class PendingFlightSearch:
+    """The two upstream lookups of a flight search, delivered block by block"""
+    
+    def __init__(self, realtime_task, search_task, fallback, deadline_at):
+        self.realtime_task = realtime_task
+        self.search_task = search_task
+        self.fallback = fallback
+        self.deadline_at = deadline_at
+        self.realtime_delivered = False
+        self.search_delivered = False
+    
+    async def wait(self, timeout=None):
+        """Wait for the undelivered lookups, at most until timeout or the deadline"""
+        remaining = self.deadline_at - asyncio.get_running_loop().time()
+        if timeout is not None:
+            remaining = min(remaining, timeout)
+        pending = [task for task in (self.realtime_task, self.search_task) if not task.done()]
+        if pending and remaining > 0:
+            await asyncio.wait(pending, timeout=remaining)
+    
+    def take_ready(self):
+        """Message blocks of the lookups that finished since the last call"""
+        blocks = []
+        if not self.realtime_delivered and self.realtime_task.done():
+            self.realtime_delivered = True
+            if self.realtime_task.result():
+                blocks.append(self.realtime_task.result())
+        if not self.search_delivered and self.search_task.done():
+            self.search_delivered = True
+            blocks.append(self.search_task.result())
+        return blocks
+    
+    def finish(self):
+        """Remaining blocks once the deadline passed, late lookups are dropped or replaced"""
+        blocks = self.take_ready()
+        
+        # Real-time data is optional, drop it if it missed the deadline
+        if not self.realtime_delivered:
+            self.realtime_task.cancel()
+            self.realtime_delivered = True
+            logger.warning(f"AviationStack missed the {FLIGHT_SEARCH_DEADLINE}s deadline, skipping real-time data")
+        
+        # Search results are required, use the fallback if SerpApi is too slow
+        if not self.search_delivered:
+            self.search_task.cancel()
+            self.search_delivered = True
+            logger.warning(f"SerpApi missed the {FLIGHT_SEARCH_DEADLINE}s deadline, using fallback")
+            blocks.append(self.fallback())
+        return blocks
 
 
 # =============================================================================
@@ -1102,9 +1547,9 @@ class ActionSearchFlights(Action):
     def name(self) -> Text:
         return "action_search_flights"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         ville_depart = tracker.get_slot("ville_depart")
         ville_destination = tracker.get_slot("ville_destination")
@@ -1112,6 +1557,7 @@ class ActionSearchFlights(Action):
         classe = tracker.get_slot("classe")
         
         logger.info(f"Flight search: {ville_depart} -> {ville_destination} on {date_depart} ({classe})")
+        HEALTH_MONITOR.ensure_started()
         
         if not ville_depart or not ville_destination:
             dispatcher.utter_message(text="عذراً، أحتاج إلى معرفة مدينة المغادرة والوجهة أولاً.")
@@ -1122,33 +1568,77 @@ class ActionSearchFlights(Action):
         aviationstack_service = AviationStackService()
         
         # Convert class to API format
-        api_class = 'ECONOMY'
-        if classe:
-            if 'أعمال' in classe or 'business' in classe.lower():
-                api_class = 'BUSINESS'
-            elif 'أولى' in classe or 'first' in classe.lower():
-                api_class = 'FIRST'
-        
-        # First, try to get real-time flight info from AviationStack
-        realtime_info = aviationstack_service.get_flight_info(ville_depart, ville_destination)
-        
-        # Then get comprehensive search results from SerpApi
-        search_results = serpapi_service.search_flights(
-            ville_depart, ville_destination, date_depart, api_class
+        api_class = travel_class_code(classe)
+        
+        # Query AviationStack and SerpApi in parallel under a single deadline
+        realtime_task = asyncio.ensure_future(
+            aviationstack_service.get_flight_info(ville_depart, ville_destination)
+        )
+        search_task = asyncio.ensure_future(
+            serpapi_service.search_flights(
+                ville_depart, ville_destination, date_depart, api_class,
+                sender_id=tracker.sender_id
+            )
+        )
+        search = PendingFlightSearch(
+            realtime_task, search_task,
+            lambda: serpapi_service.get_fallback_flights(
+                ville_depart, ville_destination, date_depart, api_class, sender_id=tracker.sender_id
+            ),
+            asyncio.get_running_loop().time() + FLIGHT_SEARCH_DEADLINE
         )
         
-        # Combine the results
-        final_message = ""
+        # Fast answers (cache hits, fallbacks) still go out as one combined message
+        await search.wait(FLIGHT_ACK_BUDGET)
+        if search.realtime_task.done() and search.search_task.done():
+            dispatcher.utter_message(text="\n".join(search.take_ready()))
+            return []
         
-        # Add real-time info if available
-        if realtime_info:
-            final_message += realtime_info + "\n"
+        # Clients that cannot fetch late results wait for everything in this run
+        if not accepts_late_results(tracker):
+            await search.wait()
+            dispatcher.utter_message(text="\n".join(search.finish()))
+            return []
         
-        # Add search results
-        final_message += search_results
+        # Acknowledge right away and send whatever is ready
+        dispatcher.utter_message(
+            text=f"🔎 جاري البحث عن أفضل الرحلات من {ville_depart} إلى {ville_destination}..."
+        )
+        for block in search.take_ready():
+            dispatcher.utter_message(text=block)
+        
+        # The remaining blocks are collected through FLIGHT_RESULTS_INTENT, the
+        # reminder only fires if the client never asks for them
+        PENDING_FLIGHT_SEARCHES.set(tracker.sender_id, search)
+        dispatcher.utter_message(json_message={"pending_results": FLIGHT_RESULTS_INTENT})
+        return [ReminderScheduled(
+            FLIGHT_RESULTS_INTENT,
+            trigger_date_time=datetime.now() + timedelta(seconds=FLIGHT_SEARCH_DEADLINE),
+            name=FLIGHT_RESULTS_REMINDER,
+            kill_on_user_message=False
+        )]
+
+
+class ActionDeliverFlightResults(Action):
+    """Deliver the flight search blocks that were not ready for the first reply"""
+    
+    def name(self) -> Text:
+        return "action_deliver_flight_results"
+
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        dispatcher.utter_message(text=final_message)
-        return []
+        search = PENDING_FLIGHT_SEARCHES.get(tracker.sender_id)
+        if search is None:
+            return []
+        PENDING_FLIGHT_SEARCHES.invalidate(tracker.sender_id)
+        
+        await search.wait()
+        for block in search.finish():
+            dispatcher.utter_message(text=block)
+        
+        return [ReminderCancelled(name=FLIGHT_RESULTS_REMINDER)]
 
 
 class ActionSearchHotels(Action):
@@ -1157,9 +1647,9 @@ class ActionSearchHotels(Action):
     def name(self) -> Text:
         return "action_search_hotels"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         ville_hotel = tracker.get_slot("ville_hotel")
         categorie_hotel = tracker.get_slot("categorie_hotel") 
@@ -1167,6 +1657,7 @@ class ActionSearchHotels(Action):
         quartier = tracker.get_slot("quartier")
         
         logger.info(f"Hotel search: {ville_hotel}, {categorie_hotel}, {nombre_personnes} persons")
+        HEALTH_MONITOR.ensure_started()
         
         if not ville_hotel:
             dispatcher.utter_message(text="أحتاج إلى معرفة المدينة أولاً. في أي مدينة تريد الإقامة؟")
@@ -1180,12 +1671,15 @@ class ActionSearchHotels(Action):
             dispatcher.utter_message(text="أحتاج إلى معرفة عدد الأشخاص. كم شخص؟")
             return []
         
+        stay = hotel_stay(tracker)
+        
         # Initialize SerpApi hotel service
         hotel_service = SerpApiHotelService()
         
         # Search for hotels using SerpApi Google Hotels
-        message = hotel_service.search_hotels(
-            ville_hotel, categorie_hotel, nombre_personnes, quartier
+        message = await hotel_service.search_hotels(
+            ville_hotel, categorie_hotel, nombre_personnes, quartier,
+            sender_id=tracker.sender_id, stay=stay
         )
         
         dispatcher.utter_message(text=message)
@@ -1198,9 +1692,9 @@ class ActionGetFlightStatus(Action):
     def name(self) -> Text:
         return "action_get_flight_status"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # Extract cities from user message or slots
         ville_depart = tracker.get_slot("ville_depart")
@@ -1211,10 +1705,7 @@ class ActionGetFlightStatus(Action):
         cities_in_message = []
         
         for entity in entities:
-            entity_value = entity.get('value', '')
-            if (any(city in entity_value for city in MOROCCAN_CITIES) or
-                any(dest in entity_value for dest in INTERNATIONAL_DESTINATIONS)):
-                cities_in_message.append(entity_value)
+            cities_in_message.extend(match.city for match in CITY_GAZETTEER.find_all(entity.get('value', '')))
         
         # Use cities from message if available, otherwise use slots
         if len(cities_in_message) >= 2:
@@ -1232,8 +1723,9 @@ class ActionGetFlightStatus(Action):
             )
             return []
         
+        HEALTH_MONITOR.ensure_started()
         aviationstack_service = AviationStackService()
-        realtime_info = aviationstack_service.get_flight_info(ville_depart, ville_destination)
+        realtime_info = await aviationstack_service.get_flight_info(ville_depart, ville_destination)
         
         if realtime_info:
             dispatcher.utter_message(text=realtime_info)
@@ -1256,9 +1748,9 @@ class ActionSelectOption(Action):
     def name(self) -> Text:
         return "action_select_option"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # الحصول على رسالة المستخدم لفهم الخيار المحدد
         user_message = tracker.latest_message.get('text', '').lower()
@@ -1301,23 +1793,29 @@ class ActionSelectOption(Action):
                 message += "🛫 **الرحلة الثانية المحددة**\n"
                 message += "💰 خيار اقتصادي بخدمة جيدة\n"
                 message += f"✈️ من {ville_depart} إلى {ville_destination}\n"
+            offer = SerpApiFlightService().shown_offer(
+                ville_depart, ville_destination, tracker.get_slot("date_depart"),
+                travel_class_code(tracker.get_slot("classe")), option_number, tracker.sender_id
+            )
+            if offer:
+                message += f"🎫 {offer[0]} - {offer[1]:,} درهم\n"
                 
         elif is_hotel:
             ville_hotel = tracker.get_slot("ville_hotel")
-            if "مراكش" in str(ville_hotel):
-                if option_number == "1":
-                    message += "🏨 **فندق المامونية الشهير**\n"
-                    message += "💰 إقامة فاخرة بمستوى عالمي\n"
-                elif option_number == "2":
-                    message += "🏨 **فندق أطلس مراكش**\n"
-                    message += "💰 راحة وجودة بسعر ممتاز\n"
+            # The hotel listed under the selected option, as the user saw it
+            offer = SerpApiHotelService().shown_hotel(
+                ville_hotel, tracker.get_slot("categorie_hotel"), tracker.get_slot("nombre_personnes"),
+                tracker.get_slot("quartier"), hotel_stay(tracker), option_number, tracker.sender_id
+            )
+            if offer:
+                message += f"🏨 **{offer[0]}**\n"
+                message += f"💰 {offer[1]:,} درهم/ليلة\n"
+            elif option_number == "1":
+                message += "🏨 **الفندق الأول المحدد**\n"
+                message += "💰 خيار متميز بمرافق ممتازة\n"
             else:
-                if option_number == "1":
-                    message += "🏨 **الفندق الأول المحدد**\n"
-                    message += "💰 خيار متميز بمرافق ممتازة\n"
-                elif option_number == "2":
-                    message += "🏨 **الفندق الثاني المحدد**\n"
-                    message += "💰 قيمة ممتازة مقابل السعر\n"
+                message += "🏨 **الفندق الثاني المحدد**\n"
+                message += "💰 قيمة ممتازة مقابل السعر\n"
             
             message += f"🏨 في {ville_hotel}\n"
         
@@ -1337,9 +1835,9 @@ class ActionConfirmReservation(Action):
     def name(self) -> Text:
         return "action_confirm_reservation"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # التحقق من وجود خيار محدد
         selected_option = tracker.get_slot("selected_option")
@@ -1370,101 +1868,53 @@ class ActionConfirmReservation(Action):
         logger.info(f"Confirming reservation - Ref: {booking_ref}, Option: {selected_option}, Flight: {is_flight_booking}, Hotel: {is_hotel_booking}")
         
         # بناء رسالة التأكيد
-        message = "🎉 **تهانينا! تم تأكيد حجزك بنجاح!** 🎉\n\n"
-        message += "="*50 + "\n"
-        message += f"📋 **رقم الحجز: {booking_ref}**\n"
-        message += "="*50 + "\n\n"
-        
+        parts = [messages.CONFIRMATION_HEADER.render(booking_ref=booking_ref)]
+
         # تفاصيل رحلة الطيران
         if is_flight_booking and ville_depart and ville_destination:
-            message += "✈️ **تفاصيل رحلة الطيران:**\n"
-            message += f"   📍 من: {ville_depart}\n"
-            message += f"   📍 إلى: {ville_destination}\n"
-            
+            parts.append(messages.CONFIRMED_FLIGHT.render(origin=ville_depart, destination=ville_destination))
+
             if date_depart:
-                message += f"   📅 تاريخ السفر: {date_depart}\n"
+                parts.append(messages.CONFIRMED_TRAVEL_DATE.render(departure_date=date_depart))
             if classe:
-                message += f"   💺 الدرجة: {classe}\n"
-                
-            if selected_option == "1":
-                message += "   🛫 الناقل: الخيار الأول المحدد\n"
-                message += "   💰 تم تأكيد السعر والمقعد\n"
-            elif selected_option == "2":
-                message += "   🛫 الناقل: الخيار الثاني المحدد\n"
-                message += "   💰 تم تأكيد السعر والمقعد\n"
-                
-            message += "   🎫 سيتم إرسال تذكرة الطيران الإلكترونية\n"
-            message += "\n"
-        
+                parts.append(messages.CONFIRMED_TRAVEL_CLASS.render(travel_class=classe))
+
+            # The offer listed under the selected option, as the user saw it
+            offer = SerpApiFlightService().shown_offer(
+                ville_depart, ville_destination, date_depart, travel_class_code(classe), selected_option,
+                tracker.sender_id
+            )
+            if offer:
+                parts.append(messages.CONFIRMED_FLIGHT_OFFER.render(airline=offer[0], price=offer[1]))
+            elif selected_option in messages.CONFIRMED_FLIGHT_OPTIONS:
+                parts.append(messages.CONFIRMED_FLIGHT_OPTIONS[selected_option])
+
+            parts.append(messages.CONFIRMED_FLIGHT_END)
+
         # تفاصيل الفندق
         if is_hotel_booking and ville_hotel:
-            message += "🏨 **تفاصيل حجز الفندق:**\n"
-            message += f"   📍 المدينة: {ville_hotel}\n"
-            
+            parts.append(messages.CONFIRMED_HOTEL.render(city=ville_hotel))
+
             if categorie_hotel:
-                message += f"   ⭐ الفئة: {categorie_hotel}\n"
+                parts.append(messages.CONFIRMED_HOTEL_CATEGORY.render(category=categorie_hotel))
             if nombre_personnes:
-                message += f"   👥 عدد الأشخاص: {nombre_personnes}\n"
-                
-            if "مراكش" in ville_hotel:
-                if selected_option == "1":
-                    message += "   🏨 الفندق: فندق المامونية الشهير\n"
-                    message += "   💰 إقامة فاخرة مؤكدة\n"
-                elif selected_option == "2":
-                    message += "   🏨 الفندق: فندق أطلس مراكش\n"
-                    message += "   💰 إقامة مريحة مؤكدة\n"
-            elif "الرباط" in ville_hotel:
-                if selected_option == "1":
-                    message += "   🏨 الفندق: فندق تور حسان\n"
-                    message += "   💰 إقامة فاخرة مطلة على البحر\n"
-                elif selected_option == "2":
-                    message += "   🏨 الفندق: فندق هيلتون الرباط\n"
-                    message += "   💰 إقامة عصرية في قلب المدينة\n"
-            else:
-                if selected_option == "1":
-                    message += "   🏨 الفندق: الخيار الأول المحدد\n"
-                    message += "   💰 حجز مؤكد بمرافق ممتازة\n"
-                elif selected_option == "2":
-                    message += "   🏨 الفندق: الخيار الثاني المحدد\n"
-                    message += "   💰 حجز مؤكد بقيمة ممتازة\n"
-                    
-            message += "   📅 سيتم إرسال قسيمة الحجز\n"
-            message += "\n"
-        
+                parts.append(messages.CONFIRMED_HOTEL_GUESTS.render(num_guests=nombre_personnes))
+
+            # The hotel listed under the selected option, as the user saw it
+            offer = SerpApiHotelService().shown_hotel(
+                ville_hotel, categorie_hotel, nombre_personnes, tracker.get_slot("quartier"),
+                hotel_stay(tracker), selected_option, tracker.sender_id
+            )
+            if offer:
+                parts.append(messages.CONFIRMED_HOTEL_OFFER.render(name=offer[0], price=offer[1]))
+            elif selected_option in messages.CONFIRMED_HOTEL_OPTIONS:
+                parts.append(messages.CONFIRMED_HOTEL_OPTIONS[selected_option])
+
+            parts.append(messages.CONFIRMED_HOTEL_END)
+
         # معلومات الدفع والتواصل
-        message += "="*50 + "\n"
-        message += "💳 **معلومات الدفع:**\n"
-        message += "   • سيتم التواصل معك خلال 30 دقيقة لتأكيد الدفع\n"
-        message += "   • طرق الدفع: نقداً، بطاقة ائتمان، تحويل بنكي\n"
-        message += "   • إمكانية الدفع عند الاستلام (للفنادق)\n\n"
-        
-        message += "📧 **سيتم إرسال جميع التفاصيل عبر:**\n"
-        message += "   📨 البريد الإلكتروني خلال 15 دقيقة\n"
-        message += "   💬 رسالة نصية للهاتف المحمول\n"
-        message += "   📱 واتساب (اختياري)\n\n"
-        
-        message += "📞 **خدمة العملاء 24/7:**\n"
-        message += "   📞 الهاتف: +212-5XX-XXXXXX\n"
-        message += "   💬 واتساب: +212-6XX-XXXXXX\n"
-        message += "   📧 البريد: support@travel-smart.ma\n\n"
-        
-        message += "🎯 **نصائح مهمة:**\n"
-        message += f"   • احتفظ برقم الحجز: **{booking_ref}**\n"
-        message += "   • تأكد من صحة جواز السفر (للطيران الدولي)\n"
-        message += "   • اوصل للمطار قبل 3 ساعات (دولي) أو 2 ساعة (محلي)\n"
-        message += "   • تحقق من شروط الإلغاء والتعديل\n"
-        message += "   • احمل نسخة من تأكيد الحجز\n\n"
-        
-        message += "🔄 **للحصول على خدمات إضافية:**\n"
-        message += "   🚗 حجز سيارة أجرة من/إلى المطار\n"
-        message += "   🎫 حجز جولات سياحية\n"
-        message += "   🍽️ حجز مطاعم\n"
-        message += "   💱 خدمة تحويل العملات\n\n"
-        
-        message += "="*50 + "\n"
-        message += "🌟 **شكراً لثقتك بوكالة السفر الذكية!**\n"
-        message += "✈️🏨 نتمنى لك رحلة سعيدة وإقامة ممتعة! ✨\n\n"
-        message += "🔄 **لحجز جديد، قل 'مرحبا' أو 'حجز جديد'**"
+        parts.append(messages.CONFIRMATION_FOOTER.render(booking_ref=booking_ref))
+        message = ''.join(parts)
         
         dispatcher.utter_message(text=message)
         
@@ -1488,9 +1938,9 @@ class ActionChangeOption(Action):
     def name(self) -> Text:
         return "action_change_option"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # التحقق من نوع الحجز الحالي
         is_flight = bool(tracker.get_slot("ville_depart") or tracker.get_slot("ville_destination"))
@@ -1539,42 +1989,11 @@ class ActionProvideHelp(Action):
     def name(self) -> Text:
         return "action_provide_help"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        message = "🤖 **مرحباً بك في وكالة السفر الذكية!**\n\n"
-        message += "💡 **يمكنني مساعدتك في:**\n\n"
-        
-        message += "✈️ **حجز الرحلات الجوية:**\n"
-        message += "   • رحلات داخلية في المغرب\n"
-        message += "   • رحلات دولية إلى أوروبا، الشرق الأوسط، أمريكا\n"
-        message += "   • جميع درجات السفر (اقتصادية، أعمال، أولى)\n"
-        message += "   • أسعار تنافسية من عدة شركات طيران\n\n"
-        
-        message += "🏨 **حجز الفنادق:**\n"
-        message += "   • فنادق من 3 إلى 5 نجوم\n"
-        message += "   • في جميع المدن المغربية الرئيسية\n"
-        message += "   • خيارات متنوعة حسب الميزانية\n"
-        message += "   • معلومات مفصلة عن المرافق والخدمات\n\n"
-        
-        message += "📊 **معلومات الرحلات:**\n"
-        message += "   • حالة الرحلات المباشرة\n"
-        message += "   • معلومات المطارات\n"
-        message += "   • تحديثات فورية عن التأخير والإلغاء\n\n"
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        message += "🗣️ **كيفية التفاعل معي:**\n"
-        message += "   • قل 'أريد حجز رحلة طيران'\n"
-        message += "   • قل 'أريد حجز فندق'\n"
-        message += "   • قل 'ما حالة الرحلات من ... إلى ...'\n"
-        message += "   • استخدم كلمات بسيطة وواضحة\n\n"
-        
-        message += "📞 **تحتاج مساعدة إضافية؟**\n"
-        message += "   📞 اتصل بنا: +212-5XX-XXXXXX\n"
-        message += "   💬 واتساب: +212-6XX-XXXXXX\n"
-        message += "   📧 البريد: support@travel-smart.ma\n\n"
-        
-        message += "🌟 **ابدأ الآن بقول ما تريد!**"
+        message = STATIC_RESPONSES.get('help')
         
         dispatcher.utter_message(text=message)
         return []
@@ -1586,54 +2005,15 @@ class ActionDefaultFallback(Action):
     def name(self) -> Text:
         return "action_default_fallback"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # التحقق من السياق الحالي
         active_form = tracker.active_loop.get('name') if tracker.active_loop else None
         requested_slot = tracker.get_slot('requested_slot')
         
-        if active_form == 'flight_form':
-            if requested_slot == 'ville_depart':
-                message = "🤔 لم أفهم المدينة. من أي مدينة تريد السفر؟\n"
-                message += "المدن المتاحة: الرباط، الدار البيضاء، مراكش، فاس، أكادير، طنجة"
-            elif requested_slot == 'ville_destination':
-                message = "🤔 لم أفهم الوجهة. إلى أي مدينة تريد السفر؟\n"
-                message += "مثال: باريس، لندن، مدريد، دبي، القاهرة"
-            elif requested_slot == 'date_depart':
-                message = "🤔 لم أفهم التاريخ. متى تريد السفر؟\n"
-                message += "مثال: 15 مايو، غداً، الأسبوع القادم، 20 يونيو"
-            elif requested_slot == 'classe':
-                message = "🤔 لم أفهم الدرجة. أي درجة تفضل؟\n"
-                message += "الخيارات: اقتصادية، أعمال، أولى"
-            else:
-                message = "🤔 لم أفهم ردك. يمكنني المساعدة في حجز رحلة طيران.\n"
-                message += "قل 'مساعدة' للحصول على المزيد من المعلومات."
-                
-        elif active_form == 'hotel_form':
-            if requested_slot == 'ville_hotel':
-                message = "🤔 لم أفهم المدينة. في أي مدينة تريد الإقامة؟\n"
-                message += "المدن المتاحة: الرباط، الدار البيضاء، مراكش، فاس، أكادير، طنجة"
-            elif requested_slot == 'categorie_hotel':
-                message = "🤔 لم أفهم فئة الفندق. كم نجمة تريد؟\n"
-                message += "الخيارات: 3 نجوم، 4 نجوم، 5 نجوم، فاخر"
-            elif requested_slot == 'nombre_personnes':
-                message = "🤔 لم أفهم العدد. كم عدد الأشخاص؟\n"
-                message += "مثال: شخص واحد، شخصين، 4 أشخاص"
-            else:
-                message = "🤔 لم أفهم ردك. يمكنني المساعدة في حجز فندق.\n"
-                message += "قل 'مساعدة' للحصول على المزيد من المعلومات."
-                
-        else:
-            # رسالة عامة عندما لا نكون في form
-            message = "🤔 عذراً، لم أتمكن من فهم طلبك بوضوح.\n\n"
-            message += "💡 **يمكنني مساعدتك في:**\n"
-            message += "   ✈️ حجز رحلات طيران - قل 'أريد حجز رحلة'\n"
-            message += "   🏨 حجز فنادق - قل 'أريد حجز فندق'\n"
-            message += "   📊 معلومات الرحلات المباشرة - قل 'ما حالة الرحلات'\n"
-            message += "   ❓ الحصول على مساعدة - قل 'مساعدة'\n\n"
-            message += "🗣️ **أو اكتب ما تريده بكلمات بسيطة وواضحة**"
+        message = STATIC_RESPONSES.get('fallback', active_form, requested_slot)
         
         dispatcher.utter_message(text=message)
         return []
@@ -1645,9 +2025,9 @@ class ActionRestart(Action):
     def name(self) -> Text:
         return "action_restart"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         dispatcher.utter_message(
             text="🔄 **تم إعادة تشغيل النظام بنجاح!**\n\n"
@@ -1669,36 +2049,12 @@ class ActionGreet(Action):
     def name(self) -> Text:
         return "action_greet"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
-        # Check time of day for appropriate greeting
-        current_hour = datetime.now().hour
-        if 5 <= current_hour < 12:
-            time_greeting = "صباح الخير"
-        elif 12 <= current_hour < 18:
-            time_greeting = "مساء الخير"
-        else:
-            time_greeting = "مساء الخير"
-        
-        message = f"🌟 **{time_greeting} ومرحباً بك في وكالة السفر الذكية!**\n\n"
-        message += "✈️🏨 **أنا مساعدك الشخصي للسفر والحجوزات**\n\n"
-        
-        message += "🎯 **يمكنني مساعدتك في:**\n"
-        message += "   ✈️ حجز رحلات طيران (داخلية ودولية)\n"
-        message += "   🏨 حجز فنادق في جميع أنحاء المغرب\n"
-        message += "   📊 معلومات الرحلات المباشرة والحالية\n"
-        message += "   💰 أفضل الأسعار والعروض المتاحة\n\n"
-        
-        message += "🚀 **ابدأ معي الآن:**\n"
-        message += "   • قل 'أريد حجز رحلة طيران'\n"
-        message += "   • قل 'أريد حجز فندق'\n"
-        message += "   • قل 'ما حالة الرحلات'\n"
-        message += "   • أو أخبرني مباشرة بوجهتك!\n\n"
-        
-        message += "💡 **مثال:** 'أريد السفر من الدار البيضاء إلى باريس'\n\n"
-        message += "🤝 **كيف يمكنني مساعدتك اليوم؟**"
+        # The greeting depends on the time of day only
+        message = STATIC_RESPONSES.get('greet', datetime.now().hour)
         
         dispatcher.utter_message(text=message)
         return []
@@ -1710,11 +2066,9 @@ class ActionGoodbye(Action):
     def name(self) -> Text:
         return "action_goodbye"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        message = "👋 **شكراً لك على استخدام وكالة السفر الذكية!**\n\n"
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # Check if user had any active bookings
         has_booking = bool(
@@ -1723,17 +2077,7 @@ class ActionGoodbye(Action):
             tracker.get_slot("ville_hotel")
         )
         
-        if has_booking:
-            message += "📋 **إذا كان لديك حجز غير مكتمل:**\n"
-            message += "   • يمكنك العودة لاحقاً لإكمال الحجز\n"
-            message += "   • سيتم حفظ بياناتك لفترة قصيرة\n\n"
-        
-        message += "🌟 **نتطلع لخدمتك مرة أخرى!**\n\n"
-        message += "📞 **للتواصل:**\n"
-        message += "   📞 الهاتف: +212-5XX-XXXXXX\n"
-        message += "   💬 واتساب: +212-6XX-XXXXXX\n"
-        message += "   📧 البريد: support@travel-smart.ma\n\n"
-        message += "✈️🏨 **رحلات سعيدة وإقامة ممتعة!** ✨"
+        message = STATIC_RESPONSES.get('goodbye', has_booking)
         
         dispatcher.utter_message(text=message)
         return []
@@ -1749,54 +2093,123 @@ class ActionCheckAPIStatus(Action):
     def name(self) -> Text:
         return "action_check_api_status"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
+        HEALTH_MONITOR.ensure_started()
         message = "🔍 **حالة الخدمات الخارجية:**\n\n"
+        http = get_http_client()
         
-        # Check SerpApi status
-        serpapi_key = os.getenv('SERPAPI_KEY', 'demo_key')
-        if serpapi_key == 'demo_key':
-            message += "🔴 **SerpApi:** غير مُكوّن (باستخدام البيانات الاحتياطية)\n"
-        else:
-            try:
-                # Test SerpApi with a simple request
-                test_params = {
-                    'engine': 'google',
-                    'q': 'test',
-                    'api_key': serpapi_key
-                }
-                response = requests.get('https://serpapi.com/search', params=test_params, timeout=5)
-                if response.status_code == 200:
-                    message += "🟢 **SerpApi:** يعمل بشكل طبيعي\n"
-                elif response.status_code == 401:
-                    message += "🔴 **SerpApi:** خطأ في المصادقة - تحقق من المفتاح\n"
-                else:
-                    message += f"🟡 **SerpApi:** حالة غير متوقعة ({response.status_code})\n"
-            except:
-                message += "🔴 **SerpApi:** خطأ في الاتصال\n"
-        
-        # Check AviationStack status
-        aviationstack_key = os.getenv('AVIATIONSTACK_API_KEY', 'demo_key')
-        if aviationstack_key == 'demo_key':
-            message += "🔴 **AviationStack:** غير مُكوّن (لا توجد معلومات مباشرة)\n"
-        else:
-            try:
-                # Test AviationStack with a simple request
-                test_params = {
-                    'access_key': aviationstack_key,
-                    'limit': 1
-                }
-                response = requests.get('http://api.aviationstack.com/v1/flights', params=test_params, timeout=5)
-                if response.status_code == 200:
-                    message += "🟢 **AviationStack:** يعمل بشكل طبيعي\n"
-                elif response.status_code == 401:
-                    message += "🔴 **AviationStack:** خطأ في المصادقة - تحقق من المفتاح\n"
+        # Answer from the background health monitor instead of probing live
+        upstream_labels = {'serpapi': 'SerpApi', 'aviationstack': 'AviationStack'}
+        not_configured = {
+            'serpapi': "غير مُكوّن (باستخدام البيانات الاحتياطية)",
+            'aviationstack': "غير مُكوّن (لا توجد معلومات مباشرة)"
+        }
+        for name, label in upstream_labels.items():
+            health = HEALTH_MONITOR.health(name).snapshot()
+            if not HEALTH_MONITOR.is_enabled(name):
+                message += f"🔴 **{label}:** {not_configured[name]}\n"
+                continue
+            
+            if health['last_checked_at'] is None:
+                if HEALTH_MONITOR.is_probed(name):
+                    message += f"⚪ **{label}:** في انتظار أول فحص\n"
                 else:
-                    message += f"🟡 **AviationStack:** حالة غير متوقعة ({response.status_code})\n"
-            except:
-                message += "🔴 **AviationStack:** خطأ في الاتصال\n"
+                    message += f"⚪ **{label}:** لم يُرسل أي طلب بعد\n"
+                continue
+            
+            if health['last_error']:
+                message += f"🔴 **{label}:** خطأ في الاتصال\n"
+            elif health['last_status'] == 200:
+                message += f"🟢 **{label}:** يعمل بشكل طبيعي\n"
+            elif health['last_status'] == 401:
+                message += f"🔴 **{label}:** خطأ في المصادقة - تحقق من المفتاح\n"
+            else:
+                message += f"🟡 **{label}:** حالة غير متوقعة ({health['last_status']})\n"
+            
+            if health['p50'] is not None:
+                message += (f"   ⏱️ زمن الاستجابة p50/p95/p99: {health['p50'] * 1000:.0f}/"
+                            f"{health['p95'] * 1000:.0f}/{health['p99'] * 1000:.0f} ms\n")
+                message += f"   📉 نسبة الأخطاء: {health['error_rate']:.0%}\n"
+            if health['last_success_at']:
+                message += f"   ✅ آخر نجاح: {health['last_success_at'].strftime('%H:%M:%S')}\n"
+        
+        # Connection pool statistics per upstream host
+        pool_stats = http.pool_stats()
+        if pool_stats:
+            message += "\n🔌 **إحصائيات الاتصالات:**\n"
+            for host, stats in pool_stats.items():
+                message += (f"   • {host}: {stats['requests']} طلب، "
+                            f"{stats['errors']} خطأ، "
+                            f"{stats['pool_timeouts']} انتظار اتصال منتهٍ، "
+                            f"إعادة استخدام {stats['reuse_rate']:.0%}\n")
+        
+        # Response cache statistics
+        message += "\n🗄️ **ذاكرة التخزين المؤقت:**\n"
+        cache_labels = (
+            ('بحث الرحلات', FLIGHT_SEARCH_CACHE),
+            ('بحث الفنادق', HOTEL_SEARCH_CACHE),
+            ('حالة الرحلات', FLIGHT_INFO_CACHE)
+        )
+        for label, cache in cache_labels:
+            cache_stats = cache.stats()
+            message += (f"   • {label}: {cache_stats['size']} نتيجة، "
+                        f"{cache_stats['hits']} إصابة، {cache_stats['stale_hits']} قديمة، "
+                        f"{cache_stats['misses']} إخفاق\n")
+        
+        # SerpApi usage against the monthly budget
+        quota = SERPAPI_QUOTA.stats()
+        message += "\n📊 **استهلاك SerpApi:**\n"
+        message += f"   • {quota['month']}: {quota['used']}/{quota['limit']} بحث، المتبقي {quota['remaining']}\n"
+        message += (f"   • مرفوض: {quota['rejected']['budget']} (الميزانية)، "
+                    f"{quota['rejected']['rate']} (المعدل)، {quota['rejected']['sender']} (المستخدم)\n")
+        
+        # Circuit breaker states
+        message += "\n⚡ **قواطع الدائرة:**\n"
+        breaker_icons = {'closed': '🟢', 'half_open': '🟡', 'open': '🔴'}
+        for breaker in (FLIGHT_SEARCH_BREAKER, HOTEL_SEARCH_BREAKER, AVIATIONSTACK_BREAKER):
+            snapshot = breaker.snapshot()
+            message += (f"   {breaker_icons[snapshot['state']]} {snapshot['name']}: {snapshot['state']}، "
+                        f"{snapshot['consecutive_failures']} إخفاق متتالي\n")
+        
+        # Speculative prefetch usage
+        prefetch = FLIGHT_PREFETCHER.stats()
+        if prefetch['enabled']:
+            message += "\n🚀 **التحميل المسبق للرحلات:**\n"
+            message += (f"   • {prefetch['issued']} طلب مسبق، {prefetch['used']} مستخدم، "
+                        f"{prefetch['skipped']} متجاوز للميزانية\n")
+        
+        # Request coalescing statistics
+        message += "\n🔗 **دمج الطلبات المتزامنة:**\n"
+        for coalescer in (FLIGHT_SEARCH_REQUESTS, HOTEL_SEARCH_REQUESTS, FLIGHT_INFO_REQUESTS):
+            coalescer_stats = coalescer.stats()
+            message += (f"   • {coalescer.name}: {coalescer_stats['calls']} طلب، "
+                        f"{coalescer_stats['coalesced']} مدمج\n")
+        
+        # Hedged SerpApi requests
+        if SERPAPI_HEDGE_ENABLED:
+            message += "\n🎯 **الطلبات الاحتياطية (Hedging):**\n"
+            for hedger in (FLIGHT_SEARCH_HEDGER, HOTEL_SEARCH_HEDGER):
+                hedge_stats = hedger.stats()
+                message += (f"   • {hedger.name}: {hedge_stats['hedged']}/{hedge_stats['requests']} "
+                            f"({hedge_stats['hedge_rate']:.0%})، فوز {hedge_stats['win_rate']:.0%}، "
+                            f"{hedge_stats['skipped']} متجاوز للحصة\n")
+        
+        # Fixed replies rendered at startup
+        static_stats = STATIC_RESPONSES.stats()
+        message += "\n📝 **الردود الثابتة:**\n"
+        message += (f"   • {static_stats['entries']} رد، بُنيت في {static_stats['build_ms']} ms، "
+                    f"{static_stats['misses']} خارج الجدول\n")
+        
+        # Deterministic fallback inventory
+        message += "\n🗃️ **العروض البديلة:**\n"
+        for inventory in (FALLBACK_FLIGHTS, FALLBACK_HOTELS):
+            inventory_stats = inventory.stats()
+            message += (f"   • {inventory.name}: {inventory_stats['size']} بحث، "
+                        f"{inventory_stats['precomputed']} محسوب مسبقاً في {inventory_stats['precompute_ms']} ms، "
+                        f"إصابة {inventory_stats['hit_rate']:.0%}\n")
         
         message += "\n💡 **ملاحظة:** حتى في حالة عدم عمل الخدمات الخارجية، "
         message += "سيستمر النظام في العمل باستخدام بيانات احتياطية واقعية."
@@ -1815,9 +2228,9 @@ class ActionCancelBooking(Action):
     def name(self) -> Text:
         return "action_cancel_booking"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # Check if there's an active booking process
         has_active_booking = bool(
@@ -1866,9 +2279,9 @@ class ActionShowBookingSummary(Action):
     def name(self) -> Text:
         return "action_show_booking_summary"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # Collect current booking information
         ville_depart = tracker.get_slot("ville_depart")
@@ -1886,42 +2299,37 @@ class ActionShowBookingSummary(Action):
         has_hotel_info = bool(ville_hotel)
         
         if not has_flight_info and not has_hotel_info:
-            message = "📋 **لا توجد معلومات حجز حالياً**\n\n"
-            message += "💡 **ابدأ حجز جديد:**\n"
-            message += "   ✈️ قل 'أريد حجز رحلة طيران'\n"
-            message += "   🏨 قل 'أريد حجز فندق'\n"
-            message += "   🎯 أو أخبرني بوجهتك مباشرة"
+            message = messages.NO_BOOKING_SUMMARY
         else:
-            message = "📋 **ملخص معلومات الحجز الحالية:**\n\n"
-            
+            parts = [messages.SUMMARY_HEADER]
+            unknown = messages.UNKNOWN
+
             # Flight information
             if has_flight_info:
-                message += "✈️ **معلومات الرحلة:**\n"
-                message += f"   📍 من: {ville_depart if ville_depart else '❓ غير محدد'}\n"
-                message += f"   📍 إلى: {ville_destination if ville_destination else '❓ غير محدد'}\n"
-                message += f"   📅 التاريخ: {date_depart if date_depart else '❓ غير محدد'}\n"
-                message += f"   💺 الدرجة: {classe if classe else '❓ غير محدد'}\n"
+                parts.append(messages.SUMMARY_FLIGHT.render(
+                    origin=ville_depart or unknown, destination=ville_destination or unknown,
+                    departure_date=date_depart or unknown, travel_class=classe or unknown
+                ))
                 if selected_option and has_flight_info:
-                    message += f"   ✅ الخيار المحدد: الخيار {selected_option}\n"
-                message += "\n"
-            
+                    parts.append(messages.SUMMARY_SELECTED_OPTION.render(option=selected_option))
+                parts.append("\n")
+
             # Hotel information
             if has_hotel_info:
-                message += "🏨 **معلومات الفندق:**\n"
-                message += f"   📍 المدينة: {ville_hotel if ville_hotel else '❓ غير محدد'}\n"
-                message += f"   ⭐ الفئة: {categorie_hotel if categorie_hotel else '❓ غير محدد'}\n"
-                message += f"   👥 عدد الأشخاص: {nombre_personnes if nombre_personnes else '❓ غير محدد'}\n"
+                parts.append(messages.SUMMARY_HOTEL.render(
+                    city=ville_hotel or unknown, category=categorie_hotel or unknown,
+                    num_guests=nombre_personnes or unknown
+                ))
                 if quartier:
-                    message += f"   📍 المنطقة: {quartier}\n"
+                    parts.append(messages.SUMMARY_QUARTER.render(quarter=quartier))
                 if selected_option and has_hotel_info:
-                    message += f"   ✅ الخيار المحدد: الخيار {selected_option}\n"
-                message += "\n"
-            
+                    parts.append(messages.SUMMARY_SELECTED_OPTION.render(option=selected_option))
+                parts.append("\n")
+
             # Next steps
-            message += "🔄 **الخطوات التالية:**\n"
+            parts.append(messages.SUMMARY_NEXT_STEPS)
             if selected_option:
-                message += "   ✅ قل 'أؤكد' أو 'نعم' لتأكيد الحجز\n"
-                message += "   🔄 قل 'غير' أو 'لا' لتغيير الخيار\n"
+                parts.append(messages.SUMMARY_CONFIRM_OR_CHANGE)
             else:
                 missing_fields = []
                 if has_flight_info:
@@ -1933,11 +2341,12 @@ class ActionShowBookingSummary(Action):
                     if not ville_hotel: missing_fields.append("مدينة الإقامة")
                     if not categorie_hotel: missing_fields.append("فئة الفندق")
                     if not nombre_personnes: missing_fields.append("عدد الأشخاص")
-                
+
                 if missing_fields:
-                    message += f"   📝 مطلوب إكمال: {', '.join(missing_fields)}\n"
+                    parts.append(messages.SUMMARY_MISSING.render(fields=', '.join(missing_fields)))
                 else:
-                    message += "   🔍 قل 'ابحث' للعثور على الخيارات المتاحة\n"
+                    parts.append(messages.SUMMARY_SEARCH_HINT)
+            message = ''.join(parts)
         
         dispatcher.utter_message(text=message)
         return []
@@ -1949,50 +2358,11 @@ class ActionGetTravelTips(Action):
     def name(self) -> Text:
         return "action_get_travel_tips"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
-        
-        message = "🎯 **نصائح السفر المفيدة:**\n\n"
-        
-        message += "✈️ **نصائح للطيران:**\n"
-        message += "   • احجز مقعدك المفضل مسبقاً\n"
-        message += "   • تحقق من وزن الأمتعة المسموح\n"
-        message += "   • وصول مبكر للمطار (3 ساعات دولي، 2 ساعة محلي)\n"
-        message += "   • احمل وثائق السفر في حقيبة اليد\n"
-        message += "   • شرب الماء بكثرة أثناء الرحلة\n\n"
-        
-        message += "🏨 **نصائح للفنادق:**\n"
-        message += "   • اقرأ التقييمات قبل الحجز\n"
-        message += "   • تأكد من سياسة الإلغاء\n"
-        message += "   • احجز الغرف مع إطلالة مبكراً\n"
-        message += "   • استفسر عن الخدمات المجانية\n"
-        message += "   • احتفظ بإيصال الحجز\n\n"
-        
-        message += "🎒 **تحضير الرحلة:**\n"
-        message += "   • تحقق من صلاحية جواز السفر\n"
-        message += "   • اشترك في تأمين السفر\n"
-        message += "   • أخبر البنك بسفرك لتجنب إيقاف البطاقة\n"
-        message += "   • احفظ نسخ إلكترونية من الوثائق\n"
-        message += "   • تعلم بعض العبارات المحلية\n\n"
-        
-        message += "💰 **توفير المال:**\n"
-        message += "   • قارن الأسعار عبر عدة مواقع\n"
-        message += "   • احجز مبكراً للحصول على أفضل الأسعار\n"
-        message += "   • تجنب مواسم الذروة إذا أمكن\n"
-        message += "   • استخدم برامج النقاط والولاء\n"
-        message += "   • ابحث عن عروض حزم الطيران والفندق\n\n"
-        
-        message += "🌍 **أثناء السفر:**\n"
-        message += "   • احتفظ بنسخ من الوثائق منفصلة\n"
-        message += "   • استخدم خزانة الفندق للقيم\n"
-        message += "   • كن حذراً مع الواي فاي العام\n"
-        message += "   • احترم العادات والتقاليد المحلية\n"
-        message += "   • احتفظ بأرقام الطوارئ\n\n"
-        
-        message += "📞 **للمساعدة الإضافية، تواصل معنا على:**\n"
-        message += "   📞 +212-5XX-XXXXXX\n"
-        message += "   💬 واتساب: +212-6XX-XXXXXX"
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+        
+        message = STATIC_RESPONSES.get('travel_tips')
         
         dispatcher.utter_message(text=message)
         return []
@@ -2004,9 +2374,9 @@ class ActionGetWeatherInfo(Action):
     def name(self) -> Text:
         return "action_get_weather_info"
 
-    def run(self, dispatcher: CollectingDispatcher,
-            tracker: Tracker,
-            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
+    async def run(self, dispatcher: CollectingDispatcher,
+                  tracker: Tracker,
+                  domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
         
         # Extract destination from slots or entities
         destination = tracker.get_slot("ville_destination") or tracker.get_slot("ville_hotel")
@@ -2015,82 +2385,56 @@ class ActionGetWeatherInfo(Action):
         if not destination:
             entities = tracker.latest_message.get('entities', [])
             for entity in entities:
-                entity_value = entity.get('value', '')
-                if (any(city in entity_value for city in MOROCCAN_CITIES) or
-                    any(dest in entity_value for dest in INTERNATIONAL_DESTINATIONS)):
-                    destination = entity_value
+                match = CITY_GAZETTEER.find(entity.get('value', ''))
+                if match:
+                    destination = match.city
                     break
         
         if not destination:
-            message = "🌤️ **معلومات الطقس**\n\n"
-            message += "لمعرفة حالة الطقس، أحتاج إلى معرفة الوجهة.\n"
-            message += "مثال: 'ما حالة الطقس في مراكش؟'\n\n"
-            message += "💡 **المدن المتاحة:**\n"
-            message += "   🇲🇦 المغرب: الرباط، الدار البيضاء، مراكش، فاس\n"
-            message += "   🌍 دولياً: باريس، لندن، مدريد، دبي"
+            message = messages.WEATHER_NO_DESTINATION
         else:
-            # Provide general weather advice for the destination
-            message = f"🌤️ **معلومات الطقس في {destination}**\n\n"
-            
-            # Current season advice
-            current_month = datetime.now().month
-            if destination in ['مراكش', 'أكادير']:
-                if 6 <= current_month <= 8:
-                    message += "☀️ **الصيف:** طقس حار وجاف\n"
-                    message += "   🌡️ درجات الحرارة: 25-40°م\n"
-                    message += "   👕 الملابس: ملابس صيفية خفيفة\n"
-                    message += "   💧 نصيحة: اشرب الماء بكثرة\n"
-                elif 12 <= current_month <= 2:
-                    message += "❄️ **الشتاء:** طقس معتدل بارد\n"
-                    message += "   🌡️ درجات الحرارة: 10-20°م\n"
-                    message += "   🧥 الملابس: ملابس دافئة للمساء\n"
-                    message += "   ☔ نصيحة: احمل مظلة للأمطار\n"
-                else:
-                    message += "🌸 **الربيع/الخريف:** طقس مثالي للسفر\n"
-                    message += "   🌡️ درجات الحرارة: 18-28°م\n"
-                    message += "   👔 الملابس: ملابس متوسطة\n"
-                    message += "   ✨ نصيحة: أفضل وقت للزيارة\n"
-            
-            elif destination in ['الرباط', 'الدار البيضاء']:
-                message += "🌊 **طقس ساحلي معتدل**\n"
-                message += "   🌡️ درجات الحرارة: 15-25°م\n"
-                message += "   🌬️ رطوبة معتدلة من المحيط\n"
-                message += "   👕 الملابس: ملابس مريحة وخفيفة\n"
-            
-            elif destination in ['باريس', 'لندن']:
-                if 6 <= current_month <= 8:
-                    message += "☀️ **الصيف الأوروبي:** دافئ ومشمس\n"
-                    message += "   🌡️ درجات الحرارة: 15-25°م\n"
-                    message += "   🧥 الملابس: ملابس صيفية + جاكيت خفيف\n"
-                else:
-                    message += "🌧️ **الشتاء الأوروبي:** بارد وممطر\n"
-                    message += "   🌡️ درجات الحرارة: 0-10°م\n"
-                    message += "   🧥 الملابس: ملابس شتوية دافئة\n"
-                    message += "   ☔ نصيحة: احمل مظلة ومعطف مقاوم للماء\n"
-            
-            elif destination in ['دبي']:
-                if 6 <= current_month <= 9:
-                    message += "🔥 **الصيف الخليجي:** حار وجاف جداً\n"
-                    message += "   🌡️ درجات الحرارة: 30-45°م\n"
-                    message += "   ❄️ تكييف قوي في كل مكان\n"
-                    message += "   👕 الملابس: ملابس صيفية + كارديجان للداخل\n"
-                else:
-                    message += "🌤️ **الشتاء الخليجي:** معتدل ومثالي\n"
-                    message += "   🌡️ درجات الحرارة: 20-30°م\n"
-                    message += "   ✨ أفضل وقت للزيارة\n"
-                    message += "   👔 الملابس: ملابس مريحة\n"
-            
-            message += "\n📱 **للطقس المحدث:**\n"
-            message += "   🌐 تطبيق الطقس المحلي\n"
-            message += "   📺 نشرة الأخبار\n"
-            message += "   🔍 بحث Google: 'weather [اسم المدينة]'\n\n"
-            
-            message += "💡 **نصيحة:** تحقق من الطقس قبل يومين من السفر لتحضير الملابس المناسبة!"
+            # Advice from the normals of the current month, rendered at startup for known cities
+            city = CITY_REGISTRY.lookup(destination)
+            message = STATIC_RESPONSES.get('weather', city.name if city else destination, datetime.now().month)
         
         dispatcher.utter_message(text=message)
         return []
 
 
+# =============================================================================
+# STARTUP PRECOMPUTATION
+# =============================================================================
+
+def precompute_fallback_inventory(today=None):
+    """Generate the stand-in offers of every known route and hotel city before the first request"""
+    today = today or datetime.now().date()
+    flight_service = SerpApiFlightService()
+    hotel_service = SerpApiHotelService()
+    cities = [city.name for city in CITY_REGISTRY.cities]
+    
+    def flight_searches():
+        for days in FALLBACK_PRECOMPUTE_DAYS:
+            departure_date = (today + timedelta(days=days)).isoformat()
+            for origin in cities:
+                for destination in cities:
+                    if origin == destination:
+                        continue
+                    for travel_class in ('ECONOMY', 'BUSINESS', 'FIRST'):
+                        key = flight_service.fallback_search_key(origin, destination, departure_date, travel_class)
+                        yield key, lambda rng, key=key: flight_service.generate_fallback_flights(rng, key)
+    
+    def hotel_searches():
+        for city in CITY_REGISTRY.names('moroccan'):
+            for category in ('3 نجوم', '4 نجوم', '5 نجوم'):
+                key = hotel_service.fallback_hotel_key(city, category)
+                yield key, lambda key=key: hotel_service.generate_fallback_hotels(key)
+    
+    return FALLBACK_FLIGHTS.precompute(flight_searches()) + FALLBACK_HOTELS.precompute(hotel_searches())
+
+
+precompute_fallback_inventory()
+
+
 # =============================================================================
 # END OF ACTIONS FILE
 # =============================================================================
@@ -2111,6 +2455,7 @@ API SERVICE CLASSES:
 
 MAIN ACTION CLASSES:
 - ActionSearchFlights: Main flight search action combining SerpApi and AviationStack
+- ActionDeliverFlightResults: Deliver flight search results that outlived the first reply
 - ActionSearchHotels: Main hotel search action using SerpApi
 - ActionGetFlightStatus: Get real-time flight status using AviationStack
 
@@ -2144,7 +2489,7 @@ FEATURES:
 
 SETUP REQUIREMENTS:
 - Environment variables: SERPAPI_KEY, AVIATIONSTACK_API_KEY
-- Dependencies: requests, python-dotenv
+- Dependencies: aiohttp, python-dotenv
 - Rasa SDK with proper domain configuration
 
 This implementation provides a production-ready travel booking experience
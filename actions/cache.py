@@ -0,0 +1,120 @@
+"""
+In-memory response caches for the upstream travel APIs.
+
+Entries are fresh until their soft TTL and may still be served as stale
+(while a background refresh runs) until their hard TTL, after which they
+are never returned.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, namedtuple
+
+logger = logging.getLogger(__name__)
+
+# A cache hit with the age of the value in seconds and whether it is past its soft TTL
+CachedValue = namedtuple('CachedValue', ['value', 'age', 'stale'])
+
+# Keeps references to background refreshes so they are not garbage collected
+_background_tasks = set()
+
+
+class TTLCache:
+    """Bounded cache with soft/hard expiry and LRU eviction"""
+
+    def __init__(self, max_size=256, ttl=600, stale_ttl=None, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl) if stale_ttl is not None else ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key):
+        """Return a CachedValue, stale ones included, or None when missing or past the hard TTL"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, ttl, stale_ttl, value = entry
+        age = self.clock() - stored_at
+        if age >= stale_ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        stale = age >= ttl
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return CachedValue(value, age, stale)
+
+    def get(self, key, default=None):
+        """Return the cached value, or default when missing or past its soft TTL"""
+        entry = self._entries.get(key)
+        if entry is None or self.clock() - entry[0] >= entry[1]:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[3]
+
+    def set(self, key, value, ttl=None, stale_ttl=None):
+        """Store a value, evicting the least recently used entry when full"""
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = max(ttl, self.stale_ttl if stale_ttl is None else stale_ttl)
+        self._entries[key] = (self.clock(), ttl, stale_ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and self.clock() - entry[0] < entry[1]
+
+    def stats(self):
+        """Size and hit/miss counters"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0
+        }
+
+
+def refresh_in_background(coroutine, description):
+    """Run a cache refresh without blocking the caller, logging any failure"""
+    task = asyncio.ensure_future(coroutine)
+    _background_tasks.add(task)
+
+    def _done(finished):
+        _background_tasks.discard(finished)
+        if not finished.cancelled() and finished.exception():
+            logger.warning(f"Background refresh of {description} failed: {finished.exception()}")
+
+    task.add_done_callback(_done)
+    return task
@@ -0,0 +1,119 @@
+"""
+Circuit breakers that short-circuit calls to failing upstream APIs.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import aiohttp
+
+from actions.http_client import PoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Errors that say the upstream itself failed: connection and read errors,
+# upstream timeouts and unreadable bodies. A full local pool is not one.
+UPSTREAM_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError)
+LOCAL_ERRORS = (PoolTimeoutError,)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a timed half-open probe"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+        self.rejected_calls = 0
+
+    @property
+    def state(self):
+        """Current state, moving from open to half-open once the recovery timeout passed"""
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, next call will probe the upstream")
+        return self._state
+
+    def allow_request(self):
+        """Whether a call may go to the upstream right now"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected_calls += 1
+        return False
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed again after a successful call")
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.consecutive_failures = 0
+
+    def release_probe(self):
+        """Let another call probe the upstream after a call that says nothing about it"""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(f"Circuit {self.name} opened after {self.consecutive_failures} consecutive failures")
+            self._state = self.OPEN
+            self._opened_at = self.clock()
+
+    async def call(self, request):
+        """Run request() -> (status, data) through the breaker, only 5xx and upstream errors count as failures"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        try:
+            status, data = await request()
+        except (asyncio.CancelledError,) + LOCAL_ERRORS:
+            self.release_probe()
+            raise
+        except UPSTREAM_ERRORS:
+            self.record_failure()
+            raise
+        except Exception:
+            self.release_probe()
+            raise
+
+        # A 4xx is an answer about the request, the upstream itself is up
+        if status >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+        return status, data
+
+    def snapshot(self):
+        """Queryable breaker state"""
+        state = self.state
+        retry_in = None
+        if state == self.OPEN:
+            retry_in = round(max(0.0, self._opened_at + self.recovery_timeout - self.clock()), 1)
+        return {
+            'name': self.name,
+            'state': state,
+            'consecutive_failures': self.consecutive_failures,
+            'rejected_calls': self.rejected_calls,
+            'retry_in': retry_in
+        }
@@ -0,0 +1,82 @@
+"""
+Canonical city and airport registry.
+
+Every supported city, its IATA codes, aliases, country and coordinates live
+in one data file, loaded once at startup into read-only tables keyed by each
+known spelling. Adding a city is an edit to cities.json only.
+"""
+
+import json
+import os
+from collections import namedtuple
+from types import MappingProxyType
+
+from actions.gazetteer import CityGazetteer, normalize_arabic
+
+CITIES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cities.json')
+
+# iata lists the main airport first, aliases never include the canonical name
+City = namedtuple('City', ['name', 'kind', 'country', 'iata', 'aliases', 'latitude', 'longitude'])
+
+
+class CityRegistry:
+    """Read-only lookup of canonical cities by any spelling, built once"""
+
+    def __init__(self, cities):
+        self.cities = tuple(cities)
+        by_name = {}
+        by_key = {}
+        by_kind = {}
+        for city in self.cities:
+            by_kind.setdefault(city.kind, []).append(city.name)
+            for name in (city.name,) + city.aliases:
+                key = normalize_arabic(name)
+                known = by_key.setdefault(key, city)
+                if known is not city:
+                    raise ValueError(f"'{name}' is already a spelling of {known.name}")
+                by_name[name] = city
+        self._by_name = MappingProxyType(by_name)
+        self._by_key = MappingProxyType(by_key)
+        self._by_kind = MappingProxyType({kind: tuple(names) for kind, names in by_kind.items()})
+
+    @classmethod
+    def load(cls, path=CITIES_FILE):
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)['cities']
+        return cls(
+            City(
+                entry['name'], entry['kind'], entry['country'], tuple(entry['iata']),
+                tuple(entry.get('aliases', ())), entry['latitude'], entry['longitude']
+            )
+            for entry in entries
+        )
+
+    def lookup(self, name):
+        """Canonical city for a spelling, None when the city is unknown"""
+        city = self._by_name.get(name)
+        if city is None and name:
+            # Spelling variants (hamza, taa marbuta, spacing) cost one normalization
+            city = self._by_key.get(normalize_arabic(name))
+        return city
+
+    def airport_code(self, name):
+        """Main IATA code of a city, None when the city is unknown"""
+        city = self.lookup(name)
+        return city.iata[0] if city is not None else None
+
+    def names(self, kind):
+        """Canonical names of one kind of city, in data file order"""
+        return self._by_kind.get(kind, ())
+
+    def gazetteer(self):
+        """City matcher over every canonical name and alias"""
+        return CityGazetteer(
+            {kind: names for kind, names in self._by_kind.items()},
+            {city.name: city.aliases for city in self.cities}
+        )
+
+    def __contains__(self, name):
+        return self.lookup(name) is not None
+
+    def __len__(self):
+        return len(self.cities)
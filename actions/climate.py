@@ -0,0 +1,58 @@
+"""
+Monthly climate normals of the supported cities.
+
+climate.json holds, for every city, the low and high temperature (°C) and
+the number of rainy days of each month from January to December, plus
+clothing advice by monthly high: each [high, advice] band applies up to
+that high, the last band (null) to anything warmer. It is loaded once at
+startup into read-only per-city tables, so a lookup is two indexings.
+"""
+
+import json
+import os
+from bisect import bisect_left
+from collections import namedtuple
+from types import MappingProxyType
+
+CLIMATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'climate.json')
+
+ClimateNormals = namedtuple('ClimateNormals', ['low', 'high', 'rain_days', 'clothing'])
+
+
+class Climatology:
+    """Read-only city × month table of climate normals, built once"""
+
+    def __init__(self, cities, clothing):
+        limits = [high for high, _ in clothing[:-1]]
+        if limits != sorted(limits) or clothing[-1][0] is not None:
+            raise ValueError("Clothing bands must be sorted by high with an open-ended last band")
+        advice = [text for _, text in clothing]
+        by_city = {}
+        for city, months in cities.items():
+            if len(months) != 12:
+                raise ValueError(f"{city} has {len(months)} months of climate normals, expected 12")
+            by_city[city] = tuple(
+                ClimateNormals(low, high, rain_days, advice[bisect_left(limits, high)])
+                for low, high, rain_days in months
+            )
+        self._by_city = MappingProxyType(by_city)
+
+    @classmethod
+    def load(cls, path=CLIMATE_FILE):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['cities'], [tuple(band) for band in data['clothing']])
+
+    def normals(self, city, month):
+        """Normals of a canonical city for a month (1-12), None when the city has no data"""
+        months = self._by_city.get(city)
+        return months[month - 1] if months is not None else None
+
+    def cities(self):
+        return tuple(self._by_city)
+
+    def __contains__(self, city):
+        return city in self._by_city
+
+    def __len__(self):
+        return len(self._by_city)
@@ -0,0 +1,47 @@
+"""
+Request coalescing for identical concurrent upstream calls.
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Share one in-flight upstream call between concurrent callers with the same key"""
+
+    def __init__(self, name):
+        self.name = name
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, call):
+        """Await call() once per key, concurrent callers with the same key share its result"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            logger.info(f"{self.name}: joined in-flight call for {key}")
+        else:
+            self.calls += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield the shared task so one caller giving up does not cancel it for the others
+        return await asyncio.shield(task)
+
+    def in_flight(self, key):
+        """Whether a call for this key is currently running"""
+        return key in self._inflight
+
+    def stats(self):
+        """Upstream calls made and callers collapsed onto them"""
+        callers = self.calls + self.coalesced
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight),
+            'coalesce_rate': round(self.coalesced / callers, 3) if callers else 0.0
+        }
@@ -0,0 +1,244 @@
+"""
+Arabic travel date parser.
+
+Every supported expression (relative days, weekdays, "بعد N أيام", day and
+month names, numeric dates and ranges) is folded into one regular expression
+compiled at import. Results are memoized per (text, today), so the same slot
+value is parsed once a day no matter how many actions read it.
+"""
+
+import calendar
+import re
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
+from actions.gazetteer import NAME_KEY_TABLE
+
+
+class DateSpan(namedtuple('DateSpan', ['start', 'end'])):
+    """A travel date, or a range when end is set"""
+
+    __slots__ = ()
+
+    @property
+    def check_out(self):
+        """Hotel check-out, the night after check-in when no end was given"""
+        return self.end if self.end else self.start + timedelta(days=1)
+
+    @property
+    def nights(self):
+        return (self.check_out - self.start).days
+
+
+# Eastern Arabic and Persian digits are read as ASCII digits
+DIGITS_TABLE = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹', '01234567890123456789')
+
+MONTHS = {
+    'يناير': 1, 'فبراير': 2, 'مارس': 3, 'أبريل': 4, 'إبريل': 4, 'مايو': 5, 'ماي': 5,
+    'يونيو': 6, 'يونيه': 6, 'يوليو': 7, 'يوليوز': 7, 'يوليه': 7, 'أغسطس': 8, 'غشت': 8,
+    'سبتمبر': 9, 'شتنبر': 9, 'أكتوبر': 10, 'نوفمبر': 11, 'نونبر': 11, 'ديسمبر': 12, 'دجنبر': 12,
+    'كانون الثاني': 1, 'شباط': 2, 'آذار': 3, 'نيسان': 4, 'أيار': 5, 'حزيران': 6,
+    'تموز': 7, 'آب': 8, 'أيلول': 9, 'تشرين الأول': 10, 'تشرين الثاني': 11, 'كانون الأول': 12
+}
+
+WEEKDAYS = {
+    'الاثنين': 0, 'الإثنين': 0, 'الثلاثاء': 1, 'الأربعاء': 2, 'الخميس': 3,
+    'الجمعة': 4, 'السبت': 5, 'الأحد': 6
+}
+
+NUMBER_WORDS = {
+    'واحد': 1, 'اثنين': 2, 'اثنان': 2, 'ثلاث': 3, 'ثلاثة': 3, 'أربع': 4, 'أربعة': 4,
+    'خمس': 5, 'خمسة': 5, 'ست': 6, 'ستة': 6, 'سبع': 7, 'سبعة': 7, 'ثمان': 8, 'ثمانية': 8,
+    'تسع': 9, 'تسعة': 9, 'عشر': 10, 'عشرة': 10
+}
+
+# Days from today
+RELATIVE_DAYS = {
+    'اليوم': 0, 'غدا': 1, 'غداً': 1, 'بكرة': 1, 'بعد غد': 2, 'بعد بكرة': 2,
+    'الأسبوع القادم': 7, 'الأسبوع المقبل': 7, 'الأسبوع الجاي': 7
+}
+NEXT_MONTH = ('الشهر القادم', 'الشهر المقبل', 'الشهر الجاي')
+
+# Units of "بعد N ..." and "لمدة N ...": days and months per unit, then the count a dual implies
+UNITS = {
+    'يوم': (1, 0, 1), 'أيام': (1, 0, None), 'يومين': (1, 0, 2), 'ليلة': (1, 0, 1),
+    'ليال': (1, 0, None), 'ليالي': (1, 0, None), 'ليلتين': (1, 0, 2),
+    'أسبوع': (7, 0, 1), 'أسابيع': (7, 0, None), 'أسبوعين': (7, 0, 2),
+    'شهر': (0, 1, 1), 'أشهر': (0, 1, None), 'شهور': (0, 1, None), 'شهرين': (0, 1, 2)
+}
+
+RANGE_SEPARATOR = r'(?:-|–|إلى|الى|حتى|لغاية|و)'
+
+
+def fold(text):
+    """Matching form of a text: ASCII digits, folded letter variants, no diacritics"""
+    return str(text).translate(DIGITS_TABLE).translate(NAME_KEY_TABLE).lower()
+
+
+def _alternation(words):
+    """Regex alternation over folded words, longest first, spaces optional-width"""
+    folded = sorted({fold(word) for word in words}, key=len, reverse=True)
+    return '|'.join(re.escape(word).replace(r'\ ', r'\s+') for word in folded)
+
+
+def _folded_map(mapping):
+    return {' '.join(fold(key).split()): value for key, value in mapping.items()}
+
+
+MONTH_NUMBERS = _folded_map(MONTHS)
+WEEKDAY_NUMBERS = _folded_map(WEEKDAYS)
+COUNT_WORDS = _folded_map(NUMBER_WORDS)
+RELATIVE_OFFSETS = _folded_map(RELATIVE_DAYS)
+UNIT_STEPS = _folded_map(UNITS)
+
+_MONTH = _alternation(MONTHS)
+_COUNT = rf"\d{{1,3}}|{_alternation(NUMBER_WORDS)}"
+_UNIT = _alternation(UNITS)
+_YEAR = r'(?:\s*(?P<{}>\d{{4}}))?'
+_NEXT = fold(r'(?:القادمة?|المقبلة?|الجاي)')
+
+# Alternatives are tried in order at each position, ranges before single dates
+DATE_FORMS = [
+    ('range', rf"(?P<r_from>\d{{1,2}})\s*{fold(RANGE_SEPARATOR)}\s*(?P<r_to>\d{{1,2}})\s*(?P<r_month>{_MONTH})"
+              + _YEAR.format('r_year')),
+    ('iso', r'(?P<i_year>\d{4})-(?P<i_month>\d{1,2})-(?P<i_day>\d{1,2})'),
+    ('numeric', r'(?P<n_day>\d{1,2})\s*(?P<n_sep>[/.-])\s*(?P<n_month>\d{1,2})'
+                r'(?:\s*(?P=n_sep)\s*(?P<n_year>\d{4}|\d{2}))?'),
+    ('day_month', rf"(?P<dm_day>\d{{1,2}})\s*(?P<dm_month>{_MONTH})" + _YEAR.format('dm_year')),
+    ('month_day', rf"(?P<md_month>{_MONTH})\s+(?P<md_day>\d{{1,2}})" + _YEAR.format('md_year')),
+    ('month', rf"(?P<m_month>{_MONTH})" + _YEAR.format('m_year')),
+    ('relative', rf"(?P<rel>{_alternation(RELATIVE_DAYS)})"),
+    ('next_month', rf"(?:{_alternation(NEXT_MONTH)})"),
+    ('after', rf"{fold('بعد')}\s+(?:(?P<a_count>{_COUNT})\s*)?(?P<a_unit>{_UNIT})"),
+    ('duration', rf"{fold('لمدة')}\s+(?:(?P<d_count>{_COUNT})\s*)?(?P<d_unit>{_UNIT})"),
+    ('weekday', rf"(?P<w_day>{_alternation(WEEKDAYS)})(?:\s+(?P<w_next>{_NEXT}))?"),
+    ('pair', r'(?P<p_day>\d{1,2})\s+(?P<p_month>\d{1,2})')
+]
+DATE_PATTERN = re.compile(
+    r'(?<!\w)(?:' + '|'.join(f"(?P<{name}>{form})" for name, form in DATE_FORMS) + r')(?!\w)'
+)
+# Text between two dates that makes them a range, e.g. "من غدا إلى 25 ديسمبر"
+SEPARATOR_PATTERN = re.compile(rf"\s*{fold(RANGE_SEPARATOR)}\s*")
+
+# Forms that name a calendar date; a weekday or relative day said next to one only describes it
+CALENDAR_FORMS = frozenset({'range', 'iso', 'numeric', 'day_month', 'month_day', 'month', 'pair'})
+# Day of the month a bare month name stands for
+MONTH_DEFAULT_DAY = 15
+
+
+def add_months(day, months):
+    """Same day of a later month, clamped to the month's last day"""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _calendar_date(day, month, year, not_before):
+    """Date from parts, a date without a year is the next one not before not_before
+
+    A date with a year before not_before is rejected.
+    """
+    if year is not None:
+        year = int(year)
+        try:
+            day = date(year + 2000 if year < 100 else year, int(month), int(day))
+        except ValueError:
+            return None
+        return day if day >= not_before else None
+    # Four years ahead always reaches the next 29 February
+    for candidate_year in range(not_before.year, not_before.year + 5):
+        try:
+            candidate = date(candidate_year, int(month), int(day))
+        except ValueError:
+            continue
+        if candidate >= not_before:
+            return candidate
+    return None
+
+
+def _count(value, unit):
+    days, months, implicit = UNIT_STEPS[' '.join(unit.split())]
+    if not value:
+        count = implicit or 1
+    else:
+        count = COUNT_WORDS[value] if value in COUNT_WORDS else int(value)
+    return days * count, months * count
+
+
+def _dates(found, today, not_before):
+    """Dates named by one match, and the (days, months) length of a "لمدة" stay"""
+    form = found.lastgroup
+    group = found.group
+    if form == 'range':
+        month = MONTH_NUMBERS[' '.join(group('r_month').split())]
+        start = _calendar_date(group('r_from'), month, group('r_year'), not_before)
+        end = start and _calendar_date(group('r_to'), month, group('r_year'), start)
+        return [start, end], None
+    if form == 'iso':
+        return [_calendar_date(group('i_day'), group('i_month'), group('i_year'), not_before)], None
+    if form == 'numeric':
+        return [_calendar_date(group('n_day'), group('n_month'), group('n_year'), not_before)], None
+    if form in ('day_month', 'month_day'):
+        prefix = 'dm' if form == 'day_month' else 'md'
+        month = MONTH_NUMBERS[' '.join(group(f"{prefix}_month").split())]
+        return [_calendar_date(group(f"{prefix}_day"), month, group(f"{prefix}_year"), not_before)], None
+    if form == 'month':
+        # Mid-month, or not_before once this month's middle has passed
+        month = MONTH_NUMBERS[' '.join(group('m_month').split())]
+        start = _calendar_date(MONTH_DEFAULT_DAY, month, group('m_year'), not_before.replace(day=1))
+        return [max(start, not_before) if start else None], None
+    if form == 'relative':
+        return [today + timedelta(days=RELATIVE_OFFSETS[' '.join(group('rel').split())])], None
+    if form == 'next_month':
+        return [add_months(today, 1)], None
+    if form == 'after':
+        days, months = _count(group('a_count'), group('a_unit'))
+        return [add_months(today, months) + timedelta(days=days)], None
+    if form == 'duration':
+        days, months = _count(group('d_count'), group('d_unit'))
+        return [], (days, months)
+    if form == 'weekday':
+        delta = (WEEKDAY_NUMBERS[group('w_day')] - today.weekday()) % 7
+        if delta == 0 and group('w_next'):
+            delta = 7
+        return [today + timedelta(days=delta)], None
+    return [_calendar_date(group('p_day'), group('p_month'), None, not_before)], None
+
+
+@lru_cache(maxsize=4096)
+def _parse(text, today):
+    text = fold(text)
+    start = end = stay = previous = None
+    start_is_calendar = False
+    for found in DATE_PATTERN.finditer(text):
+        is_calendar = found.lastgroup in CALENDAR_FORMS
+        # Two dates make a range only across a separator or when both are calendar dates
+        closes_range = start is not None and end is None and (
+            SEPARATOR_PATTERN.fullmatch(text, previous.end(), found.start()) is not None
+            or (is_calendar and start_is_calendar)
+        )
+        found_dates, length = _dates(found, today, start if closes_range else today)
+        found_dates = [day for day in found_dates if day is not None]
+        stay = length or stay
+        previous = found
+        if not found_dates:
+            continue
+        if start is None or (is_calendar and not start_is_calendar and not closes_range):
+            # "السبت 20 ديسمبر": the calendar date wins over the weekday
+            start, start_is_calendar = found_dates[0], is_calendar
+            end = found_dates[1] if len(found_dates) > 1 else None
+        elif closes_range:
+            end = found_dates[0]
+    if start is None:
+        return None
+    if end is None and stay is not None:
+        end = add_months(start, stay[1]) + timedelta(days=stay[0])
+    return DateSpan(start, end if end and end > start else None)
+
+
+def parse_dates(text, today=None):
+    """Travel date or range named in an Arabic text, None when it names no date"""
+    if not text:
+        return None
+    return _parse(str(text), today or date.today())
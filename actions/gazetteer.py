@@ -0,0 +1,145 @@
+"""
+Arabic city gazetteer.
+
+City names and their spelling variants are normalized and compiled once into
+a trie, emitted as a single regular expression, so finding every known city
+in a message is one pass of the regex engine over the text instead of one
+substring scan per city.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# A city found in a text, start/end index into the original (unnormalized) text
+CityMatch = namedtuple('CityMatch', ['city', 'kind', 'start', 'end'])
+
+# Harakat, tanween, shadda, sukun, superscript alef and tatweel never change a name
+IGNORED_MARKS = ''.join(chr(code) for code in range(0x064B, 0x0653)) + 'ٰـ'
+
+# Spelling variants folded onto one letter
+ARABIC_VARIANTS = {
+    'ا': 'اأإآٱ',
+    'ي': 'يىئ',
+    'و': 'وؤ',
+    'ه': 'هة'
+}
+NAME_KEY_TABLE = str.maketrans({
+    **{variant: letter for letter, variants in ARABIC_VARIANTS.items() for variant in variants},
+    **{mark: None for mark in IGNORED_MARKS}
+})
+
+# Single-letter proclitics that may be glued to a city name (والرباط، بمراكش، لباريس)
+PROCLITICS = 'وفبلك'
+# After the proclitic ل the alef of the article is dropped (للرباط، للدار البيضاء)
+ARTICLE = 'ال'
+
+_END = ''
+
+
+def normalize_arabic(text):
+    """Lookup key of a name: folded variants, no diacritics, tatweel or spaces"""
+    return ''.join(str(text).translate(NAME_KEY_TABLE).split()).lower()
+
+
+def _trie_regex(node):
+    """Regex matching exactly the names below a trie node, longest first"""
+    branches = []
+    for char, child in sorted(node.items()):
+        if char == _END:
+            continue
+        # Variants match in place so spans stay valid in the original text,
+        # marks may follow any letter and spaces inside a name are optional
+        if char == ' ':
+            head = r'\s*'
+        elif char in ARABIC_VARIANTS:
+            head = f"[{ARABIC_VARIANTS[char]}][{IGNORED_MARKS}]*"
+        else:
+            head = re.escape(char) + f"[{IGNORED_MARKS}]*"
+        branches.append(head + _trie_regex(child))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f"(?:{body})?" if _END in node else body
+
+
+class CityGazetteer:
+    """Compiled whole-word matcher over normalized city names and aliases"""
+
+    def __init__(self, cities_by_kind, aliases=None):
+        self._cities = {}
+        # Entity values are usually exactly a known spelling, answered without the regex
+        self._exact = {}
+        tries = {None: {}}
+        for kind, cities in cities_by_kind.items():
+            tries[kind] = {}
+            for city in cities:
+                self._add(city, kind, city, tries)
+        # Aliases resolve to their canonical city and share its kind
+        for city, names in (aliases or {}).items():
+            kind = self._cities[normalize_arabic(city)][1]
+            for name in names:
+                self._add(name, kind, city, tries)
+        self._patterns = {kind: self._compile(trie) for kind, trie in tries.items()}
+        self._identify = lru_cache(maxsize=1024)(self._lookup)
+
+    def _add(self, name, kind, canonical, tries):
+        """Add a name to the tries, spelling variants keep the first canonical name"""
+        key = normalize_arabic(name)
+        if not key:
+            return
+        self._cities.setdefault(key, (canonical, kind))
+        self._exact.setdefault(name, CityMatch(*self._cities[key], 0, len(name)))
+        # Space-separated words are kept so the regex can make the gap optional
+        folded = ' '.join(str(name).translate(NAME_KEY_TABLE).lower().split())
+        for trie in (tries[None], tries[kind]):
+            node = trie
+            for char in folded:
+                node = node.setdefault(char, {})
+            node[_END] = {}
+
+    def _lookup(self, matched):
+        """Canonical city and kind of a matched spelling, names after للـ without their alef"""
+        key = normalize_arabic(matched)
+        return self._cities.get(key) or self._cities['ا' + key]
+
+    def _compile(self, trie):
+        if not trie:
+            return None
+        names = _trie_regex(trie)
+        article = trie.get(ARTICLE[0], {}).get(ARTICLE[1])
+        if article:
+            # A name with the article also matches as لـ... right after a ل
+            names = f"{names}|(?<=ل)ل[{IGNORED_MARKS}]*{_trie_regex(article)}"
+        return re.compile(
+            rf"(?<!\w)[{PROCLITICS}]{{0,2}}?(?P<name>{names})(?!\w)",
+            re.IGNORECASE
+        )
+
+    def find_all(self, text, kind=None):
+        """Every non-overlapping whole-word city in text, leftmost-longest first"""
+        exact = self._exact.get(text)
+        if exact is not None:
+            return [exact] if kind in (None, exact.kind) else []
+        pattern = self._patterns.get(kind)
+        if pattern is None or not text:
+            return []
+        matches = []
+        for found in pattern.finditer(str(text)):
+            city, city_kind = self._identify(found.group('name'))
+            matches.append(CityMatch(city, city_kind, *found.span('name')))
+        return matches
+
+    def find(self, text, kind=None):
+        """First city in text, or None"""
+        exact = self._exact.get(text)
+        if exact is not None:
+            return exact if kind in (None, exact.kind) else None
+        pattern = self._patterns.get(kind)
+        if pattern is None or not text:
+            return None
+        found = pattern.search(str(text))
+        if found is None:
+            return None
+        city, city_kind = self._identify(found.group('name'))
+        return CityMatch(city, city_kind, *found.span('name'))
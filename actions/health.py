@@ -0,0 +1,150 @@
+"""
+Background health monitoring for the upstream travel APIs.
+
+The monitor observes every real request made through the shared HTTP
+client and, for upstreams with a free probe endpoint, also polls it on a
+fixed interval. Metered upstreams are judged by real traffic only. It keeps
+latency percentiles, error rates and last-success timestamps in memory so
+status questions can be answered without a live request.
+"""
+
+import asyncio
+import logging
+import os
+from collections import deque
+from datetime import datetime
+
+from actions.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', '300'))
+HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', '5'))
+# Number of recent requests kept per upstream for percentiles and error rate
+HEALTH_SAMPLE_SIZE = int(os.getenv('HEALTH_SAMPLE_SIZE', '200'))
+
+
+class UpstreamHealth:
+    """Rolling latency and outcome samples for one upstream"""
+
+    def __init__(self, name, sample_size=HEALTH_SAMPLE_SIZE):
+        self.name = name
+        self.latencies = deque(maxlen=sample_size)
+        self.outcomes = deque(maxlen=sample_size)
+        self.last_status = None
+        self.last_error = None
+        self.last_checked_at = None
+        self.last_success_at = None
+
+    def record(self, latency, status=None, error=None):
+        success = error is None and status == 200
+        self.latencies.append(latency)
+        self.outcomes.append(success)
+        self.last_status = status
+        self.last_error = str(error) if error else None
+        self.last_checked_at = datetime.now()
+        if success:
+            self.last_success_at = self.last_checked_at
+
+    def percentile(self, pct):
+        """Nearest-rank latency percentile in seconds, None without samples"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self):
+        samples = len(self.outcomes)
+        failures = samples - sum(self.outcomes)
+        return {
+            'name': self.name,
+            'samples': samples,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'error_rate': round(failures / samples, 3) if samples else None,
+            'last_status': self.last_status,
+            'last_error': self.last_error,
+            'last_checked_at': self.last_checked_at,
+            'last_success_at': self.last_success_at
+        }
+
+
+class HealthMonitor:
+    """Periodically probes registered upstreams and keeps their health in memory"""
+
+    def __init__(self, interval=HEALTH_CHECK_INTERVAL, timeout=HEALTH_CHECK_TIMEOUT, http_client=None):
+        self.interval = interval
+        self.timeout = timeout
+        self.http = http_client or get_http_client()
+        self.upstreams = {}
+        self._enabled = set()
+        self._probes = {}
+        self._base_urls = {}
+        self._task = None
+        self.http.add_observer(self.observe)
+
+    def register(self, name, base_url, probe_url=None, probe_params=None, enabled=True, interval=None):
+        """Track every request under base_url and poll probe_url, if any, every interval seconds
+
+        Disabled upstreams are listed but never probed.
+        """
+        self.upstreams[name] = UpstreamHealth(name)
+        self._base_urls[base_url.rstrip('/')] = name
+        if enabled:
+            self._enabled.add(name)
+            if probe_url:
+                self._probes[name] = (probe_url, probe_params or {}, interval or self.interval)
+
+    def is_enabled(self, name):
+        return name in self._enabled
+
+    def is_probed(self, name):
+        return name in self._probes
+
+    def observe(self, url, latency, status, error):
+        """HTTP client observer, records every request under a tracked base URL"""
+        # Longest base URL wins, upstreams may share a host (e.g. the local stand-in)
+        matches = [base_url for base_url in self._base_urls if url.startswith(base_url)]
+        if matches:
+            self.upstreams[self._base_urls[max(matches, key=len)]].record(latency, status, error)
+
+    def health(self, name):
+        return self.upstreams.get(name)
+
+    async def _probe(self, name):
+        url, params, _ = self._probes[name]
+        try:
+            # The observer records the outcome of the request
+            await self.http.get_json(url, params, timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f"Health probe for {name} failed: {e}")
+
+    async def check_once(self):
+        """Probe every enabled upstream concurrently"""
+        await asyncio.gather(*[self._probe(name) for name in self._probes])
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_probe = dict.fromkeys(self._probes, loop.time())
+        while True:
+            now = loop.time()
+            due = [name for name, at in next_probe.items() if at <= now]
+            await asyncio.gather(*[self._probe(name) for name in due])
+            for name in due:
+                next_probe[name] = now + self._probes[name][2]
+            await asyncio.sleep(max(0.0, min(next_probe.values()) - loop.time()))
+
+    def ensure_started(self):
+        """Start the background probe loop on the running event loop if needed"""
+        if not self._probes:
+            return
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+            intervals = ', '.join(f"{name} every {probe[2]:g}s" for name, probe in self._probes.items())
+            logger.info(f"Started upstream health monitor ({intervals})")
+
+    def snapshot(self):
+        return {name: health.snapshot() for name, health in self.upstreams.items()}
@@ -0,0 +1,97 @@
+"""
+Hedged requests against upstreams with a long latency tail.
+
+When the first request has not answered by a high percentile of the
+observed latency, an identical second request is started; whichever
+answers first wins and the other one is cancelled. Each hedger keeps its
+own latency window, fed only by its successful requests, so probes and
+other searches against the same upstream do not move its delay.
+"""
+
+import asyncio
+import logging
+import time
+
+from actions.health import UpstreamHealth
+
+logger = logging.getLogger(__name__)
+
+
+class Hedger:
+    """Send a backup request once the primary is slower than the usual tail"""
+
+    def __init__(self, name, quota, enabled=False, percentile=95, min_delay=1.0, min_samples=20):
+        self.name = name
+        self.latency = UpstreamHealth(name)
+        self.quota = quota
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self.skipped = 0
+
+    def hedge_delay(self):
+        """Seconds to wait before hedging, None while there are too few latency samples"""
+        if len(self.latency.latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    async def _timed(self, request):
+        """request(), its latency recorded when it answered with a 200"""
+        started = time.monotonic()
+        status, data = await request()
+        if status == 200:
+            self.latency.record(time.monotonic() - started, status)
+        return status, data
+
+    async def call(self, request):
+        """Await request(), hedged with a second identical request() when the first is slow"""
+        self.requests += 1
+        delay = self.hedge_delay() if self.enabled else None
+        primary = asyncio.ensure_future(self._timed(request))
+        if delay is None:
+            return await primary
+
+        hedge = None
+        try:
+            done, _ = await asyncio.wait([primary], timeout=delay)
+            if done:
+                return primary.result()
+
+            # Hedges bypass the per-sender allowance but never dig into the budget reserve
+            if not self.quota.try_acquire_hedge():
+                self.skipped += 1
+                return await primary
+
+            self.hedged += 1
+            logger.info(f"{self.name}: no answer after {delay:.2f}s, sending hedged request")
+            hedge = asyncio.ensure_future(self._timed(request))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda finished: finished.exception() is not None):
+                    # A failed request only loses if the other one can still answer
+                    if task.exception() is not None and pending:
+                        continue
+                    if task is hedge:
+                        self.wins += 1
+                    return task.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None:
+                    task.cancel()
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'requests': self.requests,
+            'hedged': self.hedged,
+            'wins': self.wins,
+            'skipped': self.skipped,
+            'samples': len(self.latency.latencies),
+            'hedge_rate': round(self.hedged / self.requests, 3) if self.requests else 0.0,
+            'win_rate': round(self.wins / self.hedged, 3) if self.hedged else 0.0
+        }
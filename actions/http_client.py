@@ -0,0 +1,222 @@
+"""
+Shared HTTP client for the upstream travel APIs (SerpApi, AviationStack).
+
+A single process-wide client keeps one keep-alive connection pool per
+upstream host, so repeated searches reuse open TCP/TLS connections instead
+of paying a new handshake on every action run.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Default pool size per upstream host
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '20'))
+# Per-host overrides, e.g. "serpapi.com=30,api.aviationstack.com=5"
+HTTP_POOL_SIZES = os.getenv('HTTP_POOL_SIZES', '')
+# TCP/TLS handshake limit; waiting for a free pooled connection counts against the request total
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '15'))
+# How long an idle connection is kept open for reuse
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+
+
+class PoolTimeoutError(asyncio.TimeoutError):
+    """Raised when the request timed out waiting for a free pooled connection, before reaching the upstream"""
+
+
+def parse_pool_sizes(value):
+    """Parse "host=size,host=size" into a dict"""
+    pool_sizes = {}
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        host, size = item.split('=', 1)
+        try:
+            pool_sizes[host.strip()] = int(size)
+        except ValueError:
+            logger.warning(f"Ignoring invalid pool size for {host.strip()}: {size}")
+    return pool_sizes
+
+
+class PoolStats:
+    """Request and connection counters for one upstream host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.pool_timeouts = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def as_dict(self):
+        connections = self.new_connections + self.reused_connections
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'pool_timeouts': self.pool_timeouts,
+            'new_connections': self.new_connections,
+            'reused_connections': self.reused_connections,
+            'reuse_rate': round(self.reused_connections / connections, 3) if connections else 0.0
+        }
+
+
+class UpstreamHttpClient:
+    """Pooled keep-alive HTTP client with one connection pool per upstream host"""
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, pool_sizes=None,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT,
+                 keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT):
+        self.pool_size = pool_size
+        self.pool_sizes = pool_sizes if pool_sizes is not None else parse_pool_sizes(HTTP_POOL_SIZES)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions = {}
+        self._stats = {}
+        self._observers = []
+        self._loop = None
+
+    def add_observer(self, callback):
+        """Register callback(url, latency, status, error) called after every request"""
+        self._observers.append(callback)
+
+    def _notify(self, url, latency, status, error):
+        for callback in self._observers:
+            try:
+                callback(url, latency, status, error)
+            except Exception as e:
+                logger.error(f"HTTP observer error: {e}")
+
+    def _trace_config(self, stats):
+        """Count new vs. reused connections and note when a request waits for a free one"""
+        async def on_create(session, context, params):
+            stats.new_connections += 1
+
+        async def on_reuse(session, context, params):
+            stats.reused_connections += 1
+
+        async def on_queued_start(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.queued = True
+
+        async def on_queued_end(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.queued = False
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        return trace_config
+
+    def _drop_sessions(self):
+        """Close the sessions of the previous event loop before they are replaced"""
+        old_loop = self._loop
+        for host, session in self._sessions.items():
+            if session.closed:
+                continue
+            if old_loop is not None and old_loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), old_loop)
+                logger.info(f"Closed HTTP connection pool for {host} opened in a previous event loop")
+            else:
+                # Nothing can be awaited on a stopped loop, its sockets go with the dropped session
+                logger.info(f"Dropped HTTP connection pool for {host} opened in a stopped event loop")
+        self._sessions = {}
+
+    def _get_session(self, host):
+        """Return the pooled session for a host, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Sessions are bound to the loop they were created in
+            self._drop_sessions()
+            self._loop = loop
+
+        session = self._sessions.get(host)
+        if session is None or session.closed:
+            stats = self._stats.setdefault(host, PoolStats())
+            pool_size = self.pool_sizes.get(host, self.pool_size)
+            connector = aiohttp.TCPConnector(
+                limit=pool_size,
+                limit_per_host=pool_size,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                # sock_connect bounds the TCP/TLS handshake only; 'connect' would also
+                # count the wait for a free pooled connection, which stays under 'total'
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+                trace_configs=[self._trace_config(stats)]
+            )
+            self._sessions[host] = session
+            logger.info(f"Opened HTTP connection pool for {host} (size {pool_size})")
+        return session
+
+    async def get_json(self, url, params, timeout=None):
+        """GET a JSON resource through the host's pool, returns (status_code, json_data)"""
+        host = urlsplit(url).netloc
+        session = self._get_session(host)
+        stats = self._stats[host]
+        stats.requests += 1
+
+        request_timeout = None
+        if timeout:
+            request_timeout = aiohttp.ClientTimeout(
+                total=timeout, sock_connect=self.connect_timeout, sock_read=self.read_timeout
+            )
+        trace = SimpleNamespace(queued=False)
+        started = time.monotonic()
+        try:
+            async with session.get(url, params=params, timeout=request_timeout, trace_request_ctx=trace) as response:
+                if response.status != 200:
+                    self._notify(url, time.monotonic() - started, response.status, None)
+                    return response.status, None
+                data = await response.json(content_type=None)
+        except asyncio.TimeoutError as e:
+            if not trace.queued:
+                stats.errors += 1
+                self._notify(url, time.monotonic() - started, None, e)
+                raise
+            # The pool stayed full for the whole timeout, the upstream never saw the request
+            stats.pool_timeouts += 1
+            logger.warning(f"No free connection to {host} within {timeout}s")
+            raise PoolTimeoutError(f"No free connection to {host} within {timeout}s") from e
+        except Exception as e:
+            stats.errors += 1
+            self._notify(url, time.monotonic() - started, None, e)
+            raise
+
+        self._notify(url, time.monotonic() - started, response.status, None)
+        return response.status, data
+
+    def pool_stats(self):
+        """Per-host request, error and connection reuse counters"""
+        return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    async def close(self):
+        """Close every pooled session"""
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions = {}
+
+
+_http_client = None
+
+
+def get_http_client():
+    """Return the process-wide upstream HTTP client"""
+    global _http_client
+    if _http_client is None:
+        _http_client = UpstreamHttpClient()
+    return _http_client
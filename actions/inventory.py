@@ -0,0 +1,102 @@
+"""
+Deterministic fallback inventory.
+
+Stand-in offers shown when SerpApi cannot answer are a pure function of the
+search: flights are drawn from a random generator seeded by the route, date
+and class, hotels are a fixed list per city priced for the category. The
+same search therefore shows the same offers on every turn and in every
+process, and the inventory can be memoized, precomputed at startup and
+looked up again when the user confirms an option.
+"""
+
+import hashlib
+import logging
+import random
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+
+logger = logging.getLogger(__name__)
+
+# One stand-in flight, in the units the fallback message shows
+FallbackFlight = namedtuple('FallbackFlight', [
+    'airline', 'dep_hour', 'dep_min', 'arr_hour', 'arr_min', 'price',
+    'duration_hours', 'duration_tens', 'stops', 'rating', 'features'
+])
+
+
+def _key_bytes(parts):
+    return '\x1f'.join('' if part is None else str(part) for part in parts).encode('utf-8')
+
+
+def stable_seed(*parts):
+    """Seed from the parts of a key, unlike hash() the same in every process"""
+    return int.from_bytes(hashlib.blake2b(_key_bytes(parts), digest_size=8).digest(), 'big')
+
+
+def stable_rating(*parts):
+    """Rating between 4.0 and 4.8 that never changes for the same parts"""
+    # Called per listed itinerary, a checksum spreads nine values well enough
+    return 4.0 + zlib.crc32(_key_bytes(parts)) % 9 / 10
+
+
+class FallbackInventory:
+    """Bounded memo of stand-in offers, each generated once, from a generator seeded by its key when seeded"""
+
+    def __init__(self, name, max_size=4096, seeded=True):
+        self.name = name
+        self.max_size = max_size
+        self.seeded = seeded
+        self._offers = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.precomputed = 0
+        self.precompute_seconds = None
+
+    def offers(self, key, generate):
+        """Offers of a search, generate(rng) (generate() when not seeded) only runs the first time the key is seen"""
+        offers = self._offers.get(key)
+        if offers is not None:
+            self.hits += 1
+            self._offers.move_to_end(key)
+            return offers
+        self.misses += 1
+        return self._store(key, generate)
+
+    def _store(self, key, generate):
+        offers = tuple(generate(random.Random(stable_seed(*key))) if self.seeded else generate())
+        self._offers[key] = offers
+        while len(self._offers) > self.max_size:
+            self._offers.popitem(last=False)
+        return offers
+
+    def precompute(self, searches):
+        """Generate the offers of (key, generate) searches ahead of the first request"""
+        started = time.perf_counter()
+        count = 0
+        for key, generate in searches:
+            if key not in self._offers:
+                self._store(key, generate)
+                count += 1
+        self.precomputed += count
+        self.precompute_seconds = time.perf_counter() - started
+        logger.info(f"{self.name}: precomputed {count} searches in {self.precompute_seconds * 1000:.1f} ms")
+        return count
+
+    def __contains__(self, key):
+        return key in self._offers
+
+    def __len__(self):
+        return len(self._offers)
+
+    def stats(self):
+        """Searches held, lookups served from the memo and the startup precomputation"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._offers),
+            'hits': self.hits,
+            'misses': self.misses,
+            'precomputed': self.precomputed,
+            'precompute_ms': round(self.precompute_seconds * 1000, 2) if self.precompute_seconds is not None else None,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
@@ -0,0 +1,440 @@
+"""
+Layouts of the long Arabic replies, compiled once at import.
+
+Plain strings are static blocks appended as they are; Template layouts only
+format their fields. Formatters append both to one list and join it once.
+"""
+
+from actions.templates import Template
+
+RULE_45 = "\n" + "=" * 45 + "\n\n"
+RULE_50 = "=" * 50 + "\n"
+UNKNOWN = '❓ غير محدد'
+CHOOSE_OPTION = "🔹 أي خيار تفضل؟ قل **'الخيار الأول'** أو **'الخيار الثاني'**"
+CHOOSE_HOTEL = "🔹 أي فندق تفضل؟ قل **'الخيار الأول'** أو **'الخيار الثاني'**"
+
+# =============================================================================
+# FLIGHT SEARCH RESULTS
+# =============================================================================
+
+GOOGLE_FLIGHTS_HEADER = Template("🛫 **رحلات Google Flights من {origin} إلى {destination}**\n")
+FALLBACK_FLIGHTS_HEADER = Template("🛫 **رحلات متاحة من {origin} إلى {destination}**\n")
+TRAVEL_DATE_LINE = Template("📅 تاريخ السفر: {departure_date}\n")
+PRICES_AGE_LINE = Template("🕒 آخر تحديث للأسعار: {age}\n")
+TRAVEL_CLASS_LINE = Template("💺 الدرجة: {travel_class}\n")
+FLIGHT_COUNT_LINE = Template("🔎 عدد الرحلات المتاحة: {count}\n")
+
+GOOGLE_FLIGHT_OPTION = Template(
+    "✈️ **الخيار {number}: {airline} {flight_number}**\n"
+    "   🕐 المغادرة: {dep_time} - الوصول: {arr_time}\n"
+    "   💰 السعر: {price_mad:,} درهم (≈${price_usd})\n"
+    "   ⏱️ مدة الرحلة: {duration}\n"
+    "   🔄 التوقفات: {stops} {stops_label}\n"
+    "   ⭐ التقييم: {rating:.1f}/5\n"
+)
+LAYOVER_LINE = Template("   🔄 التوقف في: {airports}\n")
+
+FALLBACK_FLIGHT_OPTION = Template(
+    "✈️ **الخيار {number}: {airline}**\n"
+    "   🕐 المغادرة: {dep_hour:02d}:{dep_min} - الوصول: {arr_hour:02d}:{arr_min}\n"
+    "   💰 السعر: {price:,} درهم\n"
+    "   ⏱️ مدة الرحلة: {duration_hours}h {duration_tens}0m\n"
+    "   🔄 التوقفات: {stops}\n"
+    "   ⭐ التقييم: {rating:.1f}/5\n"
+    "   🎯 المميزات: {features}\n\n"
+)
+
+# =============================================================================
+# HOTEL SEARCH RESULTS
+# =============================================================================
+
+GOOGLE_HOTELS_HEADER = Template(
+    "🏨 **فنادق Google Hotels في {city}**\n"
+    "⭐ الفئة: {category}\n"
+    "👥 عدد الأشخاص: {num_guests}\n"
+)
+PREFERRED_QUARTER_LINE = Template("📍 المنطقة المفضلة: {quarter}\n")
+
+GOOGLE_HOTEL_OPTION = Template(
+    "🏨 **الخيار {number}: {name}**\n"
+    "   💰 السعر: {price_mad:,} درهم/ليلة (≈${price_usd})\n"
+    "   ⭐ التقييم Google: {rating}/5\n"
+    "   🏢 النوع: {hotel_type}\n"
+)
+HOTEL_AMENITIES_LINE = Template("   🎯 المميزات: {amenities}\n")
+HOTEL_DEFAULT_AMENITIES = "   🎯 المميزات: مرافق ممتازة، خدمة متميزة\n"
+HOTEL_CENTRAL_LOCATION = "   📍 الموقع: موقع مركزي ممتاز\n"
+HOTEL_DISTRICT_LINE = Template("   📍 المنطقة: {district}\n")
+
+# =============================================================================
+# REAL-TIME FLIGHT INFORMATION
+# =============================================================================
+
+REALTIME_HEADER = Template(
+    "📡 **معلومات الرحلات المباشرة** (AviationStack)\n"
+    "✈️ من {origin} إلى {destination}\n"
+)
+REALTIME_AGE_LINE = Template("🕒 آخر تحديث: {age}\n")
+REALTIME_ACTIVE_COUNT = Template("🟢 **الرحلات النشطة الآن:** {count}\n\n")
+REALTIME_FLIGHT = Template("✈️ **{airline} {flight_number}**\n   📊 الحالة: {status}\n")
+REALTIME_SCHEDULED_DEPARTURE = Template("   🕐 المغادرة المجدولة: {time}\n")
+REALTIME_ACTUAL_DEPARTURE = Template("   🕐 المغادرة الفعلية: {time}\n")
+REALTIME_ARRIVAL = Template("   🛬 الوصول المتوقع: {time}\n")
+REALTIME_GATE = Template("   🚪 البوابة: {gate}\n")
+REALTIME_TERMINAL = Template("   🏢 المحطة: {terminal}\n")
+REALTIME_NO_ACTIVE = (
+    "ℹ️ لا توجد رحلات مباشرة نشطة حالياً\n"
+    "يمكنك البحث عن رحلات مجدولة أو رحلات بتوقفات\n\n"
+)
+
+# =============================================================================
+# RESERVATION CONFIRMATION
+# =============================================================================
+
+CONFIRMATION_HEADER = Template(
+    "🎉 **تهانينا! تم تأكيد حجزك بنجاح!** 🎉\n\n"
+    + RULE_50
+    + "📋 **رقم الحجز: {booking_ref}**\n"
+    + RULE_50 + "\n"
+)
+
+CONFIRMED_FLIGHT = Template(
+    "✈️ **تفاصيل رحلة الطيران:**\n"
+    "   📍 من: {origin}\n"
+    "   📍 إلى: {destination}\n"
+)
+CONFIRMED_TRAVEL_DATE = Template("   📅 تاريخ السفر: {departure_date}\n")
+CONFIRMED_TRAVEL_CLASS = Template("   💺 الدرجة: {travel_class}\n")
+CONFIRMED_FLIGHT_OPTIONS = {
+    '1': "   🛫 الناقل: الخيار الأول المحدد\n   💰 تم تأكيد السعر والمقعد\n",
+    '2': "   🛫 الناقل: الخيار الثاني المحدد\n   💰 تم تأكيد السعر والمقعد\n"
+}
+CONFIRMED_FLIGHT_OFFER = Template("   🛫 الناقل: {airline}\n   💰 السعر المؤكد: {price:,} درهم\n")
+CONFIRMED_FLIGHT_END = "   🎫 سيتم إرسال تذكرة الطيران الإلكترونية\n\n"
+
+CONFIRMED_HOTEL = Template("🏨 **تفاصيل حجز الفندق:**\n   📍 المدينة: {city}\n")
+CONFIRMED_HOTEL_CATEGORY = Template("   ⭐ الفئة: {category}\n")
+CONFIRMED_HOTEL_GUESTS = Template("   👥 عدد الأشخاص: {num_guests}\n")
+CONFIRMED_HOTEL_OPTIONS = {
+    '1': "   🏨 الفندق: الخيار الأول المحدد\n   💰 حجز مؤكد بمرافق ممتازة\n",
+    '2': "   🏨 الفندق: الخيار الثاني المحدد\n   💰 حجز مؤكد بقيمة ممتازة\n"
+}
+CONFIRMED_HOTEL_OFFER = Template("   🏨 الفندق: {name}\n   💰 السعر المؤكد: {price:,} درهم/ليلة\n")
+CONFIRMED_HOTEL_END = "   📅 سيتم إرسال قسيمة الحجز\n\n"
+
+CONFIRMATION_FOOTER = Template(
+    RULE_50
+    + "💳 **معلومات الدفع:**\n"
+    "   • سيتم التواصل معك خلال 30 دقيقة لتأكيد الدفع\n"
+    "   • طرق الدفع: نقداً، بطاقة ائتمان، تحويل بنكي\n"
+    "   • إمكانية الدفع عند الاستلام (للفنادق)\n\n"
+
+    "📧 **سيتم إرسال جميع التفاصيل عبر:**\n"
+    "   📨 البريد الإلكتروني خلال 15 دقيقة\n"
+    "   💬 رسالة نصية للهاتف المحمول\n"
+    "   📱 واتساب (اختياري)\n\n"
+
+    "📞 **خدمة العملاء 24/7:**\n"
+    "   📞 الهاتف: +212-5XX-XXXXXX\n"
+    "   💬 واتساب: +212-6XX-XXXXXX\n"
+    "   📧 البريد: support@travel-smart.ma\n\n"
+
+    "🎯 **نصائح مهمة:**\n"
+    "   • احتفظ برقم الحجز: **{booking_ref}**\n"
+    "   • تأكد من صحة جواز السفر (للطيران الدولي)\n"
+    "   • اوصل للمطار قبل 3 ساعات (دولي) أو 2 ساعة (محلي)\n"
+    "   • تحقق من شروط الإلغاء والتعديل\n"
+    "   • احمل نسخة من تأكيد الحجز\n\n"
+
+    "🔄 **للحصول على خدمات إضافية:**\n"
+    "   🚗 حجز سيارة أجرة من/إلى المطار\n"
+    "   🎫 حجز جولات سياحية\n"
+    "   🍽️ حجز مطاعم\n"
+    "   💱 خدمة تحويل العملات\n\n"
+
+    + RULE_50
+    + "🌟 **شكراً لثقتك بوكالة السفر الذكية!**\n"
+    "✈️🏨 نتمنى لك رحلة سعيدة وإقامة ممتعة! ✨\n\n"
+    "🔄 **لحجز جديد، قل 'مرحبا' أو 'حجز جديد'**"
+)
+
+# =============================================================================
+# BOOKING SUMMARY
+# =============================================================================
+
+NO_BOOKING_SUMMARY = (
+    "📋 **لا توجد معلومات حجز حالياً**\n\n"
+    "💡 **ابدأ حجز جديد:**\n"
+    "   ✈️ قل 'أريد حجز رحلة طيران'\n"
+    "   🏨 قل 'أريد حجز فندق'\n"
+    "   🎯 أو أخبرني بوجهتك مباشرة"
+)
+SUMMARY_HEADER = "📋 **ملخص معلومات الحجز الحالية:**\n\n"
+SUMMARY_FLIGHT = Template(
+    "✈️ **معلومات الرحلة:**\n"
+    "   📍 من: {origin}\n"
+    "   📍 إلى: {destination}\n"
+    "   📅 التاريخ: {departure_date}\n"
+    "   💺 الدرجة: {travel_class}\n"
+)
+SUMMARY_HOTEL = Template(
+    "🏨 **معلومات الفندق:**\n"
+    "   📍 المدينة: {city}\n"
+    "   ⭐ الفئة: {category}\n"
+    "   👥 عدد الأشخاص: {num_guests}\n"
+)
+SUMMARY_QUARTER = Template("   📍 المنطقة: {quarter}\n")
+SUMMARY_SELECTED_OPTION = Template("   ✅ الخيار المحدد: الخيار {option}\n")
+SUMMARY_NEXT_STEPS = "🔄 **الخطوات التالية:**\n"
+SUMMARY_CONFIRM_OR_CHANGE = (
+    "   ✅ قل 'أؤكد' أو 'نعم' لتأكيد الحجز\n"
+    "   🔄 قل 'غير' أو 'لا' لتغيير الخيار\n"
+)
+SUMMARY_MISSING = Template("   📝 مطلوب إكمال: {fields}\n")
+SUMMARY_SEARCH_HINT = "   🔍 قل 'ابحث' للعثور على الخيارات المتاحة\n"
+
+# =============================================================================
+# FIXED REPLIES (rendered once at startup, see STATIC_RESPONSES)
+# =============================================================================
+
+HELP = (
+    "🤖 **مرحباً بك في وكالة السفر الذكية!**\n\n"
+    "💡 **يمكنني مساعدتك في:**\n\n"
+
+    "✈️ **حجز الرحلات الجوية:**\n"
+    "   • رحلات داخلية في المغرب\n"
+    "   • رحلات دولية إلى أوروبا، الشرق الأوسط، أمريكا\n"
+    "   • جميع درجات السفر (اقتصادية، أعمال، أولى)\n"
+    "   • أسعار تنافسية من عدة شركات طيران\n\n"
+
+    "🏨 **حجز الفنادق:**\n"
+    "   • فنادق من 3 إلى 5 نجوم\n"
+    "   • في جميع المدن المغربية الرئيسية\n"
+    "   • خيارات متنوعة حسب الميزانية\n"
+    "   • معلومات مفصلة عن المرافق والخدمات\n\n"
+
+    "📊 **معلومات الرحلات:**\n"
+    "   • حالة الرحلات المباشرة\n"
+    "   • معلومات المطارات\n"
+    "   • تحديثات فورية عن التأخير والإلغاء\n\n"
+
+    "🗣️ **كيفية التفاعل معي:**\n"
+    "   • قل 'أريد حجز رحلة طيران'\n"
+    "   • قل 'أريد حجز فندق'\n"
+    "   • قل 'ما حالة الرحلات من ... إلى ...'\n"
+    "   • استخدم كلمات بسيطة وواضحة\n\n"
+
+    "📞 **تحتاج مساعدة إضافية؟**\n"
+    "   📞 اتصل بنا: +212-5XX-XXXXXX\n"
+    "   💬 واتساب: +212-6XX-XXXXXX\n"
+    "   📧 البريد: support@travel-smart.ma\n\n"
+
+    "🌟 **ابدأ الآن بقول ما تريد!**"
+)
+
+TRAVEL_TIPS = (
+    "🎯 **نصائح السفر المفيدة:**\n\n"
+
+    "✈️ **نصائح للطيران:**\n"
+    "   • احجز مقعدك المفضل مسبقاً\n"
+    "   • تحقق من وزن الأمتعة المسموح\n"
+    "   • وصول مبكر للمطار (3 ساعات دولي، 2 ساعة محلي)\n"
+    "   • احمل وثائق السفر في حقيبة اليد\n"
+    "   • شرب الماء بكثرة أثناء الرحلة\n\n"
+
+    "🏨 **نصائح للفنادق:**\n"
+    "   • اقرأ التقييمات قبل الحجز\n"
+    "   • تأكد من سياسة الإلغاء\n"
+    "   • احجز الغرف مع إطلالة مبكراً\n"
+    "   • استفسر عن الخدمات المجانية\n"
+    "   • احتفظ بإيصال الحجز\n\n"
+
+    "🎒 **تحضير الرحلة:**\n"
+    "   • تحقق من صلاحية جواز السفر\n"
+    "   • اشترك في تأمين السفر\n"
+    "   • أخبر البنك بسفرك لتجنب إيقاف البطاقة\n"
+    "   • احفظ نسخ إلكترونية من الوثائق\n"
+    "   • تعلم بعض العبارات المحلية\n\n"
+
+    "💰 **توفير المال:**\n"
+    "   • قارن الأسعار عبر عدة مواقع\n"
+    "   • احجز مبكراً للحصول على أفضل الأسعار\n"
+    "   • تجنب مواسم الذروة إذا أمكن\n"
+    "   • استخدم برامج النقاط والولاء\n"
+    "   • ابحث عن عروض حزم الطيران والفندق\n\n"
+
+    "🌍 **أثناء السفر:**\n"
+    "   • احتفظ بنسخ من الوثائق منفصلة\n"
+    "   • استخدم خزانة الفندق للقيم\n"
+    "   • كن حذراً مع الواي فاي العام\n"
+    "   • احترم العادات والتقاليد المحلية\n"
+    "   • احتفظ بأرقام الطوارئ\n\n"
+
+    "📞 **للمساعدة الإضافية، تواصل معنا على:**\n"
+    "   📞 +212-5XX-XXXXXX\n"
+    "   💬 واتساب: +212-6XX-XXXXXX"
+)
+
+GREETING = Template(
+    "🌟 **{time_greeting} ومرحباً بك في وكالة السفر الذكية!**\n\n"
+    "✈️🏨 **أنا مساعدك الشخصي للسفر والحجوزات**\n\n"
+
+    "🎯 **يمكنني مساعدتك في:**\n"
+    "   ✈️ حجز رحلات طيران (داخلية ودولية)\n"
+    "   🏨 حجز فنادق في جميع أنحاء المغرب\n"
+    "   📊 معلومات الرحلات المباشرة والحالية\n"
+    "   💰 أفضل الأسعار والعروض المتاحة\n\n"
+
+    "🚀 **ابدأ معي الآن:**\n"
+    "   • قل 'أريد حجز رحلة طيران'\n"
+    "   • قل 'أريد حجز فندق'\n"
+    "   • قل 'ما حالة الرحلات'\n"
+    "   • أو أخبرني مباشرة بوجهتك!\n\n"
+
+    "💡 **مثال:** 'أريد السفر من الدار البيضاء إلى باريس'\n\n"
+    "🤝 **كيف يمكنني مساعدتك اليوم؟**"
+)
+
+
+def greeting(hour):
+    """Welcome message for the hour of the day"""
+    time_greeting = "صباح الخير" if 5 <= hour < 12 else "مساء الخير"
+    return GREETING.render(time_greeting=time_greeting)
+
+
+FAREWELL_HEADER = "👋 **شكراً لك على استخدام وكالة السفر الذكية!**\n\n"
+FAREWELL_UNFINISHED_BOOKING = (
+    "📋 **إذا كان لديك حجز غير مكتمل:**\n"
+    "   • يمكنك العودة لاحقاً لإكمال الحجز\n"
+    "   • سيتم حفظ بياناتك لفترة قصيرة\n\n"
+)
+FAREWELL_FOOTER = (
+    "🌟 **نتطلع لخدمتك مرة أخرى!**\n\n"
+    "📞 **للتواصل:**\n"
+    "   📞 الهاتف: +212-5XX-XXXXXX\n"
+    "   💬 واتساب: +212-6XX-XXXXXX\n"
+    "   📧 البريد: support@travel-smart.ma\n\n"
+    "✈️🏨 **رحلات سعيدة وإقامة ممتعة!** ✨"
+)
+
+
+def farewell(has_booking):
+    """Goodbye message, with a reminder when a booking was left unfinished"""
+    if has_booking:
+        return FAREWELL_HEADER + FAREWELL_UNFINISHED_BOOKING + FAREWELL_FOOTER
+    return FAREWELL_HEADER + FAREWELL_FOOTER
+
+
+# Re-prompt for the slot a form was asking for when the answer was not understood
+FALLBACK_PROMPTS = {
+    'flight_form': {
+        'ville_depart': "🤔 لم أفهم المدينة. من أي مدينة تريد السفر؟\n"
+                        "المدن المتاحة: الرباط، الدار البيضاء، مراكش، فاس، أكادير، طنجة",
+        'ville_destination': "🤔 لم أفهم الوجهة. إلى أي مدينة تريد السفر؟\n"
+                             "مثال: باريس، لندن، مدريد، دبي، القاهرة",
+        'date_depart': "🤔 لم أفهم التاريخ. متى تريد السفر؟\n"
+                       "مثال: 15 مايو، غداً، الأسبوع القادم، 20 يونيو",
+        'classe': "🤔 لم أفهم الدرجة. أي درجة تفضل؟\n"
+                  "الخيارات: اقتصادية، أعمال، أولى",
+        None: "🤔 لم أفهم ردك. يمكنني المساعدة في حجز رحلة طيران.\n"
+              "قل 'مساعدة' للحصول على المزيد من المعلومات."
+    },
+    'hotel_form': {
+        'ville_hotel': "🤔 لم أفهم المدينة. في أي مدينة تريد الإقامة؟\n"
+                       "المدن المتاحة: الرباط، الدار البيضاء، مراكش، فاس، أكادير، طنجة",
+        'categorie_hotel': "🤔 لم أفهم فئة الفندق. كم نجمة تريد؟\n"
+                           "الخيارات: 3 نجوم، 4 نجوم، 5 نجوم، فاخر",
+        'nombre_personnes': "🤔 لم أفهم العدد. كم عدد الأشخاص؟\n"
+                            "مثال: شخص واحد، شخصين، 4 أشخاص",
+        None: "🤔 لم أفهم ردك. يمكنني المساعدة في حجز فندق.\n"
+              "قل 'مساعدة' للحصول على المزيد من المعلومات."
+    }
+}
+FALLBACK_GENERAL = (
+    "🤔 عذراً، لم أتمكن من فهم طلبك بوضوح.\n\n"
+    "💡 **يمكنني مساعدتك في:**\n"
+    "   ✈️ حجز رحلات طيران - قل 'أريد حجز رحلة'\n"
+    "   🏨 حجز فنادق - قل 'أريد حجز فندق'\n"
+    "   📊 معلومات الرحلات المباشرة - قل 'ما حالة الرحلات'\n"
+    "   ❓ الحصول على مساعدة - قل 'مساعدة'\n\n"
+    "🗣️ **أو اكتب ما تريده بكلمات بسيطة وواضحة**"
+)
+
+
+def fallback(active_form, requested_slot):
+    """Reply to an unrecognized message, given the form and slot being filled"""
+    prompts = FALLBACK_PROMPTS.get(active_form)
+    if prompts is None:
+        return FALLBACK_GENERAL
+    return prompts.get(requested_slot, prompts[None])
+
+
+# Every (active form, requested slot) the fallback distinguishes, rendered at startup
+FALLBACK_INPUTS = [(None, None)] + [
+    (form, slot) for form, prompts in FALLBACK_PROMPTS.items() for slot in prompts
+]
+
+# =============================================================================
+# WEATHER (rendered once per city and month, see STATIC_RESPONSES)
+# =============================================================================
+
+MONTH_NAMES = (
+    'يناير', 'فبراير', 'مارس', 'أبريل', 'مايو', 'يونيو',
+    'يوليو', 'أغسطس', 'سبتمبر', 'أكتوبر', 'نوفمبر', 'ديسمبر'
+)
+
+WEATHER_NO_DESTINATION = (
+    "🌤️ **معلومات الطقس**\n\n"
+    "لمعرفة حالة الطقس، أحتاج إلى معرفة الوجهة.\n"
+    "مثال: 'ما حالة الطقس في مراكش؟'\n\n"
+    "💡 **المدن المتاحة:**\n"
+    "   🇲🇦 المغرب: الرباط، الدار البيضاء، مراكش، فاس\n"
+    "   🌍 دولياً: باريس، لندن، مدريد، دبي"
+)
+WEATHER_HEADER = Template("🌤️ **معلومات الطقس في {city}**\n\n")
+WEATHER_NORMALS = Template(
+    "📅 **الطقس المعتاد في شهر {month}:**\n"
+    "   🌡️ درجات الحرارة: من {low} إلى {high}°م\n"
+    "   🌧️ عدد الأيام الممطرة: {rain_days} تقريباً\n"
+    "   👕 الملابس: {clothing}\n"
+)
+WEATHER_NO_DATA = "ℹ️ لا تتوفر معلومات مناخية لهذه الوجهة حالياً\n"
+
+# Tips by monthly normals, from the first rule that applies
+WEATHER_HOT_HIGH = 33
+WEATHER_FROST_LOW = 0
+WEATHER_RAINY_DAYS = 8
+WEATHER_HEAT_TIP = "   💧 نصيحة: اشرب الماء بكثرة وتجنب شمس الظهيرة\n"
+WEATHER_FROST_TIP = "   ❄️ نصيحة: احتمال الصقيع أو الثلج، احمل ملابس دافئة جداً\n"
+WEATHER_RAIN_TIP = "   ☔ نصيحة: احمل مظلة ومعطفاً مقاوماً للماء\n"
+WEATHER_MILD_TIP = "   ✨ نصيحة: طقس مثالي للسفر\n"
+
+WEATHER_FOOTER = (
+    "\n📱 **للطقس المحدث:**\n"
+    "   🌐 تطبيق الطقس المحلي\n"
+    "   📺 نشرة الأخبار\n"
+    "   🔍 بحث Google: 'weather [اسم المدينة]'\n\n"
+    "💡 **نصيحة:** تحقق من الطقس قبل يومين من السفر لتحضير الملابس المناسبة!"
+)
+
+
+def weather(city, month, normals):
+    """Weather advice for a city in a month (1-12) from its climate normals, if known"""
+    parts = [WEATHER_HEADER.render(city=city)]
+    if normals is None:
+        parts.append(WEATHER_NO_DATA)
+    else:
+        parts.append(WEATHER_NORMALS.render(
+            month=MONTH_NAMES[month - 1], low=normals.low, high=normals.high,
+            rain_days=normals.rain_days, clothing=normals.clothing
+        ))
+        if normals.high >= WEATHER_HOT_HIGH:
+            parts.append(WEATHER_HEAT_TIP)
+        elif normals.low <= WEATHER_FROST_LOW:
+            parts.append(WEATHER_FROST_TIP)
+        elif normals.rain_days >= WEATHER_RAINY_DAYS:
+            parts.append(WEATHER_RAIN_TIP)
+        elif normals.rain_days <= 2 and 20 <= normals.high <= 30:
+            parts.append(WEATHER_MILD_TIP)
+    parts.append(WEATHER_FOOTER)
+    return ''.join(parts)
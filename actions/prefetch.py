@@ -0,0 +1,68 @@
+"""
+Speculative prefetching of upstream searches while a form is still being filled.
+"""
+
+import logging
+import time
+from collections import OrderedDict, deque
+
+from actions.cache import refresh_in_background
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Budget-capped background warm-up of cache entries, tracking how many get used"""
+
+    def __init__(self, name, enabled=False, budget=100, window=3600, clock=time.monotonic):
+        self.name = name
+        self.enabled = enabled
+        self.budget = budget
+        self.window = window
+        self.clock = clock
+        self._issued_at = deque()
+        self._pending = OrderedDict()
+        self.issued = 0
+        self.used = 0
+        self.skipped = 0
+
+    def _expire(self, now):
+        while self._issued_at and now - self._issued_at[0] >= self.window:
+            self._issued_at.popleft()
+        while self._pending and now - next(iter(self._pending.values())) >= self.window:
+            self._pending.popitem(last=False)
+
+    def prefetch(self, key, call):
+        """Start call() in the background unless disabled, already pending or over budget"""
+        if not self.enabled:
+            return False
+
+        now = self.clock()
+        self._expire(now)
+        if key in self._pending:
+            return False
+        if len(self._issued_at) >= self.budget:
+            self.skipped += 1
+            logger.info(f"{self.name}: prefetch budget of {self.budget} per {self.window}s reached, skipping {key}")
+            return False
+
+        self._issued_at.append(now)
+        self._pending[key] = now
+        self.issued += 1
+        logger.info(f"{self.name}: prefetching {key}")
+        refresh_in_background(call(), f"{self.name} prefetch {key}")
+        return True
+
+    def mark_used(self, key):
+        """Count a real request that was answered by a prefetched entry"""
+        if self._pending.pop(key, None) is not None:
+            self.used += 1
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'issued': self.issued,
+            'used': self.used,
+            'skipped': self.skipped,
+            'use_rate': round(self.used / self.issued, 3) if self.issued else 0.0
+        }
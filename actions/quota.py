@@ -0,0 +1,212 @@
+"""
+Usage limits for metered upstream APIs.
+
+SerpApi bills every search and enforces per-second and monthly limits, so
+calls go through a token bucket, a monthly budget persisted to a local file
+and a per-sender allowance before they reach the network.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call is refused by the rate limiter or the budget"""
+
+
+class TokenBucket:
+    """Token bucket refilled at a steady rate, up to a burst capacity"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available, never waits"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+
+class MonthlyBudget:
+    """Calendar-month usage counter persisted to a JSON file
+
+    The count lives in memory and is written out every save_every calls or
+    save_interval seconds, and on flush(), so billed calls do not each block
+    the event loop on file I/O.
+    """
+
+    def __init__(self, limit, path, reserve=0, now=datetime.now, save_every=10, save_interval=60,
+                 clock=time.monotonic):
+        self.limit = limit
+        self.path = path
+        self.reserve = reserve
+        self.now = now
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.clock = clock
+        self.month = now().strftime('%Y-%m')
+        self.used = 0
+        self._unsaved = 0
+        self._saved_at = clock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('month') == self.month:
+                self.used = int(state.get('used', 0))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Could not read usage budget from {self.path}: {e}")
+
+    def _save(self):
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'month': self.month, 'used': self.used}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Could not persist usage budget to {self.path}: {e}")
+
+    def _roll_month(self):
+        month = self.now().strftime('%Y-%m')
+        if month != self.month:
+            self.month = month
+            self.used = 0
+
+    def remaining(self):
+        self._roll_month()
+        return max(0, self.limit - self.used)
+
+    def is_low(self, margin=0):
+        """True once only the reserved part of the budget, plus margin, is left"""
+        return self.remaining() <= self.reserve + margin
+
+    def consume(self, amount=1):
+        self._roll_month()
+        self.used += amount
+        self._unsaved += amount
+        if self._unsaved >= self.save_every or self.clock() - self._saved_at >= self.save_interval:
+            self.flush()
+
+    def flush(self):
+        """Persist usage not written out yet"""
+        if self._unsaved:
+            self._save()
+            self._unsaved = 0
+        self._saved_at = self.clock()
+
+
+class SenderAllowance:
+    """Caps how many upstream calls a single sender may trigger per time window"""
+
+    def __init__(self, limit, window, clock=time.monotonic, max_senders=10000):
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.max_senders = max_senders
+        self._calls = {}
+
+    def allows(self, sender_id, calls=1):
+        """Whether the sender has that many calls left in the current window, without charging it"""
+        now = self.clock()
+        made = self._calls.get(sender_id)
+        if not made:
+            return calls <= self.limit
+        while made and now - made[0] >= self.window:
+            made.popleft()
+        return len(made) + calls <= self.limit
+
+    def charge(self, sender_id):
+        """Count one call against the sender's window"""
+        now = self.clock()
+        self._calls.setdefault(sender_id, deque()).append(now)
+        if len(self._calls) > self.max_senders:
+            self._prune(now)
+
+    def _prune(self, now):
+        for sender_id in [s for s, calls in self._calls.items() if not calls or now - calls[-1] >= self.window]:
+            del self._calls[sender_id]
+
+
+class UpstreamQuota:
+    """Rate limit, monthly budget and per-sender fairness for one metered API"""
+
+    def __init__(self, name, bucket, budget, allowance):
+        self.name = name
+        self.bucket = bucket
+        self.budget = budget
+        self.allowance = allowance
+        self.allowed = 0
+        self.hedges = 0
+        self.rejected = {'budget': 0, 'rate': 0, 'sender': 0}
+
+    def acquire(self, sender_id=None):
+        """Admit one upstream call or raise QuotaExceededError
+
+        The sender is only charged once the budget and the rate limit admitted the call.
+        """
+        if self.budget.is_low():
+            self._reject('budget', f"{self.name} monthly budget almost exhausted ({self.budget.remaining()} left)")
+        if sender_id and not self.allowance.allows(sender_id):
+            self._reject('sender', f"{self.name} allowance used up for sender {sender_id}")
+        if not self.bucket.try_acquire():
+            self._reject('rate', f"{self.name} rate limit reached")
+        if sender_id:
+            self.allowance.charge(sender_id)
+        self.allowed += 1
+
+    def admits_prefetch(self, sender_id=None, margin=0):
+        """Whether a speculative call fits, leaving margin above the reserve and the sender a call of their own"""
+        if self.budget.is_low(margin):
+            return False
+        return not sender_id or self.allowance.allows(sender_id, calls=2)
+
+    def try_acquire_hedge(self):
+        """Admit a duplicate request without raising, never from the reserved budget"""
+        if self.budget.is_low() or not self.bucket.try_acquire():
+            return False
+        # Charged up front, the losing request is billed even though its answer is dropped
+        self.hedges += 1
+        self.budget.consume()
+        return True
+
+    def _reject(self, reason, detail):
+        self.rejected[reason] += 1
+        logger.warning(detail)
+        raise QuotaExceededError(detail)
+
+    def record_usage(self, amount=1):
+        """Count a billed call against the monthly budget"""
+        self.budget.consume(amount)
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'month': self.budget.month,
+            'used': self.budget.used,
+            'limit': self.budget.limit,
+            'remaining': self.budget.remaining(),
+            'allowed': self.allowed,
+            'hedges': self.hedges,
+            'rejected': dict(self.rejected)
+        }
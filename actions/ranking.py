@@ -0,0 +1,330 @@
+"""
+Hotel and flight ranking.
+
+The fields a ranking needs (rating, price, amenity count, distance to the
+city centre for hotels; price, duration and stops for flights) are pulled out
+of a SerpApi answer into parallel arrays once, scored column by column with
+configurable weights, and only the best k are selected with a heap instead of
+sorting the whole list.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+# Rating bands: below 3.5, 3.5 to 4.0, 4.0 to 4.5, 4.5 and above
+RATING_THRESHOLDS = (3.5, 4.0, 4.5)
+
+# Points per rating band for each requested star category
+CATEGORY_FIT = {
+    5: (0, 0, 2, 3),
+    4: (0, 1, 3, 2),
+    3: (0, 3, 1, 1)
+}
+NO_FIT = (0, 0, 0, 0)
+
+# fit, priced and amenities give the original whole-point category score, the
+# other weights add up to less than one point so by default they only break ties
+DEFAULT_WEIGHTS = {
+    'fit': 1.0,
+    'priced': 1.0,
+    'amenities': 1.0,
+    'rating': 0.3,
+    'price': 0.2,
+    'amenity_count': 0.2,
+    'distance': 0.2
+}
+
+# Google Flights answer buckets, in the order SerpApi ranks them
+FLIGHT_BUCKETS = ('best_flights', 'other_flights', 'flights')
+
+# Flight cost to minimize, each criterion rescaled to 0..1 over the itineraries of a search
+DEFAULT_FLIGHT_WEIGHTS = {
+    'price': 1.0,
+    'duration': 0.4,
+    'stops': 0.3
+}
+
+EARTH_RADIUS_KM = 6371.0
+NAN = float('nan')
+
+DURATION_PATTERN = re.compile(r'^\s*(?:(\d+)\s*h)?\s*(?:(\d+)\s*m(?:in)?)?\s*$')
+
+
+def parse_weights(spec, defaults=DEFAULT_WEIGHTS):
+    """Weights from a "rating=0.5,price=0.25" spec over the defaults"""
+    weights = dict(defaults)
+    for item in filter(None, (part.strip() for part in str(spec or '').split(','))):
+        name, _, value = item.partition('=')
+        name = name.strip()
+        if name not in defaults:
+            raise ValueError(f"Unknown ranking weight '{name}', expected one of {', '.join(defaults)}")
+        weights[name] = float(value)
+    return weights
+
+
+class IdentityMemo:
+    """Bounded LRU of values derived from an object, valid while that very object is kept"""
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def get(self, source, key=()):
+        entry = self._entries.get((id(source), key))
+        # An id can be reused once its object is gone, the stored reference tells them apart
+        if entry is None or entry[0] is not source:
+            return None
+        self._entries.move_to_end((id(source), key))
+        return entry[1]
+
+    def set(self, source, value, key=()):
+        self._entries[(id(source), key)] = (source, value)
+        self._entries.move_to_end((id(source), key))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+
+def category_tier(category):
+    """Star tier a category answer asks for, None when it names none"""
+    text = str(category)
+    if '5' in text or 'فاخر' in text:
+        return 5
+    if '4' in text:
+        return 4
+    if '3' in text:
+        return 3
+    return None
+
+
+def distance_km(centre, latitude, longitude):
+    """Distance from a city centre, equirectangular is exact enough inside a city"""
+    x = math.radians(longitude - centre[1]) * math.cos(math.radians(centre[0]))
+    y = math.radians(latitude - centre[0])
+    return EARTH_RADIUS_KM * math.hypot(x, y)
+
+
+class HotelFeatures:
+    """Ranking fields of a hotel list as parallel columns, NaN where unknown"""
+
+    def __init__(self, hotels, centre=None):
+        bands, ratings, priced, prices, amenities, distances = [], [], [], [], [], []
+        for hotel in hotels:
+            rating = float(hotel.get('overall_rating') or 0)
+            bands.append(bisect_right(RATING_THRESHOLDS, rating))
+            ratings.append(rating)
+            # Any listed rate counts as priced, even without a numeric lowest price
+            rate = hotel.get('rate_per_night')
+            priced.append(1 if rate else 0)
+            price = rate.get('extracted_lowest') if isinstance(rate, dict) else None
+            prices.append(NAN if price is None else float(price))
+            amenities.append(len(hotel.get('amenities') or ()))
+            gps = hotel.get('gps_coordinates') if centre else None
+            if gps and 'latitude' in gps and 'longitude' in gps:
+                distances.append(distance_km(centre, gps['latitude'], gps['longitude']))
+            else:
+                distances.append(NAN)
+        self.bands = array('B', bands)
+        self.ratings = array('d', ratings)
+        self.priced = array('B', priced)
+        self.prices = array('d', prices)
+        self.amenities = array('d', amenities)
+        self.distances = array('d', distances)
+
+
+def _unit_scale(values, weight, lower_is_better=False, missing=0.0):
+    """Column rescaled to 0..weight over its known values, unknown values score missing"""
+    known = [value for value in values if value == value]
+    if not known or not weight:
+        return [missing if weight and value != value else 0.0 for value in values]
+    low, high = min(known), max(known)
+    scale = weight / ((high - low) or 1.0)
+    if lower_is_better:
+        return [(high - value) * scale if value == value else missing for value in values]
+    return [(value - low) * scale if value == value else missing for value in values]
+
+
+class HotelRanker:
+    """Weighted hotel scoring with top-k selection"""
+
+    def __init__(self, weights=None, memo_size=256):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        # Cached property lists are ranked again on every cache hit and never change
+        self._prepared = IdentityMemo(memo_size)
+
+    def base_scores(self, features):
+        """Part of every hotel's score that does not depend on the category, one pass per column"""
+        weights = self.weights
+        priced_weight, amenities_weight = weights['priced'], weights['amenities']
+        rating_weight = weights['rating'] / 5.0
+        prices = _unit_scale(features.prices, weights['price'], lower_is_better=True)
+        amenity_counts = _unit_scale(features.amenities, weights['amenity_count'])
+        distances = _unit_scale(features.distances, weights['distance'], lower_is_better=True)
+        return array('d', [
+            (priced_weight if is_priced else 0.0) + (amenities_weight if count else 0.0)
+            + rating_weight * rating + c + n + d
+            for is_priced, count, rating, c, n, d in zip(
+                features.priced, features.amenities, features.ratings, prices, amenity_counts, distances
+            )
+        ])
+
+    def prepare(self, hotels, centre=None):
+        """Features and base scores of a hotel list, computed once per list"""
+        prepared = self._prepared.get(hotels, centre)
+        if prepared is None:
+            features = HotelFeatures(hotels, centre)
+            prepared = self._prepared.set(hotels, (features, self.base_scores(features)), centre)
+        return prepared
+
+    def scores(self, hotels, category, centre=None):
+        """Score of every hotel for a category"""
+        features, base = self.prepare(hotels, centre)
+        fit_weight = self.weights['fit']
+        points = [fit_weight * fit for fit in CATEGORY_FIT.get(category_tier(category), NO_FIT)]
+        return [score + points[band] for score, band in zip(base, features.bands)]
+
+    def rank(self, hotels, category, limit=None, centre=None):
+        """Best hotels first, only the top limit of them when a limit is given"""
+        scores = self.scores(hotels, category, centre)
+        if limit is None or limit >= len(hotels):
+            order = sorted(range(len(hotels)), key=scores.__getitem__, reverse=True)
+        else:
+            # nlargest keeps the original order between equal scores, like a stable sort
+            order = heapq.nlargest(limit, range(len(hotels)), key=scores.__getitem__)
+        return [hotels[index] for index in order]
+
+
+def flight_duration(flight):
+    """Total minutes of an itinerary, from total_duration or its legs, NaN when unknown"""
+    duration = flight.get('total_duration')
+    if isinstance(duration, (int, float)):
+        return float(duration)
+    if isinstance(duration, str):
+        found = DURATION_PATTERN.match(duration)
+        if found and any(found.groups()):
+            return float(int(found.group(1) or 0) * 60 + int(found.group(2) or 0))
+    legs = flight.get('flights') or ()
+    leg_minutes = [leg.get('duration') for leg in legs]
+    if legs and all(isinstance(minutes, (int, float)) for minutes in leg_minutes):
+        return float(sum(leg_minutes) + sum(
+            layover.get('duration', 0) for layover in flight.get('layovers') or ()
+        ))
+    return NAN
+
+
+def flight_price(flight):
+    price = flight.get('price')
+    return float(price) if isinstance(price, (int, float)) else NAN
+
+
+def itinerary_key(flight):
+    """Flight numbers and times of every leg, None for an itinerary without legs"""
+    legs = flight.get('flights')
+    if not legs:
+        return None
+    return tuple(
+        (
+            ' '.join(str(leg.get('flight_number', '')).split()).upper(),
+            (leg.get('departure_airport') or {}).get('time'),
+            (leg.get('arrival_airport') or {}).get('time')
+        )
+        for leg in legs
+    )
+
+
+def merge_flights(data):
+    """Itineraries of every bucket once each, the cheapest offer of a repeated itinerary kept"""
+    merged = []
+    positions = {}
+    for bucket in FLIGHT_BUCKETS:
+        for flight in data.get(bucket) or ():
+            key = itinerary_key(flight)
+            index = positions.get(key) if key is not None else None
+            if index is None:
+                if key is not None:
+                    positions[key] = len(merged)
+                merged.append(flight)
+            elif flight_price(flight) < flight_price(merged[index]):
+                merged[index] = flight
+    return merged
+
+
+class FlightOptions:
+    """Merged, deduplicated itineraries of a search with their ranking columns"""
+
+    def __init__(self, data):
+        self.itineraries = merge_flights(data)
+        self.prices = array('d', [flight_price(flight) for flight in self.itineraries])
+        self.durations = array('d', [flight_duration(flight) for flight in self.itineraries])
+        self.stops = array('d', [
+            max(len(flight.get('flights') or ()) - 1, 0) for flight in self.itineraries
+        ])
+
+    def __len__(self):
+        return len(self.itineraries)
+
+
+class FlightRanker:
+    """Cheapest-first flight ranking by a weighted price/duration/stops cost"""
+
+    def __init__(self, weights=None, memo_size=256):
+        self.weights = dict(DEFAULT_FLIGHT_WEIGHTS, **(weights or {}))
+        # Options of a cached response, their costs and full rankings are kept, so
+        # later pages and re-sorts of the same search cost no SerpApi call
+        self._options = IdentityMemo(memo_size)
+        self._costs = IdentityMemo(memo_size)
+        self._rankings = IdentityMemo(memo_size)
+
+    def options(self, data):
+        """Merged itineraries of a Google Flights response, built once per response"""
+        options = self._options.get(data)
+        if options is None:
+            options = self._options.set(data, FlightOptions(data))
+        return options
+
+    def costs(self, data, weights=None):
+        """Cost of every itinerary of a response, unknown values count as the worst"""
+        key = tuple(sorted((weights or {}).items()))
+        costs = self._costs.get(data, key)
+        if costs is None:
+            options = self.options(data)
+            weights = dict(self.weights, **(weights or {}))
+            columns = [
+                _unit_scale(options.prices, weights['price'], missing=weights['price']),
+                _unit_scale(options.durations, weights['duration'], missing=weights['duration']),
+                _unit_scale(options.stops, weights['stops'], missing=weights['stops'])
+            ]
+            costs = self._costs.set(
+                data, array('d', [price + duration + stops for price, duration, stops in zip(*columns)]), key
+            )
+        return costs
+
+    def top(self, data, limit, weights=None):
+        """The limit best itineraries, selected without sorting the rest"""
+        key = tuple(sorted((weights or {}).items()))
+        ranking = self._rankings.get(data, (key, None))
+        if ranking is not None:
+            return ranking[:limit]
+        best = self._rankings.get(data, (key, limit))
+        if best is None:
+            itineraries = self.options(data).itineraries
+            costs = self.costs(data, weights)
+            # nsmallest keeps bucket order between equal costs, like a stable sort
+            order = heapq.nsmallest(limit, range(len(itineraries)), key=costs.__getitem__)
+            best = self._rankings.set(data, [itineraries[index] for index in order], (key, limit))
+        return list(best)
+
+    def ranked(self, data, weights=None):
+        """Every itinerary of a response, best first"""
+        key = (tuple(sorted((weights or {}).items())), None)
+        ranking = self._rankings.get(data, key)
+        if ranking is None:
+            itineraries = self.options(data).itineraries
+            costs = self.costs(data, weights)
+            order = sorted(range(len(itineraries)), key=costs.__getitem__)
+            ranking = self._rankings.set(data, [itineraries[index] for index in order], key)
+        return ranking
@@ -0,0 +1,61 @@
+"""
+Fixed replies rendered once at startup.
+
+A reply whose text depends only on a few small inputs (the hour for the
+greeting, the active form and requested slot for the fallback) is rendered
+for every value of those inputs when the action server loads, into a
+read-only table. Serving it is then a dict lookup.
+"""
+
+import logging
+import time
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseTable:
+    """Read-only table of fixed replies keyed by (reply, *inputs), rendered once"""
+
+    def __init__(self, name):
+        self.name = name
+        self._builders = {}
+        self._table = MappingProxyType({})
+        self.build_seconds = None
+        self.misses = 0
+
+    def register(self, reply, build, inputs=((),)):
+        """Render reply with build(*key) for every key in inputs when the table is built"""
+        self._builders[reply] = (build, tuple(tuple(key) for key in inputs))
+        return self
+
+    def build(self):
+        """Render every registered reply and report the size and cost of the table"""
+        started = time.perf_counter()
+        table = {}
+        for reply, (build, inputs) in self._builders.items():
+            for key in inputs:
+                table[(reply,) + key] = build(*key)
+        self._table = MappingProxyType(table)
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"{self.name}: rendered {len(table)} replies in {self.build_seconds * 1000:.1f} ms")
+        return self
+
+    def get(self, reply, *key):
+        """Rendered reply for these inputs, rendered on the spot for inputs outside the table"""
+        text = self._table.get((reply,) + key)
+        if text is None:
+            self.misses += 1
+            text = self._builders[reply][0](*key)
+        return text
+
+    def stats(self):
+        """Entries rendered at startup, how long it took and lookups that missed the table"""
+        return {
+            'entries': len(self._table),
+            'build_ms': round(self.build_seconds * 1000, 2) if self.build_seconds is not None else None,
+            'misses': self.misses
+        }
+
+    def __len__(self):
+        return len(self._table)
@@ -0,0 +1,80 @@
+from actions.cache import CachedValue, TTLCache
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_soft_and_hard_expiry():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, stale_ttl=30, clock=clock)
+    cache.set('key', 'value')
+
+    clock.now = 9
+    assert cache.get('key') == 'value'
+    assert cache.lookup('key') == CachedValue('value', 9, False)
+    assert 'key' in cache
+
+    clock.now = 10
+    assert cache.get('key') is None
+    assert 'key' not in cache
+    assert cache.lookup('key') == CachedValue('value', 10, True)
+
+    clock.now = 30
+    assert cache.lookup('key') is None
+    assert len(cache) == 0
+    assert cache.stats()['stale_hits'] == 1
+
+
+def test_per_entry_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set('short', 1, ttl=2)
+    cache.set('long', 2)
+    # The hard TTL is never shorter than the soft one
+    cache.set('stale', 3, ttl=5, stale_ttl=1)
+
+    clock.now = 3
+    assert cache.get('short') is None
+    assert cache.lookup('short') == CachedValue(1, 3, True)
+    assert cache.get('long') == 2
+    assert cache.lookup('stale') == CachedValue(3, 3, False)
+
+    clock.now = 10
+    assert cache.lookup('short') is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, clock=FakeClock())
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+    cache.lookup('a')
+    cache.set('d', 4)
+    assert 'a' in cache and 'c' not in cache
+
+
+def test_overwriting_refreshes_the_entry():
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    clock.now = 8
+    cache.set('a', 10)
+    cache.set('c', 3)
+
+    clock.now = 12
+    assert cache.get('a') == 10
+    assert 'b' not in cache
+    assert len(cache) == 2
@@ -0,0 +1,104 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from actions.circuit_breaker import CircuitBreaker, CircuitOpenError
+from actions.http_client import PoolTimeoutError
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def answer(status):
+    async def request():
+        return status, {}
+    return request
+
+
+def fail(error):
+    async def request():
+        raise error
+    return request
+
+
+def run(breaker, request):
+    return asyncio.run(breaker.call(request))
+
+
+def open_breaker(clock, threshold=2):
+    breaker = CircuitBreaker('test', failure_threshold=threshold, recovery_timeout=30, clock=clock)
+    for _ in range(threshold):
+        run(breaker, answer(503))
+    return breaker
+
+
+def test_opens_after_consecutive_failures_only():
+    breaker = CircuitBreaker('test', failure_threshold=3, clock=FakeClock())
+    run(breaker, answer(500))
+    run(breaker, answer(500))
+    run(breaker, answer(200))
+    assert breaker.consecutive_failures == 0
+
+    for error in (aiohttp.ClientConnectionError(), asyncio.TimeoutError(), aiohttp.ServerDisconnectedError()):
+        with pytest.raises(type(error)):
+            run(breaker, fail(error))
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        run(breaker, answer(200))
+    assert breaker.snapshot()['rejected_calls'] == 1
+
+
+def test_client_errors_and_local_failures_do_not_count():
+    breaker = CircuitBreaker('test', failure_threshold=1, clock=FakeClock())
+    assert run(breaker, answer(404)) == (404, {})
+    assert run(breaker, answer(429)) == (429, {})
+    for error in (PoolTimeoutError(), asyncio.CancelledError(), KeyError('price')):
+        with pytest.raises(type(error)):
+            run(breaker, fail(error))
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now = 29
+    assert breaker.snapshot()['retry_in'] == 1.0
+    assert not breaker.allow_request()
+
+    clock.now = 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    run(breaker, answer(502))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 60
+    run(breaker, answer(200))
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()['retry_in'] is None
+
+
+def test_only_one_probe_at_a_time():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now = 30
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+@pytest.mark.parametrize('error', [PoolTimeoutError(), asyncio.CancelledError(), KeyError('price')])
+def test_probe_is_released_when_it_says_nothing_about_the_upstream(error):
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now = 30
+    with pytest.raises(type(error)):
+        run(breaker, fail(error))
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    run(breaker, answer(200))
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from actions.coalescing import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight('test')
+        release = asyncio.Event()
+        started = []
+
+        async def call():
+            started.append(1)
+            await release.wait()
+            return 'result'
+
+        callers = [asyncio.ensure_future(flight.do('key', call)) for _ in range(3)]
+        other = asyncio.ensure_future(flight.do('other', call))
+        await asyncio.sleep(0)
+        assert flight.in_flight('key')
+        release.set()
+        results = await asyncio.gather(*callers, other)
+
+        assert results == ['result'] * 4
+        assert len(started) == 2
+        assert not flight.in_flight('key')
+        assert flight.stats()['calls'] == 2
+        assert flight.stats()['coalesced'] == 2
+
+    asyncio.run(scenario())
+
+
+def test_failures_are_shared_and_not_remembered():
+    async def scenario():
+        flight = SingleFlight('test')
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0)
+            raise ValueError('upstream down')
+
+        results = await asyncio.gather(
+            flight.do('key', failing), flight.do('key', failing), return_exceptions=True
+        )
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert len(attempts) == 1
+
+        async def succeeding():
+            return 'ok'
+
+        assert await flight.do('key', succeeding) == 'ok'
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight('test')
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return 'result'
+
+        impatient = asyncio.ensure_future(flight.do('key', call))
+        patient = asyncio.ensure_future(flight.do('key', call))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await impatient
+
+        assert flight.in_flight('key')
+        release.set()
+        assert await patient == 'result'
+
+    asyncio.run(scenario())
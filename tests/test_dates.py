@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+from actions.dates import DateSpan, parse_dates
+
+TODAY = date(2026, 12, 20)  # a Sunday
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('غدا', DateSpan(date(2026, 12, 21), None)),
+    ('بعد 3 أيام', DateSpan(date(2026, 12, 23), None)),
+    ('الخميس القادم', DateSpan(date(2026, 12, 24), None)),
+    ('15 مايو', DateSpan(date(2027, 5, 15), None)),
+    ('١٥/٠٦', DateSpan(date(2027, 6, 15), None)),
+    ('20/12/2026', DateSpan(date(2026, 12, 20), None)),
+])
+def test_single_dates(text, expected):
+    assert parse_dates(text, TODAY) == expected
+
+
+def test_explicit_date_wins_over_weekday():
+    assert parse_dates('السبت 20 ديسمبر', TODAY) == DateSpan(date(2026, 12, 20), None)
+    assert parse_dates('غدا 20 ديسمبر', TODAY) == DateSpan(date(2026, 12, 20), None)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('من 15 إلى 20 يوليو', DateSpan(date(2027, 7, 15), date(2027, 7, 20))),
+    ('من 20 ديسمبر إلى 5 يناير', DateSpan(date(2026, 12, 20), date(2027, 1, 5))),
+    ('من غدا إلى 25 ديسمبر', DateSpan(date(2026, 12, 21), date(2026, 12, 25))),
+    ('20 ديسمبر 27 ديسمبر', DateSpan(date(2026, 12, 20), date(2026, 12, 27))),
+    ('20 ديسمبر لمدة 3 ليال', DateSpan(date(2026, 12, 20), date(2026, 12, 23))),
+])
+def test_ranges_need_a_separator_or_two_calendar_dates(text, expected):
+    assert parse_dates(text, TODAY) == expected
+
+
+@pytest.mark.parametrize('text', ['في 5 مارس 2025', '2025-01-01', 'يوليوز 2026'])
+def test_dates_before_today_are_rejected(text):
+    assert parse_dates(text, TODAY) is None
+
+
+def test_bare_month_means_mid_month():
+    assert parse_dates('مارس', TODAY) == DateSpan(date(2027, 3, 15), None)
+    # This month once its middle has passed
+    assert parse_dates('ديسمبر', TODAY) == DateSpan(TODAY, None)
+
+
+def test_no_date():
+    assert parse_dates('قريبا', TODAY) is None
+    assert parse_dates('', TODAY) is None
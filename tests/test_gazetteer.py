@@ -0,0 +1,61 @@
+import pytest
+
+from actions.gazetteer import CityGazetteer, CityMatch, normalize_arabic
+
+GAZETTEER = CityGazetteer(
+    {
+        'morocco': ['الدار البيضاء', 'الرباط', 'مراكش', 'فاس'],
+        'international': ['باريس', 'لندن', 'إسطنبول']
+    },
+    aliases={'الدار البيضاء': ['كازابلانكا', 'casablanca']}
+)
+
+
+@pytest.mark.parametrize('text, city, span', [
+    ('بمراكش', 'مراكش', (1, 6)),
+    ('والرباط', 'الرباط', (1, 7)),
+    ('لباريس', 'باريس', (1, 6)),
+    ('وبباريس', 'باريس', (2, 7)),
+    ('للرباط', 'الرباط', (1, 6)),
+    ('وللدار البيضاء', 'الدار البيضاء', (2, 14)),
+    ('للندن', 'لندن', (1, 5)),
+])
+def test_proclitics(text, city, span):
+    match = GAZETTEER.find(text)
+    assert (match.city, (match.start, match.end)) == (city, span)
+
+
+@pytest.mark.parametrize('text, city', [
+    ('مَرّاكُش', 'مراكش'),
+    ('اسطنبول', 'إسطنبول'),
+    ('الدارالبيضاء', 'الدار البيضاء'),
+    ('كازابلانكا', 'الدار البيضاء'),
+    ('Casablanca', 'الدار البيضاء'),
+])
+def test_spelling_variants_and_aliases(text, city):
+    assert GAZETTEER.find(text).city == city
+
+
+@pytest.mark.parametrize('text', [
+    'مراكشي',    # a longer word
+    'ولرباط',    # the article only loses its alef after ل
+    'وببباريس',  # at most two proclitics
+    'بريس',
+    'كازا',
+    '',
+])
+def test_non_matches(text):
+    assert GAZETTEER.find(text) is None
+    assert GAZETTEER.find_all(text) == []
+
+
+def test_find_all_in_order_and_by_kind():
+    text = 'أريد السفر من فاس إلى باريس ثم للرباط'
+    assert [match.city for match in GAZETTEER.find_all(text)] == ['فاس', 'باريس', 'الرباط']
+    assert GAZETTEER.find_all(text, kind='international') == [CityMatch('باريس', 'international', 22, 27)]
+    assert GAZETTEER.find('الرباط', kind='international') is None
+
+
+def test_normalize_arabic():
+    assert normalize_arabic('الدار  البيضاء') == normalize_arabic('الدارالبيضاء')
+    assert normalize_arabic('أسـطنبول') == normalize_arabic('اسطنبول')
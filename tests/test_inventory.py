@@ -0,0 +1,25 @@
+from actions.inventory import FallbackInventory, stable_seed
+
+
+def test_offers_are_generated_once_per_key():
+    inventory = FallbackInventory('test', max_size=2)
+    draws = []
+
+    def generate(rng):
+        draws.append(1)
+        return [rng.randint(0, 10 ** 9)]
+
+    first = inventory.offers(('flights', 'CMN', 'CDG'), generate)
+    assert inventory.offers(('flights', 'CMN', 'CDG'), generate) == first
+    assert len(draws) == 1
+    # A fresh inventory draws the same offers again from the seeded generator
+    assert FallbackInventory('other').offers(('flights', 'CMN', 'CDG'), generate) == first
+    assert stable_seed('a', None) == stable_seed('a', '')
+
+
+def test_unseeded_generators_take_no_argument():
+    inventory = FallbackInventory('test', max_size=1, seeded=False)
+    assert inventory.offers(('hotels', 'مراكش'), lambda: [{'name': 'A'}]) == ({'name': 'A'},)
+    assert inventory.precompute([(('hotels', 'فاس'), lambda: [{'name': 'B'}])]) == 1
+    assert ('hotels', 'مراكش') not in inventory
+    assert len(inventory) == 1
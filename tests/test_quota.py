@@ -0,0 +1,116 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from actions.quota import MonthlyBudget, QuotaExceededError, SenderAllowance, TokenBucket, UpstreamQuota
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now = 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now = 100
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_budget_is_persisted_and_rolls_over(tmp_path):
+    path = str(tmp_path / 'usage.json')
+    now = datetime(2026, 10, 31, 23, 59)
+    budget = MonthlyBudget(10, path, reserve=2, now=lambda: now)
+    budget.consume(7)
+    budget.flush()
+    assert json.load(open(path)) == {'month': '2026-10', 'used': 7}
+
+    reloaded = MonthlyBudget(10, path, reserve=2, now=lambda: now)
+    assert reloaded.remaining() == 3
+    reloaded.consume()
+    assert reloaded.is_low()
+
+    now = datetime(2026, 11, 1)
+    assert reloaded.remaining() == 10
+    assert not reloaded.is_low()
+    # Usage saved for an earlier month is not carried over
+    assert MonthlyBudget(10, path, now=lambda: now).remaining() == 10
+
+
+def test_budget_writes_are_batched(tmp_path):
+    path = tmp_path / 'usage.json'
+    clock = FakeClock()
+    budget = MonthlyBudget(100, str(path), save_every=3, save_interval=60, clock=clock)
+    budget.consume()
+    budget.consume()
+    assert not path.exists()
+    budget.consume()
+    assert json.load(open(path))['used'] == 3
+
+    budget.consume()
+    clock.now = 60
+    budget.consume()
+    assert json.load(open(path))['used'] == 5
+
+    budget.consume()
+    budget.flush()
+    assert json.load(open(path))['used'] == 6
+    assert budget.remaining() == 94
+
+
+def make_quota(tmp_path, clock, rate=0, capacity=1, limit=2):
+    return UpstreamQuota(
+        'test',
+        TokenBucket(rate, capacity, clock=clock),
+        MonthlyBudget(100, str(tmp_path / 'usage.json')),
+        SenderAllowance(limit, window=60, clock=clock)
+    )
+
+
+def test_rate_rejection_does_not_charge_the_sender(tmp_path):
+    clock = FakeClock()
+    quota = make_quota(tmp_path, clock, rate=1, capacity=1, limit=2)
+    quota.acquire('alice')
+    with pytest.raises(QuotaExceededError):
+        quota.acquire('alice')
+    assert quota.rejected['rate'] == 1
+
+    clock.now = 1
+    quota.acquire('alice')
+    clock.now = 2
+    with pytest.raises(QuotaExceededError):
+        quota.acquire('alice')
+    assert quota.rejected['sender'] == 1
+
+
+def test_sender_allowance_window(tmp_path):
+    clock = FakeClock()
+    quota = make_quota(tmp_path, clock, rate=100, capacity=100, limit=2)
+    quota.acquire('alice')
+    quota.acquire('alice')
+    with pytest.raises(QuotaExceededError):
+        quota.acquire('alice')
+    quota.acquire('bob')
+    clock.now = 60
+    quota.acquire('alice')
+
+
+def test_prefetch_keeps_a_margin_and_the_senders_last_call(tmp_path):
+    clock = FakeClock()
+    quota = make_quota(tmp_path, clock, rate=100, capacity=100, limit=2)
+    assert quota.admits_prefetch('alice', margin=10)
+    quota.acquire('alice')
+    assert not quota.admits_prefetch('alice')
+    assert quota.admits_prefetch('bob')
+
+    quota.record_usage(90)
+    assert quota.admits_prefetch('bob', margin=9)
+    assert not quota.admits_prefetch('bob', margin=10)
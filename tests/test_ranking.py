@@ -0,0 +1,98 @@
+import random
+from collections import OrderedDict
+
+import pytest
+
+from actions.ranking import HotelFeatures, HotelRanker
+
+CATEGORIES = ['5 نجوم', 'فاخر', '4 نجوم', '3 نجوم', 'أي فندق']
+TIE_BREAKERS = ('rating', 'price', 'amenity_count', 'distance')
+
+
+def legacy_scores(hotels, category):
+    """Whole-point category score of filter_hotels_by_category before the ranker"""
+    scores = []
+    for hotel in hotels:
+        score = 0
+        rating = hotel.get('overall_rating', 0)
+        if '5' in str(category) or 'فاخر' in str(category):
+            if rating >= 4.5:
+                score += 3
+            elif rating >= 4.0:
+                score += 2
+        elif '4' in str(category):
+            if 4.0 <= rating < 4.5:
+                score += 3
+            elif rating >= 4.5:
+                score += 2
+            elif rating >= 3.5:
+                score += 1
+        elif '3' in str(category):
+            if 3.5 <= rating < 4.0:
+                score += 3
+            elif rating >= 4.0:
+                score += 1
+        if hotel.get('rate_per_night'):
+            score += 1
+        if hotel.get('amenities'):
+            score += 1
+        scores.append(score)
+    return scores
+
+
+def legacy_rank(hotels, category):
+    scores = legacy_scores(hotels, category)
+    return [hotels[index] for index in sorted(range(len(hotels)), key=scores.__getitem__, reverse=True)]
+
+
+def make_hotels(seed, count=300):
+    rng = random.Random(seed)
+    hotels = []
+    for i in range(count):
+        hotel = {'name': f"Hotel {i}", 'overall_rating': rng.choice([3.4, 3.5, 3.9, 4.0, 4.4, 4.5, 4.9, 0])}
+        if rng.random() < 0.7:
+            hotel['amenities'] = ['Pool'] * rng.randrange(0, 5)
+        roll = rng.random()
+        if roll < 0.5:
+            hotel['rate_per_night'] = {'extracted_lowest': rng.randrange(25, 900)}
+        elif roll < 0.7:
+            # A listed rate without a numeric lowest price still counts as priced
+            hotel['rate_per_night'] = {'lowest': '$120'}
+        elif roll < 0.8:
+            hotel['rate_per_night'] = OrderedDict(extracted_lowest=rng.randrange(25, 900))
+        if rng.random() < 0.5:
+            hotel['gps_coordinates'] = {'latitude': 31.6 + rng.random() / 10, 'longitude': -8.0}
+        hotels.append(hotel)
+    return hotels
+
+
+@pytest.mark.parametrize('category', CATEGORIES)
+@pytest.mark.parametrize('seed', range(5))
+def test_whole_points_match_the_legacy_score(seed, category):
+    hotels = make_hotels(seed)
+    scores = HotelRanker().scores(hotels, category, centre=(31.63, -7.98))
+    assert [int(score) for score in scores] == legacy_scores(hotels, category)
+
+
+@pytest.mark.parametrize('category', CATEGORIES)
+@pytest.mark.parametrize('seed', range(5))
+def test_order_only_breaks_legacy_ties(seed, category):
+    hotels = make_hotels(seed)
+    legacy = dict(zip(map(id, hotels), legacy_scores(hotels, category)))
+    ranked = HotelRanker().rank(hotels, category, centre=(31.63, -7.98))
+    ranked_scores = [legacy[id(hotel)] for hotel in ranked]
+    assert ranked_scores == sorted(ranked_scores, reverse=True)
+
+
+@pytest.mark.parametrize('category', CATEGORIES)
+def test_without_tie_breakers_the_legacy_order_is_kept(category):
+    hotels = make_hotels(7)
+    ranker = HotelRanker(dict.fromkeys(TIE_BREAKERS, 0.0))
+    assert ranker.rank(hotels, category) == legacy_rank(hotels, category)
+    assert ranker.rank(hotels, category, limit=10) == legacy_rank(hotels, category)[:10]
+
+
+def test_prices_of_dict_subclasses_are_read():
+    features = HotelFeatures([{'rate_per_night': OrderedDict(extracted_lowest=80)}, {'rate_per_night': {}}])
+    assert features.prices[0] == 80
+    assert list(features.priced) == [1, 0]
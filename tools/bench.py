@@ -0,0 +1,366 @@
+"""
+Microbenchmarks for the pure-Python helpers that run on every turn.
+
+Times date/city/price/guest parsing, hotel ranking, the form validators and
+the message renderers on representative Arabic inputs and large synthetic
+SerpApi/AviationStack payloads, and compares them against a stored baseline.
+
+Usage:
+    python -m tools.bench                    # compare with tools/bench_baseline.json
+    python -m tools.bench --save-baseline    # record a new baseline on this machine
+    python -m tools.bench --filter format_ --tolerance 0.15
+
+Timings are compared relative to a fixed reference workload timed in the same
+round, which keeps the comparison stable on shared machines. Exits with
+status 1 when a benchmark is slower than the baseline by more than the
+tolerance. Record the baseline on the machine that runs the comparison.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from rasa_sdk import Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from actions import dates, messages
+from actions.actions import (
+    CITY_GAZETTEER, CITY_REGISTRY, HOTEL_RANKER, ActionConfirmReservation, ActionDefaultFallback,
+    ActionGetWeatherInfo, ActionShowBookingSummary, AviationStackService, SerpApiFlightService, SerpApiHotelService, ValidateFlightForm, ValidateHotelForm
+)
+from actions.ranking import FlightRanker, HotelFeatures
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+# Representative user inputs
+DATES = [
+    'غداً', 'غدا', 'بعد غد', 'الأسبوع القادم', 'الشهر القادم', '15 مايو', 'يوم 3 ديسمبر',
+    '20 11', '1 يناير', 'في 28 فبراير إن شاء الله', 'قريبا', 'الخميس القادم', 'بعد 3 أيام',
+    '١٥/٠٦', 'من 15 إلى 20 يوليو'
+]
+CITIES = [
+    'الدار البيضاء', 'الرباط', 'مراكش', 'فاس', 'أكادير', 'طنجة', 'باريس', 'لندن',
+    'دبي', 'إسطنبول', 'نيويورك', 'زيوريخ', 'مدينة غير معروفة'
+]
+DESTINATIONS = ['باريس', 'لندن', 'مدريد', 'دبي', 'القاهرة', 'نيويورك', 'روما', 'أمستردام', 'مراكش', 'كيب تاون']
+GUESTS = ['شخص واحد', 'شخصين', 'اثنين', '3 أشخاص', 'أربعة', 'خمسة أشخاص', '7 أشخاص', 'عائلة']
+CATEGORIES = ['3 نجوم', '4 نجوم', '5 نجوم', 'فاخر', None]
+CLASSES = ['اقتصادية', 'economy', 'أعمال', 'بزنس', 'أولى', 'first', 'ممتازة']
+HOTEL_CATEGORY_INPUTS = ['3', 'ثلاث نجوم', '4 نجوم', 'خمس نجوم', 'فاخر', 'luxury', 'لا أعرف']
+MESSAGES = [
+    'أريد حجز رحلة من الدارالبيضاء إلى باريس يوم 15 مايو',
+    'ما حالة الرحلات من مراكش إلى لندن؟', 'أبحث عن فندق 5 نجوم في أكادير لشخصين',
+    'السلام عليكم', 'ما حالة الطقس في إسطنبول الأسبوع القادم؟'
+]
+
+AIRLINES = ['Royal Air Maroc', 'Air Arabia Maroc', 'Air France', 'Iberia', 'Transavia', 'Turkish Airlines']
+AIRPORTS = ['CMN', 'RBA', 'RAK', 'CDG', 'ORY', 'MAD', 'LHR', 'IST', 'DXB', 'FCO']
+AMENITIES = ['Free WiFi', 'Pool', 'Spa', 'Restaurant', 'Bar', 'Parking', 'Air conditioning', 'Gym', 'Breakfast']
+HOTEL_TYPES = ['Hotel', 'Resort', 'Apartment', 'Bed & Breakfast', 'Villa', 'Guest house']
+
+# Slot sets of the turns that render a whole booking message
+BOOKING_SLOTS = [
+    {'ville_depart': 'الدار البيضاء', 'ville_destination': 'باريس', 'date_depart': '15 مايو',
+     'classe': 'أعمال', 'selected_option': '1'},
+    {'ville_hotel': 'مراكش', 'categorie_hotel': '5 نجوم', 'nombre_personnes': 'شخصين',
+     'quartier': 'المدينة القديمة', 'selected_option': '2'},
+    {'ville_depart': 'الرباط', 'ville_destination': 'دبي', 'ville_hotel': 'دبي',
+     'categorie_hotel': '4 نجوم', 'selected_option': '1'},
+    {'ville_depart': 'فاس', 'ville_hotel': 'الرباط'}
+]
+
+
+def synthetic_flights(rng, count):
+    """Google Flights response with count itineraries split over both buckets"""
+    def itinerary():
+        legs = []
+        for _ in range(rng.choice([1, 1, 2, 3])):
+            legs.append({
+                'departure_airport': {'id': rng.choice(AIRPORTS), 'time': f"2025-11-20 {rng.randrange(24):02d}:{rng.randrange(60):02d}"},
+                'arrival_airport': {'id': rng.choice(AIRPORTS), 'time': f"2025-11-20 {rng.randrange(24):02d}:{rng.randrange(60):02d}"},
+                'airline': rng.choice(AIRLINES),
+                'flight_number': f"{rng.choice(['AT', 'AF', 'IB', 'TK'])} {rng.randrange(100, 9999)}",
+                'duration': rng.randrange(60, 400)
+            })
+        return {'flights': legs, 'price': rng.randrange(90, 1500), 'total_duration': sum(leg['duration'] for leg in legs)}
+
+    best = count // 5
+    return {
+        'best_flights': [itinerary() for _ in range(best)],
+        'other_flights': [itinerary() for _ in range(count - best)]
+    }
+
+
+def synthetic_hotels(rng, count):
+    """Google Hotels response with count properties"""
+    properties = []
+    for i in range(count):
+        hotel = {
+            'name': f"Hotel {i}",
+            'type': rng.choice(HOTEL_TYPES),
+            'overall_rating': round(rng.uniform(2.5, 5.0), 1),
+            'amenities': rng.sample(AMENITIES, rng.randrange(0, 6))
+        }
+        if rng.random() < 0.9:
+            hotel['rate_per_night'] = {'extracted_lowest': rng.randrange(25, 900)}
+        if rng.random() < 0.5:
+            hotel['gps_coordinates'] = {'latitude': 31.6, 'longitude': -8.0}
+        properties.append(hotel)
+    return {'properties': properties}
+
+
+def synthetic_realtime(rng, count):
+    """AviationStack /v1/flights response with count flights"""
+    return {'data': [{
+        'flight_status': rng.choice(['scheduled', 'active', 'landed', 'cancelled', 'en-route']),
+        'airline': {'name': rng.choice(AIRLINES)},
+        'flight': {'iata': f"AT{rng.randrange(100, 999)}"},
+        'departure': {'scheduled': '2025-11-20T08:30:00+00:00', 'actual': '2025-11-20T08:45:00+00:00'},
+        'arrival': {'scheduled': '2025-11-20T12:45:00+00:00', 'estimated': '2025-11-20T12:50:00+00:00'}
+    } for _ in range(count)]}
+
+
+def tracker_with(entity_name, value):
+    entities = [{'entity': entity_name, 'value': value}] if value else []
+    return Tracker('bench', {}, {'entities': entities, 'text': value or ''}, [], False, None, {}, 'action_listen')
+
+
+def slots_tracker(slots, active_loop=None):
+    return Tracker(
+        'bench', dict(slots), {'entities': [], 'text': ''}, [], False, None,
+        {'name': active_loop} if active_loop else {}, 'action_listen'
+    )
+
+
+def complete(coroutine):
+    """Result of an action coroutine that never suspends, without an event loop"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError('action suspended, it cannot be timed without an event loop')
+
+
+def cycle(inputs, call):
+    """Benchmark body that calls call(item) on the next input each time"""
+    state = {'i': 0}
+
+    def run():
+        item = inputs[state['i'] % len(inputs)]
+        state['i'] += 1
+        return call(item)
+    return run
+
+
+def build_benchmarks():
+    rng = random.Random(42)
+    flight_service = SerpApiFlightService()
+    hotel_service = SerpApiHotelService()
+    aviation_service = AviationStackService()
+    flight_form = ValidateFlightForm()
+    hotel_form = ValidateHotelForm()
+    dispatcher = CollectingDispatcher()
+    today = date.today()
+
+    flights_payload = synthetic_flights(rng, 250)
+    hotels_payload = synthetic_hotels(rng, 500)
+    realtime_payload = synthetic_realtime(rng, 100)
+    routes = [(origin, destination) for origin in CITIES[:6] for destination in DESTINATIONS]
+    booking_trackers = [slots_tracker(slots) for slots in BOOKING_SLOTS]
+    weather_trackers = [slots_tracker({'ville_destination': destination}) for destination in DESTINATIONS]
+    fallback_trackers = [
+        slots_tracker({'requested_slot': slot}, form) for form, slot in messages.FALLBACK_INPUTS
+    ]
+
+    def validator(method, entity_name, inputs):
+        trackers = [(value, tracker_with(entity_name, value)) for value in inputs]
+
+        def call(item):
+            value, tracker = item
+            dispatcher.messages.clear()
+            return method(value, dispatcher, tracker, {})
+        return cycle(trackers, call)
+
+    def action(instance, trackers):
+        # The rendering cost of one turn, the dispatched message included
+        def call(tracker):
+            dispatcher.messages.clear()
+            return complete(instance.run(dispatcher, tracker, {}))
+        return cycle(trackers, call)
+
+    return {
+        'parse_arabic_date': cycle(DATES, flight_service.parse_arabic_date),
+        'parse_dates[uncached]': cycle(DATES, lambda text: dates._parse.__wrapped__(text, today)),
+        'city_registry.airport_code': cycle(CITIES, CITY_REGISTRY.airport_code),
+        'calculate_route_price': cycle(routes, lambda route: flight_service.calculate_route_price(*route)),
+        'parse_guests': cycle(GUESTS, hotel_service.parse_guests),
+        'city_gazetteer.find_all': cycle(MESSAGES, CITY_GAZETTEER.find_all),
+        'filter_hotels_by_category[500]': cycle(
+            CATEGORIES, lambda category: hotel_service.filter_hotels_by_category(
+                hotels_payload['properties'], category, limit=2, city='مراكش'
+            )
+        ),
+        'hotel_ranker.prepare[500]': cycle(
+            CATEGORIES, lambda category: HOTEL_RANKER.base_scores(
+                HotelFeatures(hotels_payload['properties'], (31.63, -7.98))
+            )
+        ),
+        'validate_ville_depart': validator(flight_form.validate_ville_depart, 'ville_depart', CITIES),
+        'validate_ville_destination': validator(flight_form.validate_ville_destination, 'ville_destination', DESTINATIONS),
+        'validate_classe': validator(flight_form.validate_classe, 'classe', CLASSES),
+        'validate_ville_hotel': validator(hotel_form.validate_ville_hotel, 'ville_hotel', CITIES),
+        'validate_categorie_hotel': validator(hotel_form.validate_categorie_hotel, 'categorie_hotel', HOTEL_CATEGORY_INPUTS),
+        'validate_nombre_personnes': validator(hotel_form.validate_nombre_personnes, 'nombre_personnes', GUESTS),
+        'format_serpapi_results[250]': cycle(routes, lambda route: flight_service.format_serpapi_results(
+            flights_payload, route[0], route[1], '15 مايو', 'BUSINESS'
+        )),
+        'flight_ranker.top[250]': cycle(routes, lambda route: FlightRanker().top(flights_payload, 2)),
+        'format_serpapi_hotels_results[500]': cycle(CATEGORIES, lambda category: hotel_service.format_serpapi_hotels_results(
+            hotels_payload, 'مراكش', category, 'شخصين', 'المدينة القديمة'
+        )),
+        'format_realtime_info[100]': cycle(routes, lambda route: aviation_service.format_realtime_info(
+            realtime_payload, route[0], route[1], age=125
+        )),
+        'get_fallback_flights': cycle(routes, lambda route: flight_service.get_fallback_flights(
+            route[0], route[1], '15 مايو', 'ECONOMY'
+        )),
+        'action_confirm_reservation': action(ActionConfirmReservation(), booking_trackers),
+        'action_show_booking_summary': action(ActionShowBookingSummary(), booking_trackers),
+        'action_default_fallback': action(ActionDefaultFallback(), fallback_trackers),
+        'action_get_weather_info': action(ActionGetWeatherInfo(), weather_trackers),
+        'get_fallback_hotels': cycle(HOTEL_CATEGORY_INPUTS, lambda category: hotel_service.get_fallback_hotels(
+            'مراكش', category, 'شخصين', None
+        ))
+    }
+
+
+def reference_workload():
+    """Fixed string/dict workload timed next to every round to factor out machine speed drift"""
+    counts = {}
+    for word in ('رحلة من الدار البيضاء إلى باريس يوم 15 مايو ' * 8).split():
+        counts[word] = counts.get(word, 0) + 1
+    return ', '.join(f"{word}: {count}" for word, count in sorted(counts.items()))
+
+
+def calibrate(run, target=0.02):
+    """Number of calls per batch so that one batch takes about target seconds"""
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - started >= target or number >= 1_000_000:
+            return number
+        number *= 2
+
+
+def time_batch(run, number):
+    """ns per call over one batch, without the garbage collector"""
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter_ns()
+        for _ in range(number):
+            run()
+        return (time.perf_counter_ns() - started) / number
+    finally:
+        gc.enable()
+
+
+def peak_kib(run):
+    """Peak memory allocated by a single call"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round((peak - before) / 1024, 1)
+
+
+def measure(benchmarks, repeat):
+    """Interleave batches of every benchmark over repeat rounds
+
+    Each round also times the reference workload; the relative cost
+    (benchmark / reference in the same round) is what gets compared to the
+    baseline, so load on the machine shifting mid-run affects both alike.
+    """
+    random.seed(0)
+    numbers = {name: calibrate(run) for name, run in benchmarks.items()}
+    reference_number = calibrate(reference_workload)
+    timings = {name: [] for name in benchmarks}
+    relative = {name: [] for name in benchmarks}
+    for _ in range(repeat):
+        for name, run in benchmarks.items():
+            reference = time_batch(reference_workload, reference_number)
+            elapsed = time_batch(run, numbers[name])
+            timings[name].append(elapsed)
+            relative[name].append(elapsed / reference)
+
+    return {name: {
+        'median_ns': round(statistics.median(timings[name])),
+        'min_ns': round(min(timings[name])),
+        'relative': round(statistics.median(relative[name]), 4),
+        'peak_kib': peak_kib(run),
+        'calls': numbers[name] * repeat
+    } for name, run in benchmarks.items()}
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('benchmarks', {})
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks for the action helpers')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=15, help='timed batches per benchmark')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs. baseline (0.25 = 25%%)')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    args = parser.parse_args()
+
+    # The helpers log on every call, keep that out of the timings
+    logging.disable(logging.CRITICAL)
+
+    baseline = load_baseline(args.baseline)
+    benchmarks = {name: run for name, run in build_benchmarks().items() if args.filter in name}
+    results = measure(benchmarks, args.repeat)
+    regressions = []
+    print(f"{'benchmark':<38}{'median µs':>11}{'min µs':>10}{'peak KiB':>10}{'vs base':>10}")
+    for name, result in results.items():
+        change = ''
+        if name in baseline:
+            ratio = result['relative'] / baseline[name]['relative']
+            change = f"{ratio - 1:+.0%}"
+            if ratio > 1 + args.tolerance:
+                regressions.append(name)
+                change += ' !'
+        print(f"{name:<38}{result['median_ns'] / 1000:>11.2f}{result['min_ns'] / 1000:>10.2f}"
+              f"{result['peak_kib']:>10}{change:>10}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'benchmarks': results}, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than baseline by more than {args.tolerance:.0%}: "
+              f"{', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+"""
+Load generator for the action server webhook.
+
+Replays realistic action calls (tracker snapshot + domain, as sent by Rasa)
+against `rasa run actions` at a fixed concurrency and optional request rate,
+then reports throughput, latency percentiles and errors per action.
+
+Run the action server against the local stand-in so results are repeatable:
+    python -m tools.standin --port 8010 --latency 1.5 --jitter 0.3 --seed 1
+    SERPAPI_KEY=standin AVIATIONSTACK_API_KEY=standin \\
+    SERPAPI_BASE_URL=http://127.0.0.1:8010 AVIATIONSTACK_BASE_URL=http://127.0.0.1:8010/v1 \\
+    SERPAPI_RATE_PER_SECOND=1000 SERPAPI_BURST=1000 SERPAPI_SENDER_LIMIT=1000 \\
+    rasa run actions
+    python -m tools.loadtest --concurrency 50 --duration 60
+
+Messages carry the web client's progressive_results metadata (--blocking drops
+it), so the action_search_flights row only times the acknowledgement sent
+within FLIGHT_ACK_BUDGET. The load test then triggers
+action_deliver_flight_results as the web client does, and reports the time from
+the search request to the delivered results as flight_search_results.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import defaultdict
+
+import aiohttp
+import yaml
+
+DOMAIN_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'domain.yml')
+
+ORIGINS = ['الدار البيضاء', 'الرباط', 'مراكش', 'فاس', 'أكادير', 'طنجة']
+DESTINATIONS = ['باريس', 'لندن', 'مدريد', 'دبي', 'إسطنبول', 'روما', 'القاهرة']
+DATES = ['غدا', 'الأسبوع القادم', '15 ديسمبر', '20 نوفمبر', 'الشهر القادم']
+CLASSES = ['اقتصادية', 'أعمال', 'أولى']
+HOTEL_CITIES = ['مراكش', 'الدار البيضاء', 'الرباط', 'فاس', 'أكادير', 'طنجة']
+HOTEL_CATEGORIES = ['3 نجوم', '4 نجوم', '5 نجوم', 'فاخر']
+GUESTS = ['شخص واحد', 'شخصين', '3 أشخاص', '4 أشخاص']
+# Sent by web/script.js with every message to get flight results progressively
+WEB_CLIENT_METADATA = {'progressive_results': True}
+
+
+def user_event(text, intent, entities, channel, metadata=None):
+    return {
+        'event': 'user',
+        'timestamp': time.time(),
+        'text': text,
+        'parse_data': {'intent': {'name': intent, 'confidence': 1.0}, 'entities': entities, 'text': text},
+        'input_channel': channel,
+        'metadata': metadata or {}
+    }
+
+
+def tracker_snapshot(sender_id, slots, text, intent, entities=(), extra_events=(),
+                     active_loop=None, channel='rest', metadata=None):
+    """Tracker state in the shape Rasa sends to the action server"""
+    entities = list(entities)
+    return {
+        'sender_id': sender_id,
+        'slots': slots,
+        'latest_message': {
+            'text': text, 'intent': {'name': intent, 'confidence': 1.0}, 'entities': entities,
+            'metadata': metadata or {}
+        },
+        'events': [user_event(text, intent, entities, channel, metadata), *extra_events],
+        'paused': False,
+        'followup_action': None,
+        'active_loop': active_loop or {},
+        'latest_action_name': 'action_listen'
+    }
+
+
+def slot_event(name, value):
+    return {'event': 'slot', 'timestamp': time.time(), 'name': name, 'value': value}
+
+
+def entity(name, value):
+    return {'entity': name, 'value': value, 'confidence_entity': 1.0}
+
+
+def flight_slots(rng):
+    return {
+        'ville_depart': rng.choice(ORIGINS),
+        'ville_destination': rng.choice(DESTINATIONS),
+        'date_depart': rng.choice(DATES),
+        'classe': rng.choice(CLASSES)
+    }
+
+
+def hotel_slots(rng):
+    return {
+        'ville_hotel': rng.choice(HOTEL_CITIES),
+        'categorie_hotel': rng.choice(HOTEL_CATEGORIES),
+        'nombre_personnes': rng.choice(GUESTS),
+        'quartier': None
+    }
+
+
+def search_flights(rng, sender_id, channel):
+    slots = flight_slots(rng)
+    text = f"أريد رحلة من {slots['ville_depart']} إلى {slots['ville_destination']} {slots['date_depart']}"
+    return tracker_snapshot(sender_id, slots, text, 'book_flight', channel=channel)
+
+
+def search_hotels(rng, sender_id, channel):
+    slots = hotel_slots(rng)
+    text = f"أريد فندق {slots['categorie_hotel']} في {slots['ville_hotel']}"
+    return tracker_snapshot(sender_id, slots, text, 'book_hotel', channel=channel)
+
+
+def validate_flight_form(rng, sender_id, channel):
+    slots = flight_slots(rng)
+    destination = slots['ville_destination']
+    slots.update(date_depart=None, classe=None, requested_slot='ville_destination')
+    return tracker_snapshot(
+        sender_id, slots, f"إلى {destination}", 'inform', [entity('ville_destination', destination)],
+        [slot_event('ville_destination', destination)], {'name': 'flight_form'}, channel
+    )
+
+
+def validate_hotel_form(rng, sender_id, channel):
+    slots = hotel_slots(rng)
+    category = slots['categorie_hotel']
+    slots.update(nombre_personnes=None, requested_slot='categorie_hotel')
+    return tracker_snapshot(
+        sender_id, slots, category, 'inform', [entity('categorie_hotel', category)],
+        [slot_event('categorie_hotel', category)], {'name': 'hotel_form'}, channel
+    )
+
+
+def select_option(rng, sender_id, channel):
+    slots = dict(flight_slots(rng), selected_option=rng.choice(['1', '2']))
+    text = 'الخيار الأول' if slots['selected_option'] == '1' else 'الخيار الثاني'
+    return tracker_snapshot(sender_id, slots, text, 'select_option',
+                            [entity('option_number', slots['selected_option'])], channel=channel)
+
+
+def confirm_reservation(rng, sender_id, channel):
+    slots = dict(hotel_slots(rng), selected_option=rng.choice(['1', '2']))
+    return tracker_snapshot(sender_id, slots, 'نعم أؤكد', 'confirm_reservation', channel=channel)
+
+
+# Late flight results, fetched the way web/script.js does after an acknowledgement
+FLIGHT_RESULTS_ACTION = 'action_deliver_flight_results'
+FLIGHT_RESULTS_LABEL = 'flight_search_results'
+
+
+def pending_results(reply):
+    """Intent a reply asks the client to trigger for late results, None when it is complete"""
+    for response in reply.get('responses') or ():
+        custom = response.get('custom') or {}
+        if custom.get('pending_results'):
+            return custom['pending_results']
+    return None
+
+
+# Action name -> tracker snapshot builder
+SCENARIOS = {
+    'action_search_flights': search_flights,
+    'action_search_hotels': search_hotels,
+    'validate_flight_form': validate_flight_form,
+    'validate_hotel_form': validate_hotel_form,
+    'action_select_option': select_option,
+    'action_confirm_reservation': confirm_reservation
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile, None without values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class LoadTest:
+    """Concurrent webhook client with an optional global request rate"""
+
+    def __init__(self, url, actions, domain, concurrency=10, rate=0.0, duration=30.0,
+                 total=None, conversations=1000, channel='rest', progressive=True, seed=None):
+        self.url = url
+        self.actions = actions
+        self.domain = domain
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.total = total
+        self.conversations = conversations
+        self.channel = channel
+        self.metadata = WEB_CLIENT_METADATA if progressive else {}
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(lambda: defaultdict(int))
+        self._next_at = None
+
+    def next_payload(self):
+        action = self.rng.choice(self.actions)
+        sender_id = f"loadtest-{self.rng.randrange(self.conversations)}"
+        tracker = SCENARIOS[action](self.rng, sender_id, self.channel)
+        tracker['latest_message']['metadata'] = tracker['events'][0]['metadata'] = self.metadata
+        return action, {
+            'next_action': action,
+            'sender_id': sender_id,
+            'tracker': tracker,
+            'domain': self.domain,
+            'version': '3.6.13'
+        }
+
+    async def pace(self):
+        """Wait for the next send slot when a rate is set"""
+        if not self.rate:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._next_at = max(self._next_at or now, now)
+        wait = self._next_at - now
+        self._next_at += 1 / self.rate
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def finished(self, deadline):
+        if self.total is not None:
+            return self.sent >= self.total
+        return time.monotonic() >= deadline
+
+    async def post(self, session, label, payload):
+        """POST one action call, the decoded reply or None after counting the error under label"""
+        try:
+            async with session.post(self.url, json=payload) as response:
+                body = await response.read()
+                if response.status != 200:
+                    self.errors[label][f"http_{response.status}"] += 1
+                    return None
+                return json.loads(body)
+        except asyncio.TimeoutError:
+            self.errors[label]['timeout'] += 1
+        except Exception as e:
+            self.errors[label][type(e).__name__] += 1
+        return None
+
+    async def deliver_flight_results(self, session, payload, intent, started):
+        """Trigger the late results of an acknowledged flight search, timed from the search request"""
+        tracker = tracker_snapshot(
+            payload['sender_id'], payload['tracker']['slots'], f"/{intent}", intent,
+            channel=self.channel, metadata=self.metadata
+        )
+        reply = await self.post(
+            session, FLIGHT_RESULTS_LABEL, dict(payload, next_action=FLIGHT_RESULTS_ACTION, tracker=tracker)
+        )
+        if reply is not None:
+            self.latencies[FLIGHT_RESULTS_LABEL].append(time.monotonic() - started)
+
+    async def worker(self, session, deadline):
+        while not self.finished(deadline):
+            self.sent += 1
+            await self.pace()
+            action, payload = self.next_payload()
+            started = time.monotonic()
+            reply = await self.post(session, action, payload)
+            if reply is None:
+                continue
+            self.latencies[action].append(time.monotonic() - started)
+
+            if action == 'action_search_flights':
+                intent = pending_results(reply)
+                if intent:
+                    await self.deliver_flight_results(session, payload, intent, started)
+                else:
+                    # Fast searches answer in full within the acknowledgement budget
+                    self.latencies[FLIGHT_RESULTS_LABEL].append(time.monotonic() - started)
+
+    async def run(self):
+        timeout = aiohttp.ClientTimeout(total=60)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        started = time.monotonic()
+        deadline = started + self.duration
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            await asyncio.gather(*[self.worker(session, deadline) for _ in range(self.concurrency)])
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed):
+        """Per-action and overall throughput, latency percentiles (ms) and errors"""
+        def summarize(latencies, errors):
+            return {
+                'ok': len(latencies),
+                'errors': sum(errors.values()),
+                'error_kinds': dict(errors),
+                'throughput': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+                'p50_ms': round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+                'p95_ms': round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+                'p99_ms': round(percentile(latencies, 99) * 1000, 1) if latencies else None
+            }
+
+        actions = sorted(set(self.latencies) | set(self.errors))
+        # Time to flight results re-times searches already counted, it stays out of the total
+        requests = [action for action in actions if action != FLIGHT_RESULTS_LABEL]
+        all_latencies = [latency for action in requests for latency in self.latencies[action]]
+        all_errors = defaultdict(int)
+        for action in requests:
+            for kind, count in self.errors[action].items():
+                all_errors[kind] += count
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'concurrency': self.concurrency,
+            'rate': self.rate,
+            'actions': {action: summarize(self.latencies[action], self.errors[action]) for action in actions},
+            'total': summarize(all_latencies, all_errors)
+        }
+
+
+def print_report(report):
+    print(f"\nDuration {report['elapsed_s']}s, concurrency {report['concurrency']}, "
+          f"rate {report['rate'] or 'unlimited'}")
+    header = f"{'action':<28}{'ok':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print('-' * len(header))
+    rows = list(report['actions'].items()) + [('TOTAL', report['total'])]
+    for action, stats in rows:
+        print(f"{action:<28}{stats['ok']:>7}{stats['errors']:>8}{stats['throughput']:>9}"
+              f"{str(stats['p50_ms']):>10}{str(stats['p95_ms']):>10}{str(stats['p99_ms']):>10}")
+    for action, stats in rows:
+        if stats['error_kinds'] and action != 'TOTAL':
+            print(f"  {action} errors: {stats['error_kinds']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Rasa action server webhook')
+    parser.add_argument('--url', default='http://localhost:5055/webhook')
+    parser.add_argument('--actions', default=','.join(SCENARIOS),
+                        help=f"comma separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--rate', type=float, default=0.0, help='total requests per second, 0 for unlimited')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to run')
+    parser.add_argument('--requests', type=int, default=None, help='stop after this many requests instead')
+    parser.add_argument('--conversations', type=int, default=1000, help='number of distinct sender ids')
+    parser.add_argument('--channel', default='rest', help='input channel recorded in the tracker')
+    parser.add_argument('--blocking', action='store_true',
+                        help="leave out the web client's progressive_results metadata")
+    parser.add_argument('--seed', type=int, default=None, help='seed for repeatable payloads')
+    parser.add_argument('--domain', default=DOMAIN_FILE)
+    parser.add_argument('--json', dest='json_path', default=None, help='also write the report to this file')
+    args = parser.parse_args()
+
+    actions = [action.strip() for action in args.actions.split(',') if action.strip()]
+    unknown = [action for action in actions if action not in SCENARIOS]
+    if unknown:
+        parser.error(f"No scenario for {', '.join(unknown)}")
+
+    with open(args.domain, encoding='utf-8') as f:
+        domain = yaml.safe_load(f)
+
+    load_test = LoadTest(
+        args.url, actions, domain, concurrency=args.concurrency, rate=args.rate,
+        duration=args.duration, total=args.requests, conversations=args.conversations,
+        channel=args.channel, progressive=not args.blocking, seed=args.seed
+    )
+    report = asyncio.run(load_test.run())
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Local stand-in for the SerpApi and AviationStack endpoints used by the actions.
+
+Serves the Google Flights / Google Hotels search shapes on /search and the
+AviationStack /v1/flights and /v1/airports shapes from JSON fixtures, so load
+tests never touch the metered upstreams.
+
+Modes:
+- replay (default): answer from tools/fixtures, falling back to the bundled
+  default fixture of each endpoint when no recorded response matches
+- record: forward each request to the real upstream with the caller's keys
+  and save the response as a fixture (credentials are never written)
+
+Usage:
+    python -m tools.standin --port 8010 --latency 2 --tail-rate 0.05 --tail-latency 12
+    SERPAPI_BASE_URL=http://127.0.0.1:8010 \\
+    AVIATIONSTACK_BASE_URL=http://127.0.0.1:8010/v1 rasa run actions
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+
+import aiohttp
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Query parameters that carry credentials, never part of a fixture key or file
+CREDENTIAL_PARAMS = ('api_key', 'access_key')
+
+
+class StandInServer:
+    """Fixture-backed SerpApi/AviationStack look-alike with latency and error injection"""
+
+    def __init__(self, mode='replay', fixtures_dir=FIXTURES_DIR, latency=0.0, jitter=0.0,
+                 tail_rate=0.0, tail_latency=0.0, error_rate=0.0, error_status=500,
+                 serpapi_upstream='https://serpapi.com',
+                 aviationstack_upstream='http://api.aviationstack.com/v1', seed=None):
+        self.mode = mode
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.upstreams = {
+            'serpapi': serpapi_upstream.rstrip('/'),
+            'aviationstack': aviationstack_upstream.rstrip('/')
+        }
+        self.random = random.Random(seed)
+        self.session = None
+        self.counters = {'requests': 0, 'replayed': 0, 'defaulted': 0, 'recorded': 0, 'injected_errors': 0}
+
+    def endpoint_name(self, request):
+        """Fixture family of a request, e.g. google_flights or aviationstack_flights"""
+        path = request.match_info.route.resource.canonical
+        if path == '/search':
+            return request.query.get('engine', 'google')
+        if path == '/account':
+            return 'serpapi_account'
+        return f"aviationstack_{request.match_info['resource']}"
+
+    def fixture_key(self, endpoint, query):
+        """Stable fixture file name for an endpoint and its non-credential parameters"""
+        params = sorted((k, v) for k, v in query.items() if k not in CREDENTIAL_PARAMS)
+        digest = hashlib.sha1(json.dumps(params, ensure_ascii=False).encode('utf-8')).hexdigest()[:12]
+        return f"{endpoint}-{digest}"
+
+    def fixture_path(self, name):
+        return os.path.join(self.fixtures_dir, f"{name}.json")
+
+    def load_fixture(self, name):
+        try:
+            with open(self.fixture_path(name), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_fixture(self, name, fixture):
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        tmp_path = f"{self.fixture_path(name)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.fixture_path(name))
+
+    def upstream_url(self, request):
+        if request.match_info.route.resource.canonical in ('/search', '/account'):
+            return f"{self.upstreams['serpapi']}{request.path}"
+        return f"{self.upstreams['aviationstack']}/{request.match_info['resource']}"
+
+    async def inject_delay(self):
+        """Sleep for the configured latency, occasionally for the long tail"""
+        if self.tail_rate and self.random.random() < self.tail_rate:
+            delay = self.tail_latency
+        else:
+            delay = max(0.0, self.random.gauss(self.latency, self.jitter) if self.jitter else self.latency)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def record(self, request, endpoint, key):
+        """Forward to the real upstream and keep the answer as a fixture"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        async with self.session.get(self.upstream_url(request), params=request.query) as response:
+            body = await response.json(content_type=None)
+            fixture = {'status': response.status, 'body': body}
+        if fixture['status'] == 200:
+            self.save_fixture(key, fixture)
+            self.counters['recorded'] += 1
+            logger.info(f"Recorded {endpoint} as {key}")
+        return fixture
+
+    def replay(self, endpoint, key):
+        """Recorded fixture for this exact request, else the endpoint's default"""
+        fixture = self.load_fixture(key)
+        if fixture is not None:
+            self.counters['replayed'] += 1
+            return fixture
+        fixture = self.load_fixture(endpoint)
+        if fixture is not None:
+            self.counters['defaulted'] += 1
+            return fixture
+        return {'status': 404, 'body': {'error': f"No fixture for {endpoint}"}}
+
+    async def handle(self, request):
+        self.counters['requests'] += 1
+        endpoint = self.endpoint_name(request)
+        key = self.fixture_key(endpoint, request.query)
+
+        if self.mode == 'record':
+            fixture = await self.record(request, endpoint, key)
+        else:
+            await self.inject_delay()
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.counters['injected_errors'] += 1
+                return web.json_response({'error': 'Injected failure'}, status=self.error_status)
+            fixture = self.replay(endpoint, key)
+        return web.json_response(fixture['body'], status=fixture['status'])
+
+    async def handle_stats(self, request):
+        return web.json_response(self.counters)
+
+    async def close(self, app):
+        if self.session is not None:
+            await self.session.close()
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_get('/search', self.handle)
+        app.router.add_get('/account', self.handle)
+        app.router.add_get('/v1/{resource:flights|airports}', self.handle)
+        app.router.add_get('/_standin/stats', self.handle_stats)
+        app.on_cleanup.append(self.close)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local SerpApi/AviationStack stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8010)
+    parser.add_argument('--mode', choices=('replay', 'record'), default='replay')
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help='fixture directory')
+    parser.add_argument('--latency', type=float, default=0.0, help='mean response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='standard deviation of the delay')
+    parser.add_argument('--tail-rate', type=float, default=0.0, help='share of responses delayed by --tail-latency')
+    parser.add_argument('--tail-latency', type=float, default=0.0, help='delay of the slow tail in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=500)
+    parser.add_argument('--serpapi-upstream', default='https://serpapi.com')
+    parser.add_argument('--aviationstack-upstream', default='http://api.aviationstack.com/v1')
+    parser.add_argument('--seed', type=int, default=None, help='seed for repeatable latency and errors')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = StandInServer(
+        mode=args.mode, fixtures_dir=args.fixtures, latency=args.latency, jitter=args.jitter,
+        tail_rate=args.tail_rate, tail_latency=args.tail_latency, error_rate=args.error_rate,
+        error_status=args.error_status, serpapi_upstream=args.serpapi_upstream,
+        aviationstack_upstream=args.aviationstack_upstream, seed=args.seed
+    )
+    logger.info(f"Stand-in listening on http://{args.host}:{args.port} in {args.mode} mode")
+    # No access log, recorded requests carry the real API keys in their query string
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == '__main__':
+    main()
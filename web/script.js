@@ -117,7 +117,11 @@ async function handleSendMessage() {
 async function sendToRasa(message) {
     const payload = {
         sender: CONFIG.USER_ID,
-        message: message
+        message: message,
+        // This client fetches flight results that miss the first reply
+        metadata: {
+            progressive_results: true
+        }
     };
     
     try {
@@ -167,10 +171,46 @@ function handleRasaResponse(responses) {
             if (response.attachment) {
                 addAttachment(response.attachment);
             }
+            
+            // The bot is still working, fetch the rest of the answer
+            if (response.custom && response.custom.pending_results) {
+                fetchPendingResults(response.custom.pending_results);
+            }
         }, index * 500); // Stagger responses
     });
 }
 
+// Fetch results the bot could not include in its first reply
+async function fetchPendingResults(intent) {
+    showTypingIndicator();
+    
+    try {
+        const response = await fetch(`${CONFIG.RASA_URL.replace('/webhooks/rest/webhook', '')}/conversations/${CONFIG.USER_ID}/trigger_intent?output_channel=latest`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                name: intent
+            })
+        });
+        
+        if (!response.ok) {
+            throw new Error(`Failed to fetch pending results: ${response.status}`);
+        }
+        
+        const data = await response.json();
+        hideTypingIndicator();
+        if (data.messages && data.messages.length > 0) {
+            handleRasaResponse(data.messages);
+        }
+        
+    } catch (error) {
+        hideTypingIndicator();
+        console.error('Error fetching pending results:', error);
+    }
+}
+
 // Add message to chat
 function addMessage(text, sender) {
     const messageDiv = document.createElement('div');